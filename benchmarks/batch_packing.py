@@ -0,0 +1,112 @@
+'''
+Compares splitting the texts of a call into batches in order against
+packing them into batches of similar total length
+(`API(pack_batches=True)`), in tweets per second and the spread of the
+batch costs.
+
+Tweet lengths follow a mix of short tweets, most between 5 and 25 tokens,
+and a tail of long (up to 70 token) tweets, in a random order or, with
+`--clustered`, with similar lengths near each other as when a corpus is
+grouped by user or thread. A
+:py:mod:`tweebo_parser.fake_server` with a per token latency and a limited
+number of threads is started in a separate process, so that a batch of
+long tweets takes longer as it does on the real server:
+
+    python benchmarks/batch_packing.py --tweets 400 --batch-size 50
+    python benchmarks/batch_packing.py --clustered
+'''
+
+import argparse
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+from tweebo_parser import API
+from tweebo_parser.packing import pack_batches, text_cost
+from client_modes import free_port, WORDS
+
+
+def realistic_tweets(num_tweets: int, seed: int = 0) -> List[str]:
+    '''
+    :return: Tweets whose lengths are 85% short (around 14 tokens) and 15%
+             long (35 to 70 tokens).
+    '''
+    rng = random.Random(seed)
+    tweets = []
+    for _ in range(num_tweets):
+        if rng.random() < 0.85:
+            length = min(35, max(1, round(rng.gauss(14, 5))))
+        else:
+            length = rng.randint(35, 70)
+        tweets.append(' '.join(rng.choice(WORDS) for _ in range(length)))
+    return tweets
+
+
+def batch_cost_spread(batches: List[List[str]]) -> float:
+    '''
+    :return: The most costly batch relative to the mean batch cost.
+    '''
+    costs = [sum(text_cost(text) for text in batch) for batch in batches]
+    return max(costs) / statistics.mean(costs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tweets', type=int, default=400,
+                        help='Tweets per call')
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--max-in-flight', type=int, default=8)
+    parser.add_argument('--server-threads', type=int, default=8)
+    parser.add_argument('--clustered', action='store_true',
+                        help='Order the tweets of each window of '
+                             'batch size * max in flight tweets by length')
+    parser.add_argument('--token-latency', type=float, default=0.0001,
+                        help='Seconds the fake server takes per token')
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'tweebo_parser.fake_server', '--hostname',
+         '127.0.0.1', '--port', str(port), '--latency', '0.002',
+         '--token-latency', str(args.token_latency), '--threads',
+         str(args.server_threads)], stdout=subprocess.PIPE)
+    server.stdout.readline()
+    tweets = realistic_tweets(args.tweets)
+    if args.clustered:
+        window = args.batch_size * args.max_in_flight
+        tweets = [tweet for start in range(0, len(tweets), window)
+                  for tweet in sorted(tweets[start: start + window],
+                                      key=text_cost)]
+    in_order = [tweets[start: start + args.batch_size]
+                for start in range(0, len(tweets), args.batch_size)]
+    packed = [[tweets[index] for index in indexes]
+              for indexes in pack_batches(tweets, args.batch_size)]
+    spreads = {False: batch_cost_spread(in_order),
+               True: batch_cost_spread(packed)}
+    print(f'{"mode":>10}{"tweets/s":>12}{"max/mean cost":>16}')
+    try:
+        for pack in [False, True]:
+            with API('127.0.0.1', port, batch_size=args.batch_size,
+                     max_in_flight=args.max_in_flight,
+                     pool_maxsize=args.max_in_flight,
+                     pack_batches=pack) as api:
+                api.parse_conll(tweets[:args.batch_size])
+                times = []
+                for _ in range(args.repeats):
+                    start_time = time.perf_counter()
+                    api.parse_conll(tweets)
+                    times.append(time.perf_counter() - start_time)
+            name = 'packed' if pack else 'in order'
+            rate = args.tweets / statistics.median(times)
+            print(f'{name:>10}{rate:>12.1f}{spreads[pack]:>16.2f}')
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+'''
+Measures requests per second, tweets per second, the p50 and p99 latency of
+a request and the peak Python memory allocated by the client for each way
+of using the client:
+
+1. sync -- One :py:class:`tweebo_parser.API` sending one request at a time.
+2. threads -- One API shared by `--concurrency` threads.
+3. no_keep_alive -- As threads but opening a new connection per request.
+4. async -- :py:class:`tweebo_parser.AsyncAPI` with `--concurrency`
+   requests at the same time, skipped if aiohttp is not installed.
+
+By default a :py:mod:`tweebo_parser.fake_server` is started in a separate
+process so that only the client's overhead is measured, use `--hostname`
+and `--port` to benchmark against a running server instead:
+
+    python benchmarks/client_modes.py --requests 500 --batch-size 50
+    python benchmarks/client_modes.py --latency 0.01 --concurrency 16
+    python benchmarks/client_modes.py --hostname 0.0.0.0 --port 8000
+'''
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import random
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from tweebo_parser import API, AsyncAPI
+
+
+WORDS = ['I', 'predict', 'won\'t', 'win', 'a', 'single', 'game', 'RT',
+         '@e_one', ':', 'Texas', 'http://tl.gd/6meogh', 'have', 'nice',
+         'day', ':)', '#tweebo', 'lol', 'the', 'party', '?????', 'today']
+
+
+def synthetic_tweets(num_tweets: int, seed: int = 0) -> List[str]:
+    '''
+    :param num_tweets: Number of tweets to create.
+    :param seed: Seed of the random number generator.
+    :return: Tweets of between 5 and 30 random words.
+    '''
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 30)))
+            for _ in range(num_tweets)]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_threads(api: API, batches: List[List[str]],
+                concurrency: int) -> List[float]:
+    '''
+    :return: The latency of each request.
+    '''
+    def timed_parse(batch: List[str]) -> float:
+        start_time = time.perf_counter()
+        api.parse_conll(batch)
+        return time.perf_counter() - start_time
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        return list(executor.map(timed_parse, batches))
+
+
+def run_async(api: AsyncAPI, batches: List[List[str]],
+              concurrency: int) -> List[float]:
+    '''
+    :return: The latency of each request.
+    '''
+    async def timed_parse(batch: List[str],
+                          slots: asyncio.Semaphore) -> float:
+        async with slots:
+            start_time = time.perf_counter()
+            await api.parse_conll(batch)
+            return time.perf_counter() - start_time
+
+    async def run() -> List[float]:
+        slots = asyncio.Semaphore(concurrency)
+        try:
+            return await asyncio.gather(*[timed_parse(batch, slots)
+                                          for batch in batches])
+        finally:
+            await api.close()
+
+    return asyncio.run(run())
+
+
+def measure(name: str, run: Callable[[], List[float]],
+            batches: List[List[str]]) -> Dict[str, float]:
+    start_time = time.perf_counter()
+    latencies = run()
+    elapsed = time.perf_counter() - start_time
+    # Memory is measured by a second run as tracing the allocations slows
+    # down the client.
+    tracemalloc.start()
+    run()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    num_tweets = sum(len(batch) for batch in batches)
+    return {'mode': name, 'requests/s': len(batches) / elapsed,
+            'tweets/s': num_tweets / elapsed,
+            'p50 ms': percentile(latencies, 0.5) * 1000,
+            'p99 ms': percentile(latencies, 0.99) * 1000,
+            'peak MiB': peak_memory / 2 ** 20}
+
+
+def free_port() -> int:
+    with socket.socket() as free_socket:
+        free_socket.bind(('127.0.0.1', 0))
+        return free_socket.getsockname()[1]
+
+
+def start_fake_server(port: int, latency: float,
+                      threads: int) -> subprocess.Popen:
+    command = [sys.executable, '-m', 'tweebo_parser.fake_server',
+               '--hostname', '127.0.0.1', '--port', str(port),
+               '--latency', str(latency)]
+    if threads:
+        command += ['--threads', str(threads)]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE)
+    # The server prints a line once it is listening.
+    server.stdout.readline()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--hostname',
+                        help='Server to benchmark against, default starts '
+                             'a fake server')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds each request takes on the fake server')
+    parser.add_argument('--server-threads', type=int, default=0,
+                        help='Requests the fake server processes at the '
+                             'same time, default no limit')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=20,
+                        help='Tweets per request')
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    server = None
+    hostname, port = args.hostname, args.port
+    if hostname is None:
+        hostname, port = '127.0.0.1', free_port()
+        server = start_fake_server(port, args.latency, args.server_threads)
+    tweets = synthetic_tweets(args.requests * args.batch_size)
+    batches = [tweets[start: start + args.batch_size]
+               for start in range(0, len(tweets), args.batch_size)]
+    concurrency = args.concurrency
+
+    modes = [('sync', lambda: run_threads(API(hostname, port), batches, 1)),
+             ('threads', lambda: run_threads(
+                 API(hostname, port, pool_maxsize=concurrency), batches,
+                 concurrency)),
+             ('no_keep_alive', lambda: run_threads(
+                 API(hostname, port, keep_alive=False), batches,
+                 concurrency))]
+    try:
+        import aiohttp  # noqa: F401
+        modes.append(('async', lambda: run_async(
+            AsyncAPI(hostname, port, max_in_flight=concurrency), batches,
+            concurrency)))
+    except ImportError:
+        print('aiohttp is not installed, skipping the async mode')
+
+    columns = ['mode', 'requests/s', 'tweets/s', 'p50 ms', 'p99 ms',
+               'peak MiB']
+    print(''.join(f'{column:>14}' for column in columns))
+    try:
+        for name, run in modes:
+            # Warm up so that every mode starts with the server ready.
+            API(hostname, port).parse_conll(batches[0])
+            result = measure(name, run, batches)
+            print(f'{result["mode"]:>14}' +
+                  ''.join(f'{result[column]:>14.1f}'
+                          for column in columns[1:]))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+'''
+Compares seconds to turn parse results into token level columns:
+
+1. dict loop -- Looping over the tokens and dependencies of each Stanford
+   styled dict, appending each value to a list per column, then creating
+   NumPy arrays from the lists.
+2. TokenTable -- Adding the CoNLL strings to a
+   :py:class:`tweebo_parser.columnar.TokenTable` and exporting it with
+   `to_numpy` and, if pyarrow is installed, `to_arrow`.
+
+    python benchmarks/columnar_export.py --tweets 100000
+'''
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+import numpy
+
+from tweebo_parser.columnar import TokenTable
+from tweebo_parser.conll import conll_to_stanford
+from parsed_tweet_memory import synthetic_conll
+
+
+def dict_loop(stanfords: List[Dict[str, Any]]) -> Dict[str, Any]:
+    columns = {'tweet_id': [], 'token_index': [], 'word': [], 'pos': [],
+               'head': [], 'dep': []}
+    for tweet_id, stanford in enumerate(stanfords):
+        dependencies = {dependency['dependent']: dependency
+                        for dependency in stanford['basicDependencies']}
+        for token in stanford['tokens']:
+            dependency = dependencies[token['index']]
+            columns['tweet_id'].append(tweet_id)
+            columns['token_index'].append(token['index'])
+            columns['word'].append(token['word'])
+            columns['pos'].append(token['pos'])
+            columns['head'].append(dependency['governor'])
+            columns['dep'].append(dependency['dep'])
+    return {name: numpy.array(values) for name, values in columns.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tweets', type=int, default=100000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    conlls = [synthetic_conll(random.randint(5, 30))
+              for _ in range(args.tweets)]
+    stanfords = [conll_to_stanford(conll, index)
+                 for index, conll in enumerate(conlls)]
+
+    start_time = time.perf_counter()
+    dict_loop(stanfords)
+    print(f'dict loop: {time.perf_counter() - start_time:.2f}s')
+
+    start_time = time.perf_counter()
+    table = TokenTable()
+    table.extend(conlls)
+    extend_time = time.perf_counter() - start_time
+    table.to_numpy()
+    print(f'TokenTable to_numpy: {time.perf_counter() - start_time:.2f}s '
+          f'({len(table)} tokens)')
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print('pyarrow is not installed, skipping to_arrow')
+        return
+    start_time = time.perf_counter()
+    table.to_arrow()
+    print(f'TokenTable to_arrow: '
+          f'{extend_time + time.perf_counter() - start_time:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+'''
+Compares the number of requests per second that can be made to the
+TweeboParser API server when a new connection is opened and closed for every
+request (`keep_alive=False`) against re-using connections from a connection
+pool (`keep_alive=True`).
+
+Assumes the server is running, by default at 0.0.0.0:8000:
+
+    python benchmarks/connection_pool.py --requests 1000 --threads 4
+'''
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from tweebo_parser import API
+
+
+TEXTS = ['hello how are you', 'Where are we going']
+
+
+def requests_per_second(api: API, num_requests: int, threads: int) -> float:
+    '''
+    :param api: The API instance to send the requests through.
+    :param num_requests: Number of requests to send.
+    :param threads: Number of threads sending requests at the same time.
+    :return: The number of requests completed per second.
+    '''
+    # Warm up so that both modes are measured from the same starting point.
+    api.parse_conll(TEXTS)
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        for _ in executor.map(lambda _: api.parse_conll(TEXTS),
+                              range(num_requests)):
+            pass
+    return num_requests / (time.perf_counter() - start_time)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--hostname', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=1)
+    args = parser.parse_args()
+
+    for keep_alive in [False, True]:
+        with API(args.hostname, args.port, keep_alive=keep_alive,
+                 pool_maxsize=args.threads) as api:
+            rate = requests_per_second(api, args.requests, args.threads)
+        print(f'keep_alive={keep_alive}: {rate:.1f} requests/sec')
+
+
+if __name__ == '__main__':
+    main()
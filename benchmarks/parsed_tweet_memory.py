@@ -0,0 +1,86 @@
+'''
+Compares the memory used to hold parse results as the Stanford styled dicts
+returned by `API.parse_stanford` against `ParsedTweet` objects returned by
+`API.parse_tweets`. The results are synthetic tweets created locally, thus
+the server is not required:
+
+    python benchmarks/parsed_tweet_memory.py --tweets 10000
+'''
+
+import argparse
+import json
+import random
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+from tweebo_parser.parsed import POS_VOCAB, ParsedTweet
+
+
+def synthetic_conll(num_tokens: int) -> str:
+    '''
+    :param num_tokens: Number of tokens in the tweet.
+    :return: A CoNLL formated parse of a random tweet.
+    '''
+    lines = []
+    for index in range(1, num_tokens + 1):
+        word = ''.join(random.choice('abcdefghij')
+                       for _ in range(random.randint(1, 8)))
+        pos = random.choice(POS_VOCAB.strings)
+        head = random.randint(-1, num_tokens)
+        label = 'MWE' if random.random() < 0.1 else '_'
+        lines.append(f'{index}\t{word}\t_\t{pos}\t{pos}\t_\t{head}\t{label}'
+                     '\t_\t_')
+    return '\n'.join(lines)
+
+
+def memory_used(create: Callable[[], List[Any]]) -> Tuple[int, int]:
+    '''
+    Requires tracemalloc to be tracing.
+
+    :param create: Function that creates the results.
+    :return: Memory in bytes held by the results once created, and the peak
+             memory in bytes used while creating them.
+    '''
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+    else:
+        # Before Python 3.9 the peak is only reset by restarting tracing.
+        tracemalloc.stop()
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    results = create()
+    current, peak = tracemalloc.get_traced_memory()
+    del results
+    return current - baseline, peak - baseline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tweets', type=int, default=10000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    conlls = [synthetic_conll(random.randint(5, 30))
+              for _ in range(args.tweets)]
+    # The server's response is decoded from json, thus the strings of each
+    # dict are separate objects.
+    stanford_json = json.dumps([ParsedTweet.from_conll(conll, index)
+                                .to_stanford()
+                                for index, conll in enumerate(conlls)])
+    conll_json = json.dumps(conlls)
+    tracemalloc.start()
+    dict_memory, dict_peak = memory_used(lambda: json.loads(stanford_json))
+    tweet_memory, tweet_peak = memory_used(
+        lambda: [ParsedTweet.from_conll(conll, index) for index, conll
+                 in enumerate(json.loads(conll_json))])
+    tracemalloc.stop()
+    print(f'Stanford dicts: {dict_memory / 2**20:.1f} MiB held, '
+          f'{dict_peak / 2**20:.1f} MiB peak')
+    print(f'ParsedTweets: {tweet_memory / 2**20:.1f} MiB held, '
+          f'{tweet_peak / 2**20:.1f} MiB peak')
+    print(f'Reduction: {dict_memory / tweet_memory:.1f}x held, '
+          f'{dict_peak / tweet_peak:.1f}x peak')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+'''
+Compares keeping parse results in a JSON lines file of `{"id": tweet id,
+"conll": ...}` against a :py:class:`tweebo_parser.store.ResultStore`, in:
+
+1. The size on disk.
+2. Seconds to open the results and look up random tweets by id, reading the
+   JSON lines file into a dict for the look ups.
+3. Seconds to scan every tweet, counting the tokens attached to a head.
+
+The results are synthetic tweets created locally, thus the server is not
+required:
+
+    python benchmarks/result_store.py --tweets 100000 --lookups 1000
+'''
+
+import argparse
+import json
+from pathlib import Path
+import random
+import tempfile
+import time
+
+from tweebo_parser.store import ResultStore
+from parsed_tweet_memory import synthetic_conll
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tweets', type=int, default=100000)
+    parser.add_argument('--lookups', type=int, default=1000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    tweet_ids = sorted(random.sample(range(10 ** 18), args.tweets))
+    conlls = [synthetic_conll(random.randint(5, 30))
+              for _ in range(args.tweets)]
+    lookup_ids = random.sample(tweet_ids, args.lookups)
+    with tempfile.TemporaryDirectory() as directory:
+        jsonl_fp = Path(directory, 'results.jsonl')
+        with jsonl_fp.open('w') as jsonl_file:
+            for tweet_id, conll in zip(tweet_ids, conlls):
+                jsonl_file.write(json.dumps({'id': tweet_id,
+                                             'conll': conll}) + '\n')
+        store_fp = Path(directory, 'store')
+        with ResultStore(store_fp) as store:
+            for start in range(0, args.tweets, 1000):
+                store.extend(conlls[start: start + 1000],
+                             ids=tweet_ids[start: start + 1000])
+        store_size = sum(path.stat().st_size for path in store_fp.iterdir())
+        print(f'{"":>12}{"MB":>8}{"lookups s":>12}{"scan s":>10}')
+
+        start_time = time.perf_counter()
+        with jsonl_fp.open('r') as jsonl_file:
+            results = {}
+            for line in jsonl_file:
+                record = json.loads(line)
+                results[record['id']] = record['conll']
+        for tweet_id in lookup_ids:
+            results[tweet_id].split('\n')
+        lookup_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        with jsonl_fp.open('r') as jsonl_file:
+            attached = sum(token.split('\t')[6] != '-1'
+                           for line in jsonl_file
+                           for token in json.loads(line)['conll'].split('\n')
+                           if token)
+        scan_time = time.perf_counter() - start_time
+        print(f'{"JSON lines":>12}{jsonl_fp.stat().st_size / 2 ** 20:>8.1f}'
+              f'{lookup_time:>12.3f}{scan_time:>10.2f}')
+
+        start_time = time.perf_counter()
+        with ResultStore(store_fp, readonly=True) as store:
+            for tweet_id in lookup_ids:
+                store[tweet_id].words
+            lookup_time = time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            store_attached = sum(len(tweet.heads) -
+                                 tweet.heads.tolist().count(-1)
+                                 for tweet in store)
+            scan_time = time.perf_counter() - start_time
+        assert store_attached == attached
+        print(f'{"ResultStore":>12}{store_size / 2 ** 20:>8.1f}'
+              f'{lookup_time:>12.3f}{scan_time:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+'''
+Compares parsing a stream of tweets, a share of which are retweets
+(`RT @handle: ...`) of earlier tweets, with and without
+`API(reuse_retweets=True)`, in tweets per second and the number of texts
+sent to the server. Both use a cache, so without reusing retweets only
+repeated retweets of the same tweet by the same user are not sent again.
+
+A :py:mod:`tweebo_parser.fake_server` with a per token latency is started
+in a separate process, so that sending fewer texts saves time as it does
+on the real server:
+
+    python benchmarks/retweet_reuse.py --tweets 5000 --retweets 0.5
+'''
+
+import argparse
+import random
+import subprocess
+import sys
+import time
+from typing import List
+
+from tweebo_parser import API
+from batch_packing import realistic_tweets
+from client_modes import free_port
+
+
+def retweet_stream(num_tweets: int, retweet_share: float,
+                   seed: int = 0) -> List[str]:
+    '''
+    :return: Tweets, each with a probability of retweet_share of being a
+             retweet by a random user of one of the tweets before it.
+    '''
+    rng = random.Random(seed)
+    originals = realistic_tweets(num_tweets, seed)
+    stream = []
+    for tweet in originals:
+        if stream and rng.random() < retweet_share:
+            # Popular tweets are retweeted far more than the rest.
+            retweeted = stream[min(int(rng.paretovariate(1.2)) - 1,
+                                   len(stream) - 1)]
+            if retweeted.startswith('RT @'):
+                retweeted = retweeted.split(': ', 1)[1]
+            tweet = f'RT @user{rng.randint(0, 10 ** 6)}: {retweeted}'
+        stream.append(tweet)
+    return stream
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tweets', type=int, default=5000)
+    parser.add_argument('--retweets', type=float, default=0.5,
+                        help='Share of the tweets that are retweets')
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--token-latency', type=float, default=0.0001,
+                        help='Seconds the fake server takes per token')
+    args = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'tweebo_parser.fake_server', '--hostname',
+         '127.0.0.1', '--port', str(port), '--token-latency',
+         str(args.token_latency)], stdout=subprocess.PIPE)
+    server.stdout.readline()
+    tweets = retweet_stream(args.tweets, args.retweets)
+    print(f'{"mode":>16}{"tweets/s":>12}{"texts sent":>12}')
+    try:
+        for reuse in [False, True]:
+            events = []
+            with API('127.0.0.1', port, batch_size=args.batch_size,
+                     cache_size=args.tweets, reuse_retweets=reuse,
+                     instruments=[events.append]) as api:
+                start_time = time.perf_counter()
+                for start in range(0, len(tweets), args.batch_size):
+                    api.parse_conll(tweets[start: start + args.batch_size])
+                elapsed = time.perf_counter() - start_time
+            sent = sum(event.num_texts for event in events)
+            name = 'reuse retweets' if reuse else 'cache only'
+            print(f'{name:>16}{args.tweets / elapsed:>12.1f}{sent:>12}')
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+'''
+Compares the size and decoding time of the Stanford styled json returned by
+the server against the CoNLL json that is converted locally using
+`tweebo_parser.conll.conll_to_stanford` (`API(stanford_from_conll=True)`).
+The parses are synthetic, thus the server is not required:
+
+    python benchmarks/stanford_from_conll.py --tweets 10000
+'''
+
+import argparse
+import json
+import random
+import timeit
+
+from tweebo_parser.conll import conll_to_stanford
+from parsed_tweet_memory import synthetic_conll
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tweets', type=int, default=10000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    conlls = [synthetic_conll(random.randint(5, 30))
+              for _ in range(args.tweets)]
+    conll_json = json.dumps(conlls).encode('utf-8')
+    stanford_json = json.dumps([conll_to_stanford(conll, index) for
+                                index, conll in enumerate(conlls)])
+    stanford_json = stanford_json.encode('utf-8')
+
+    def decode_conll():
+        return [conll_to_stanford(conll, index) for index, conll
+                in enumerate(json.loads(conll_json))]
+
+    assert decode_conll() == json.loads(stanford_json)
+    stanford_time = min(timeit.repeat(lambda: json.loads(stanford_json),
+                                      number=1, repeat=args.repeats))
+    conll_time = min(timeit.repeat(decode_conll, number=1,
+                                   repeat=args.repeats))
+    print(f'Stanford json: {len(stanford_json) / 2**20:.1f} MiB, '
+          f'decoded in {stanford_time:.3f}s')
+    print(f'CoNLL json: {len(conll_json) / 2**20:.1f} MiB, '
+          f'decoded and converted in {conll_time:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
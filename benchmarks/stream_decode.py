@@ -0,0 +1,83 @@
+'''
+Compares :py:meth:`tweebo_parser.API.parse_stanford`, which decodes the
+whole response at once, against :py:meth:`tweebo_parser.API.parse_stream`,
+which decodes each result as it arrives, in seconds until the first result,
+total seconds and peak Python memory allocated by the client.
+
+A :py:mod:`tweebo_parser.fake_server` is started in a separate process
+unless `--hostname` and `--port` of a running server are given:
+
+    python benchmarks/stream_decode.py --texts 5000
+'''
+
+import argparse
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Iterable, Tuple
+
+from tweebo_parser import API
+
+
+def measure(parse: Callable[[], Iterable]) -> Tuple[float, float, float]:
+    start_time = time.perf_counter()
+    first_result = None
+    # Results are not kept, as a streaming consumer would write them out.
+    for _ in parse():
+        if first_result is None:
+            first_result = time.perf_counter() - start_time
+    total = time.perf_counter() - start_time
+    # Memory is measured by a second run as tracing the allocations slows
+    # down the client.
+    tracemalloc.start()
+    for _ in parse():
+        pass
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_result, total, peak_memory / 2 ** 20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--hostname')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--texts', type=int, default=2000)
+    parser.add_argument('--words', type=int, default=20,
+                        help='Words per text')
+    args = parser.parse_args()
+
+    server = None
+    hostname, port = args.hostname, args.port
+    if hostname is None:
+        with socket.socket() as free_socket:
+            free_socket.bind(('127.0.0.1', 0))
+            hostname, port = '127.0.0.1', free_socket.getsockname()[1]
+        server = subprocess.Popen([sys.executable, '-m',
+                                   'tweebo_parser.fake_server', '--hostname',
+                                   hostname, '--port', str(port)],
+                                  stdout=subprocess.PIPE)
+        server.stdout.readline()
+    texts = [' '.join(f'word{word}' for word in range(args.words))
+             + f' {index}' for index in range(args.texts)]
+    api = API(hostname, port)
+    modes = [('parse_stanford', lambda: api.parse_stanford(texts)),
+             ('parse_stream json',
+              lambda: api.parse_stream(texts, 'stanford')),
+             ('parse_stream auto',
+              lambda: api.parse_stream(texts, 'stanford', 'auto'))]
+    try:
+        api.parse_conll(texts[:10])
+        for name, parse in modes:
+            first_result, total, peak_memory = measure(parse)
+            print(f'{name:>18}: first result {first_result:.3f}s, '
+                  f'total {total:.3f}s, peak memory {peak_memory:.1f}MiB')
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
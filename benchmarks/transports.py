@@ -0,0 +1,96 @@
+'''
+Compares the transports of :py:class:`tweebo_parser.API`:
+
+1. startup -- Seconds for a new Python process to import the package,
+   create an API and receive the response of its first request, the
+   median of `--startups` processes.
+2. per call -- Microseconds per request of one text, sent one at a time
+   over a kept alive connection, the median of `--repeats` runs.
+
+A :py:mod:`tweebo_parser.fake_server` is started in a separate process
+unless `--hostname` and `--port` of a running server are given:
+
+    python benchmarks/transports.py --requests 2000
+'''
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from tweebo_parser import API
+from client_modes import free_port, start_fake_server
+
+TRANSPORTS = ['requests', 'http.client']
+STARTUP_CODE = '''
+import time
+start_time = time.perf_counter()
+from tweebo_parser import API
+API({hostname!r}, {port}, transport={transport!r}).parse_conll(['hello'])
+print(time.perf_counter() - start_time)
+'''
+
+
+def startup_time(hostname: str, port: int, transport: str) -> float:
+    '''
+    :return: Seconds from the start of the import to the first response,
+             measured within the new process so that the start up of the
+             interpreter is not included.
+    '''
+    code = STARTUP_CODE.format(hostname=hostname, port=port,
+                               transport=transport)
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return float(output)
+
+
+def per_call_time(api: API, num_requests: int) -> float:
+    '''
+    :return: Seconds per request.
+    '''
+    texts = ['hello world']
+    start_time = time.perf_counter()
+    for _ in range(num_requests):
+        api.parse_conll(texts)
+    return (time.perf_counter() - start_time) / num_requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--hostname',
+                        help='Server to benchmark against, default starts '
+                             'a fake server')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='Requests per run of the per call benchmark')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--startups', type=int, default=5)
+    args = parser.parse_args()
+
+    server = None
+    hostname, port = args.hostname, args.port
+    if hostname is None:
+        hostname, port = '127.0.0.1', free_port()
+        server = start_fake_server(port, 0.0, 0)
+    print(f'{"transport":>12}{"startup ms":>14}{"per call us":>14}')
+    try:
+        for transport in TRANSPORTS:
+            startup = statistics.median(
+                [startup_time(hostname, port, transport)
+                 for _ in range(args.startups)])
+            with API(hostname, port, transport=transport) as api:
+                # Warm up so that the connection is open.
+                per_call_time(api, 10)
+                per_call = statistics.median(
+                    [per_call_time(api, args.requests)
+                     for _ in range(args.repeats)])
+            print(f'{transport:>12}{startup * 1000:>14.1f}'
+                  f'{per_call * 1e6:>14.1f}')
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
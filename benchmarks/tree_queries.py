@@ -0,0 +1,108 @@
+'''
+Compares seconds to find, for every tweet of a batch, the depth and
+subtree size of each token and the path length between random pairs of
+tokens:
+
+1. Python loops -- Per tweet, building the children of each token by
+   scanning the `basicDependencies` of the Stanford styled dict and
+   following the heads up the tree for each query.
+2. TreeBatch -- :py:class:`tweebo_parser.trees.TreeBatch` of the whole
+   batch, which needs numpy.
+
+The results are synthetic tweets created locally, thus the server is not
+required:
+
+    python benchmarks/tree_queries.py --tweets 10000
+'''
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+from tweebo_parser.parsed import ParsedTweet
+from tweebo_parser.trees import TreeBatch
+
+
+def random_forest(num_tokens: int) -> ParsedTweet:
+    '''
+    :return: A tweet whose heads form a forest, 10% of the tops are
+             unattached (-1) and the rest ROOT (0).
+    '''
+    heads = [0] * num_tokens
+    order = random.sample(range(num_tokens), num_tokens)
+    for position, token in enumerate(order):
+        if position and random.random() < 0.95:
+            heads[token] = order[random.randrange(position)] + 1
+        else:
+            heads[token] = -1 if random.random() < 0.1 else 0
+    return ParsedTweet(0, ['w'] * num_tokens, ['N'] * num_tokens, heads,
+                       ['_'] * num_tokens)
+
+
+def python_loops(stanfords: List[Dict[str, Any]],
+                 pairs: List[List[Any]]) -> List[int]:
+    path_lengths = []
+    for stanford, tweet_pairs in zip(stanfords, pairs):
+        dependencies = stanford['basicDependencies']
+        heads = {dependency['dependent']: dependency['governor']
+                 for dependency in dependencies}
+        children = {dependency['dependent']: [
+            other['dependent'] for other in dependencies
+            if other['governor'] == dependency['dependent']]
+            for dependency in dependencies}
+
+        def subtree_size(token: int) -> int:
+            return 1 + sum(subtree_size(child) for child in children[token])
+
+        def ancestors(token: int) -> List[int]:
+            path = [token]
+            while heads[path[-1]] > 0:
+                path.append(heads[path[-1]])
+            return path
+
+        for token in heads:
+            len(ancestors(token))
+            subtree_size(token)
+        for token_a, token_b in tweet_pairs:
+            path_a, path_b = ancestors(token_a), ancestors(token_b)
+            common = [token for token in path_a if token in path_b]
+            path_lengths.append(path_a.index(common[0]) +
+                                path_b.index(common[0]) if common else -1)
+    return path_lengths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tweets', type=int, default=10000)
+    parser.add_argument('--pairs', type=int, default=5,
+                        help='Pairs of tokens per tweet')
+    args = parser.parse_args()
+
+    random.seed(0)
+    tweets = [random_forest(random.randint(5, 30))
+              for _ in range(args.tweets)]
+    pairs = [[(random.randint(1, tweet.num_tokens),
+               random.randint(1, tweet.num_tokens))
+              for _ in range(args.pairs)] for tweet in tweets]
+    stanfords = [tweet.to_stanford() for tweet in tweets]
+
+    start_time = time.perf_counter()
+    expected = python_loops(stanfords, pairs)
+    print(f'Python loops: {time.perf_counter() - start_time:.2f}s')
+
+    start_time = time.perf_counter()
+    batch = TreeBatch(tweets)
+    tweet_indexes = [index for index, tweet_pairs in enumerate(pairs)
+                     for _ in tweet_pairs]
+    tokens_a, tokens_b = zip(*(pair for tweet_pairs in pairs
+                               for pair in tweet_pairs))
+    path_lengths = batch.path_lengths(batch.rows(tweet_indexes, tokens_a),
+                                      batch.rows(tweet_indexes, tokens_b))
+    print(f'TreeBatch: {time.perf_counter() - start_time:.2f}s '
+          f'({len(batch)} tokens)')
+    assert path_lengths.tolist() == expected
+
+
+if __name__ == '__main__':
+    main()
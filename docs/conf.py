@@ -161,5 +161,5 @@ texinfo_documents = [
 
 # -- Extension configuration -------------------------------------------------
 # Example configuration for intersphinx: refer to the Python standard library.
-intersphinx_mapping = {'python': ('https://docs.python.org/3.6/', None),
+intersphinx_mapping = {'python': ('https://docs.python.org/3.7/', None),
                        'requests': ('http://docs.python-requests.org/en/v2.9.1/', None)}
@@ -17,13 +17,21 @@ setup(name='tweebo_parser_python_api',
       install_requires=[
           'requests>=2.18.4'
       ],
-      python_requires='>=3.6',
+      extras_require={
+          'async': ['aiohttp>=3.0'],
+          'numpy': ['numpy'],
+          'arrow': ['pyarrow']
+      },
+      python_requires='>=3.7',
       packages=['tweebo_parser'],
+      entry_points={
+          'console_scripts': ['tweebo-parser=tweebo_parser.cli:main']
+      },
       classifiers=[
         'Development Status :: 3 - Alpha',
         'License :: OSI Approved :: GNU General Public License v3 (GPLv3)',
         'Natural Language :: English',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.7',
         'Topic :: Text Processing',
         'Topic :: Text Processing :: Linguistic',
       ])
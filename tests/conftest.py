@@ -0,0 +1,29 @@
+import socket
+
+import pytest
+
+from tweebo_parser.fake_server import FakeServer
+from test_api import CONLL_0, CONLL_1, CONLL_2, TEST_SENTENCES_0
+
+
+def _server_running(hostname: str, port: int) -> bool:
+    try:
+        with socket.create_connection((hostname, port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+@pytest.fixture(scope='session', autouse=True)
+def tweebo_server():
+    '''
+    Uses the TweeboParser API server at 0.0.0.0:8000 if one is running e.g.
+    the Docker image, else starts a :py:class:`FakeServer` there that
+    replays the parses the tests expect.
+    '''
+    if _server_running('0.0.0.0', 8000):
+        yield None
+        return
+    fixtures = dict(zip(TEST_SENTENCES_0, [CONLL_0, CONLL_1, CONLL_2]))
+    with FakeServer('0.0.0.0', 8000, fixtures=fixtures) as server:
+        yield server
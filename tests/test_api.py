@@ -1,11 +1,15 @@
 import copy
 import multiprocessing
+import time
 from typing import Any
 
 import pytest
 import requests
 
-from tweebo_parser import API
+from tweebo_parser import API, DeadlineExceeded, ServerError
+from tweebo_parser.conll import conll_to_stanford
+from tweebo_parser.retry import RetryPolicy
+from tweebo_parser.retweet import splice_retweet
 
 
 TEST_SENTENCES_0 = ["I predict I won't win a single game I bet on. "
@@ -358,3 +362,398 @@ def test_api_exceptions():
     tweebo_api = API()
     cause_error([1], requests.exceptions.HTTPError, tweebo_api)
     cause_error('hello how are you', requests.exceptions.HTTPError, tweebo_api)
+
+
+def test_api_batching():
+    '''
+    Tests that splitting the texts into batches that are sent concurrently \
+    returns the same results, in the same order, as sending all of the texts \
+    in one request. Tested with batch sizes that do and do not divide the \
+    number of texts and with batches sent one at a time and concurrently.
+    '''
+
+    texts = TEST_SENTENCES_1 * 3
+    expected_conll = API().parse_conll(texts)
+    expected_stanford = API().parse_stanford(texts)
+    for batch_size in [1, 2, 4, 20]:
+        for max_in_flight in [1, 3]:
+            tweebo_api = API(batch_size=batch_size,
+                             max_in_flight=max_in_flight)
+            assert expected_conll == tweebo_api.parse_conll(texts)
+            assert expected_stanford == tweebo_api.parse_stanford(texts)
+            assert tweebo_api.parse_conll([]) == []
+
+
+def test_api_pack_batches():
+    '''
+    Tests that packing the texts into batches of similar length returns the
+    same results, in the same order and with the same Stanford indexes, as
+    sending the texts in order.
+    '''
+
+    texts = [' '.join(['hello'] * length) + f' {index}'
+             for index, length in enumerate([30, 1, 2, 25, 1, 3, 1, 20])]
+    texts = TEST_SENTENCES_1 + texts
+    expected_conll = API().parse_conll(texts)
+    expected_stanford = API().parse_stanford(texts)
+    for batch_size in [1, 3, 4]:
+        tweebo_api = API(batch_size=batch_size, max_in_flight=2,
+                         pack_batches=True)
+        assert expected_conll == tweebo_api.parse_conll(texts)
+        assert expected_stanford == tweebo_api.parse_stanford(texts)
+
+
+def test_api_reuse_retweets():
+    '''
+    Tests that with reuse_retweets only the body of each retweet is sent,
+    once however many times it is retweeted and alongside the tweet
+    retweeted, and the `RT @handle:` prefix is added to its parse.
+    '''
+
+    body = 'wearin 4 the party'
+    texts = [f'RT @a: {body}', body, f'RT @b_2:  {body}', 'RT @c: ',
+             f'RT: {body}', f'RT @a: RT @b: {body}']
+    expected_body_conll, expected_body_rt = API().parse_conll(
+        [body, f'RT @b: {body}'])
+    expected_conll = [splice_retweet(expected_body_conll, '@a'),
+                      expected_body_conll,
+                      splice_retweet(expected_body_conll, '@b_2')] + \
+        API().parse_conll(texts[3:5]) + \
+        [splice_retweet(expected_body_rt, '@a')]
+    for output_type in ['conll', 'stanford']:
+        events = []
+        tweebo_api = API(reuse_retweets=True, instruments=[events.append])
+        if output_type == 'conll':
+            assert expected_conll == tweebo_api.parse_conll(texts)
+        else:
+            expected_stanford = [conll_to_stanford(conll, index) for
+                                 index, conll in enumerate(expected_conll)]
+            assert expected_stanford == tweebo_api.parse_stanford(texts)
+        assert [event.num_texts for event in events] == [4]
+
+
+def test_api_endpoints():
+    '''
+    Tests that requests are still processed when one of the endpoints is not
+    running, that the endpoint is marked as unhealthy and that a ServerError
+    is raised when none of the endpoints are running.
+    '''
+
+    texts = TEST_SENTENCES_1 * 3
+    expected_conll = API().parse_conll(texts)
+    endpoints = [('0.0.0.0', 8000), ('0.0.0.0', 8999)]
+    tweebo_api = API(endpoints=endpoints, batch_size=2, max_in_flight=2)
+    assert expected_conll == tweebo_api.parse_conll(texts)
+    healthy = tweebo_api.endpoints.healthy_endpoints()
+    assert [(endpoint.hostname, endpoint.port)
+            for endpoint in healthy] == [('0.0.0.0', 8000)]
+    tweebo_api.close()
+
+    tweebo_api = API(endpoints=[('0.0.0.0', 8998), ('0.0.0.0', 8999)])
+    with pytest.raises(ServerError):
+        tweebo_api.parse_conll(texts)
+
+
+def test_api_cache():
+    '''
+    Tests that cached results are the same as the results from the server, \
+    that the cache is used for repeated texts, and that changing a returned \
+    result does not change the cached result.
+    '''
+
+    tweebo_api = API(cache_size=10)
+    expected_conll = API().parse_conll(TEST_SENTENCES_1)
+    expected_stanford = API().parse_stanford(TEST_SENTENCES_1)
+    for _ in range(2):
+        assert expected_conll == tweebo_api.parse_conll(TEST_SENTENCES_1)
+        stanford = tweebo_api.parse_stanford(TEST_SENTENCES_1)
+        assert expected_stanford == stanford
+        stanford[0]['tokens'].clear()
+    # Empty texts are never sent to the server so they are not cached.
+    assert tweebo_api.cache.info()['hits'] == 2 * len(TEST_SENTENCES_0)
+
+    reversed_texts = list(reversed(TEST_SENTENCES_1))
+    expected_stanford = API().parse_stanford(reversed_texts)
+    assert expected_stanford == tweebo_api.parse_stanford(reversed_texts)
+
+
+def test_api_duplicates():
+    '''
+    Tests that texts repeated within one call, and empty or whitespace only \
+    texts, return the same results as when each text is parsed on its own.
+    '''
+
+    tweebo_api = API()
+    texts = TEST_SENTENCES_1 + ['\t\n'] + TEST_SENTENCES_0
+    expected_conll = []
+    expected_stanford = []
+    for index, text in enumerate(texts):
+        expected_conll.extend(tweebo_api.parse_conll([text]))
+        stanford = tweebo_api.parse_stanford([text])[0]
+        stanford['index'] = index
+        expected_stanford.append(stanford)
+    assert expected_conll == tweebo_api.parse_conll(texts)
+    stanford = tweebo_api.parse_stanford(texts)
+    assert expected_stanford == stanford
+    assert stanford[0]['tokens'] is not stanford[-3]['tokens']
+
+
+def test_api_parse_iter():
+    '''
+    Tests that :py:meth:`tweebo_parser.API.parse_iter` yields the same \
+    results as parsing all of the texts at once, for different batch sizes \
+    and with the texts given as a generator.
+    '''
+
+    texts = TEST_SENTENCES_1 * 5
+    expected_conll = API().parse_conll(texts)
+    expected_stanford = API().parse_stanford(texts)
+    for batch_size in [None, 1, 3]:
+        tweebo_api = API(batch_size=batch_size, max_in_flight=2)
+        conll = tweebo_api.parse_iter(text for text in texts)
+        assert expected_conll == list(conll)
+        stanford = tweebo_api.parse_iter(iter(texts), 'stanford')
+        assert expected_stanford == list(stanford)
+        assert list(tweebo_api.parse_iter([])) == []
+    with pytest.raises(ValueError):
+        list(API().parse_iter(texts, 'json'))
+
+
+def test_api_parse_tweets():
+    '''
+    Tests that :py:meth:`tweebo_parser.API.parse_tweets` returns \
+    ParsedTweets that are equal to the results of \
+    :py:meth:`tweebo_parser.API.parse_stanford` and convert back to the \
+    results of :py:meth:`tweebo_parser.API.parse_conll`.
+    '''
+
+    tweebo_api = API()
+    expected_stanford = tweebo_api.parse_stanford(TEST_SENTENCES_1)
+    expected_conll = tweebo_api.parse_conll(TEST_SENTENCES_1)
+    tweets = tweebo_api.parse_tweets(TEST_SENTENCES_1)
+    assert expected_stanford == tweets
+    assert expected_stanford == [tweet.to_stanford() for tweet in tweets]
+    assert expected_conll == [tweet.to_conll() for tweet in tweets]
+    assert tweets == list(tweebo_api.parse_iter(TEST_SENTENCES_1, 'tweet'))
+
+
+def test_api_stanford_from_conll():
+    '''
+    Tests that creating the Stanford styled output from the CoNLL output \
+    gives the same results as requesting the Stanford styled output.
+    '''
+
+    texts = TEST_SENTENCES_1 * 2
+    expected_stanford = API().parse_stanford(texts)
+    tweebo_api = API(stanford_from_conll=True, batch_size=3)
+    assert expected_stanford == tweebo_api.parse_stanford(texts)
+
+
+def test_api_auto_tune():
+    '''
+    Tests that auto tuning the batch size and number of batches in flight \
+    returns the same results as sending all of the texts in one request.
+    '''
+
+    texts = TEST_SENTENCES_1 * 20
+    expected_stanford = API().parse_stanford(texts)
+    tweebo_api = API(batch_size=2, auto_tune=True)
+    assert expected_stanford == tweebo_api.parse_stanford(texts)
+    assert expected_stanford == list(tweebo_api.parse_iter(texts, 'stanford'))
+    assert tweebo_api.tuner.settings()['increases'] > 0
+
+
+def test_api_instruments():
+    '''
+    Tests that instruments are called after every attempt at a request with
+    the sizes, timings and errors of the attempt.
+    '''
+    events = []
+    tweebo_api = API(batch_size=2, instruments=[events.append])
+    tweebo_api.parse_conll(TEST_SENTENCES_0)
+    assert sorted(event.num_texts for event in events) == [1, 2]
+    for event in events:
+        assert event.output_type == 'conll'
+        assert event.error is None
+        assert event.retry == 0
+        assert event.request_bytes > 0 and event.response_bytes > 0
+        assert event.serialise_time >= 0 and event.decode_time >= 0
+        assert event.wait_time > 0 and event.receive_time >= 0
+        assert event.url.startswith('http://0.0.0.0:8000')
+
+    events = []
+    retry_policy = RetryPolicy(connection_retries=1, backoff=0)
+    tweebo_api = API(port=8999, retry_policy=retry_policy,
+                     instruments=[events.append])
+    with pytest.raises(ServerError):
+        tweebo_api.parse_conll(['hello'])
+    assert [(event.error, event.retry, event.url) for event in events] == \
+        [('ServerError', 0, None), ('ServerError', 1, None)]
+
+
+def test_api_parse_stream():
+    '''
+    Tests that streaming gives the same results as parsing, with and
+    without batches, and that a request that is cut short part way through
+    the results is resumed from the first missing result.
+    '''
+    tweebo_api = API()
+    assert list(tweebo_api.parse_stream(TEST_SENTENCES_1)) == \
+        tweebo_api.parse_conll(TEST_SENTENCES_1)
+    stanford = list(API(batch_size=2).parse_stream(TEST_SENTENCES_1,
+                                                   'stanford', chunk_size=7))
+    assert stanford == tweebo_api.parse_stanford(TEST_SENTENCES_1)
+    assert list(tweebo_api.parse_stream([])) == []
+    with pytest.raises(ValueError):
+        list(tweebo_api.parse_stream(TEST_SENTENCES_1, 'tweet'))
+
+    from tweebo_parser.fake_server import FakeServer
+    with FakeServer('127.0.0.1', 0, garble_rate=1.0) as server:
+        # The first response is cut in half, the retry is not.
+        def stop_garbling(event: Any) -> None:
+            server.garble_rate = 0.0
+
+        retry_policy = RetryPolicy(backoff=0)
+        garbled_api = API('127.0.0.1', server.port,
+                          retry_policy=retry_policy,
+                          instruments=[stop_garbling])
+        texts = [f'text number {index}' for index in range(50)]
+        results = list(garbled_api.parse_stream(texts, 'stanford'))
+        assert retry_policy.retries == 1
+        # Only the texts without a result were sent again.
+        assert 50 < server.texts < 100
+        assert results == API('127.0.0.1', server.port).parse_stanford(texts)
+
+
+def test_api_timeout_and_deadline():
+    '''
+    Tests:
+
+    1. A server that takes longer than the timeout raises a ServerError.
+    2. The deadline limits a call across its retries and batches, raising
+       DeadlineExceeded well before the call would otherwise finish.
+    3. A call that finishes within the deadline is not affected.
+    '''
+    from tweebo_parser.fake_server import FakeServer
+    with FakeServer('127.0.0.1', 0, latency=0.3) as server:
+        retry_policy = RetryPolicy(connection_retries=0)
+        tweebo_api = API('127.0.0.1', server.port, timeout=(1, 0.05),
+                         retry_policy=retry_policy)
+        with pytest.raises(ServerError) as server_error:
+            tweebo_api.parse_conll(['hello'])
+        assert 'Time out' in server_error.value.message
+
+        retry_policy = RetryPolicy(connection_retries=100, backoff=0.01)
+        tweebo_api = API('127.0.0.1', server.port, timeout=0.05,
+                         deadline=0.4, retry_policy=retry_policy)
+        start_time = time.monotonic()
+        with pytest.raises(DeadlineExceeded) as deadline_error:
+            tweebo_api.parse_conll(['hello'])
+        assert time.monotonic() - start_time < 0.6
+        assert 'deadline of 0.4 seconds' in deadline_error.value.message
+
+        tweebo_api = API('127.0.0.1', server.port, batch_size=1,
+                         deadline=0.5)
+        start_time = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            tweebo_api.parse_stanford(['one', 'two', 'three', 'four'])
+        assert time.monotonic() - start_time < 0.7
+        with pytest.raises(DeadlineExceeded):
+            list(API('127.0.0.1', server.port,
+                     deadline=0.1).parse_stream(['one']))
+
+        tweebo_api = API('127.0.0.1', server.port, timeout=1, deadline=1)
+        assert tweebo_api.parse_conll(['hello']) == \
+            ['1\thello\t_\tN\tN\t_\t0\t_\t_\t_']
+    with pytest.raises(ValueError):
+        API(deadline=0)
+
+
+def test_api_timeout_endpoint_health():
+    '''
+    Tests that, for both transports, an endpoint whose request times out,
+    including when the timeout is shortened by the deadline, stays healthy,
+    while one that cannot be connected to is marked as unhealthy.
+    '''
+    from tweebo_parser.fake_server import FakeServer
+    with FakeServer('127.0.0.1', 0, latency=0.3) as server:
+        for transport in ['requests', 'http.client']:
+            endpoints = [('127.0.0.1', server.port), ('127.0.0.1', 8999)]
+            retry_policy = RetryPolicy(connection_retries=0)
+            for settings in [{'timeout': (1, 0.05)}, {'deadline': 0.1}]:
+                tweebo_api = API(endpoints=endpoints,
+                                 retry_policy=retry_policy,
+                                 transport=transport, **settings)
+                with pytest.raises(ServerError):
+                    tweebo_api.parse_conll(['hello'])
+                healthy = [endpoint.port for endpoint
+                           in tweebo_api.endpoints.healthy_endpoints()]
+                assert server.port in healthy
+                # Without a deadline the request is then sent to the
+                # endpoint that is not running.
+                if 'timeout' in settings:
+                    assert 8999 not in healthy
+                tweebo_api.close()
+
+
+def test_api_keep_alive():
+    '''
+    Tests, through the connections the server accepts:
+
+    1. Requests re-use the same keep-alive connection.
+    2. Requests sent at the same time use at most pool_maxsize connections,
+       which are then re-used.
+    3. keep_alive=False opens a new connection for every request.
+    4. The pool is re-created once it has been idle for longer than
+       pool_idle_timeout.
+    5. A forked process opens its own connection rather than sharing the
+       parent's.
+    '''
+    from tweebo_parser.fake_server import FakeServer
+    texts = [f'text number {index}' for index in range(8)]
+    with FakeServer('127.0.0.1', 0) as server:
+        with API('127.0.0.1', server.port) as tweebo_api:
+            for _ in range(5):
+                tweebo_api.parse_conll(texts)
+            assert server.requests == 5
+            assert server.connections == 1
+
+    with FakeServer('127.0.0.1', 0, latency=0.1) as server:
+        with API('127.0.0.1', server.port, batch_size=1, max_in_flight=4,
+                 pool_maxsize=4) as tweebo_api:
+            tweebo_api.parse_conll(texts)
+            assert server.requests == 8
+            assert 1 < server.connections <= 4
+            connections = server.connections
+            tweebo_api.parse_conll(texts)
+            assert server.connections == connections
+
+    with FakeServer('127.0.0.1', 0) as server:
+        with API('127.0.0.1', server.port, keep_alive=False) as tweebo_api:
+            for _ in range(3):
+                tweebo_api.parse_conll(texts)
+            assert server.connections == 3
+
+    with FakeServer('127.0.0.1', 0) as server:
+        with API('127.0.0.1', server.port,
+                 pool_idle_timeout=0.1) as tweebo_api:
+            tweebo_api.parse_conll(texts)
+            tweebo_api.parse_conll(texts)
+            assert server.connections == 1
+            time.sleep(0.2)
+            tweebo_api.parse_conll(texts)
+            assert server.connections == 2
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        with FakeServer('127.0.0.1', 0) as server:
+            with API('127.0.0.1', server.port) as tweebo_api:
+                tweebo_api.parse_conll(texts)
+                process = multiprocessing.get_context('fork').Process(
+                    target=tweebo_api.parse_conll, args=(texts,))
+                process.start()
+                process.join()
+                assert process.exitcode == 0
+                assert server.connections == 2
+                tweebo_api.parse_conll(texts)
+                assert server.requests == 3
+                assert server.connections == 2
@@ -0,0 +1,108 @@
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+from tweebo_parser import API, AsyncAPI
+from tweebo_parser.transport import HTTPStatusError
+from test_api import TEST_SENTENCES_0, TEST_SENTENCES_1
+
+pytest.importorskip('aiohttp')
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_async_api_matches_api():
+    '''
+    Tests that :py:class:`tweebo_parser.AsyncAPI` returns the same results \
+    as :py:class:`tweebo_parser.API` for:
+
+    1. A single request per call.
+    2. Batched requests from many concurrent calls sharing one AsyncAPI.
+    3. Empty list
+    '''
+
+    tweebo_api = API()
+
+    async def single_requests():
+        async with AsyncAPI() as async_api:
+            return (await async_api.parse_conll(TEST_SENTENCES_0),
+                    await async_api.parse_stanford(TEST_SENTENCES_1),
+                    await async_api.parse_conll([]))
+
+    conll, stanford, empty = run(single_requests())
+    assert conll == tweebo_api.parse_conll(TEST_SENTENCES_0)
+    assert stanford == tweebo_api.parse_stanford(TEST_SENTENCES_1)
+    assert empty == []
+
+    texts = TEST_SENTENCES_1 * 3
+
+    async def concurrent_requests():
+        async with AsyncAPI(batch_size=2, max_in_flight=4) as async_api:
+            calls = [async_api.parse_stanford(texts) for _ in range(10)]
+            return await asyncio.gather(*calls)
+
+    expected_stanford = tweebo_api.parse_stanford(texts)
+    for stanford in run(concurrent_requests()):
+        assert stanford == expected_stanford
+
+
+def test_async_api_exceptions():
+    '''
+    Tests:
+
+    1. The same exceptions as :py:class:`tweebo_parser.API` with the
+       `http.client` transport are raised when the wrong input is given.
+    2. Sending requests does not import requests.
+    '''
+
+    async def cause_error(data):
+        async with AsyncAPI() as async_api:
+            for function in ['parse_conll', 'parse_stanford']:
+                with pytest.raises(HTTPStatusError):
+                    await getattr(async_api, function)(data)
+
+    run(cause_error([1]))
+    run(cause_error('hello how are you'))
+
+    code = ('import asyncio, sys\n'
+            'from tweebo_parser import AsyncAPI\n'
+            'asyncio.run(AsyncAPI().parse_conll(["hello"]))\n'
+            'print("requests" in sys.modules)')
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.strip() == b'False'
+
+
+def test_async_api_event_loops():
+    '''
+    Tests that one :py:class:`tweebo_parser.AsyncAPI` can be used from more
+    than one event loop, such as by each call to `asyncio.run`, that the
+    session of each loop is closed, including that of a loop which is not
+    running, and that the API can be closed from another loop.
+    '''
+    async_api = AsyncAPI(max_in_flight=2)
+    expected = API().parse_conll(TEST_SENTENCES_0)
+    sessions = []
+    for _ in range(2):
+        assert asyncio.run(async_api.parse_conll(TEST_SENTENCES_0)) == \
+            expected
+        sessions.append(async_api._session)
+    assert sessions[0] is not sessions[1]
+    assert all(session.closed for session in sessions)
+    asyncio.run(async_api.close())
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(
+            async_api.parse_conll(TEST_SENTENCES_0)) == expected
+        session = async_api._session
+        assert asyncio.run(async_api.parse_conll(TEST_SENTENCES_0)) == \
+            expected
+        assert session.closed
+    finally:
+        loop.close()
+    asyncio.run(async_api.close())
+    assert async_api._session is None
@@ -0,0 +1,30 @@
+from tweebo_parser.cache import LRUCache
+
+
+def test_lru_cache():
+    '''
+    Tests that the least recently used item is removed when the cache is \
+    full and that hits, misses and evictions are counted.
+    '''
+
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+    assert cache.info() == {'hits': 3, 'misses': 1, 'evictions': 1,
+                            'maxsize': 2, 'size': 2}
+    # Replacing a stored item does not evict another item.
+    cache.put('a', 4)
+    assert cache.evictions == 1
+    cache.put('d', 5)
+    assert cache.evictions == 2
+    assert cache.get('c') is None
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.info()['hits'] == 0
+    assert cache.info()['evictions'] == 0
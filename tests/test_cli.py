@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+from tweebo_parser import API
+from tweebo_parser.cli import main, read_records
+from test_api import TEST_SENTENCES_1
+
+
+def test_read_records():
+    '''
+    Tests reading the (id, text) records of each input format.
+    '''
+
+    lines = ['hello\n', 'how are you\r\n', '\n']
+    assert list(read_records(lines, 'text')) == [(None, 'hello'),
+                                                  (None, 'how are you'),
+                                                  (None, '')]
+    lines = ['{"id": 5, "tweet": "hello"}\n', '\n', '{"id": 6, "tweet": ""}']
+    assert list(read_records(lines, 'jsonl', text_field='tweet',
+                             id_field='id')) == [(5, 'hello'), (6, '')]
+    lines = ['5\thello\n', '6\thow are you\n']
+    assert list(read_records(lines, 'tsv', text_column=1,
+                             id_column=0)) == [('5', 'hello'),
+                                               ('6', 'how are you')]
+    with pytest.raises(ValueError):
+        list(read_records(lines, 'csv'))
+    # Lines that cannot be read raise a ValueError with the line number.
+    lines = ['{"text": "hello"}\n', '{"text": \n']
+    with pytest.raises(ValueError, match='line 2'):
+        list(read_records(lines, 'jsonl'))
+    with pytest.raises(ValueError, match='line 1'):
+        list(read_records(['{"tweet": "hello"}'], 'jsonl'))
+    with pytest.raises(ValueError, match='line 1'):
+        list(read_records(['hello'], 'tsv', text_column=1))
+
+
+def test_main(tmpdir):
+    '''
+    Tests that parsing a json lines file writes the same results as \
+    :py:meth:`tweebo_parser.API.parse_stanford` and \
+    :py:meth:`tweebo_parser.API.parse_conll`, with the ids of the tweets.
+    '''
+
+    input_path = str(tmpdir.join('tweets.jsonl'))
+    with open(input_path, 'w') as input_file:
+        for tweet_id, text in enumerate(TEST_SENTENCES_1):
+            input_file.write(json.dumps({'id': tweet_id, 'text': text}))
+            input_file.write('\n')
+
+    output_path = str(tmpdir.join('parsed.jsonl'))
+    assert main([input_path, output_path, '--output-format', 'stanford',
+                 '--id-field', 'id', '--batch-size', '2', '--quiet']) == 0
+    expected = API().parse_stanford(TEST_SENTENCES_1)
+    for tweet_id, result in enumerate(expected):
+        result['id'] = tweet_id
+    with open(output_path, 'r') as output_file:
+        assert expected == [json.loads(line) for line in output_file]
+
+    output_path = str(tmpdir.join('parsed.conll'))
+    assert main([input_path, output_path, '--quiet']) == 0
+    expected = ''.join(f'{conll}\n\n' for conll
+                       in API().parse_conll(TEST_SENTENCES_1))
+    with open(output_path, 'r') as output_file:
+        assert expected == output_file.read()
+
+    assert main([input_path, output_path, '--port', '8999', '--quiet']) == 1
+
+
+def test_main_errors(tmpdir, capsys):
+    '''
+    Tests that each error is reported as one line on stderr with a non-zero
+    exit status rather than a traceback:
+
+    1. Invalid arguments return 2.
+    2. An input file that does not exist returns 1.
+    3. An input line that cannot be read returns 1.
+    4. A server that cannot be connected to returns 1.
+    5. An error status code from the server returns 1.
+    6. A response that is not valid json returns 1.
+    '''
+
+    def error_line() -> str:
+        error = capsys.readouterr().err
+        assert error.count('\n') == 1
+        return error
+
+    input_path = str(tmpdir.join('tweets.jsonl'))
+    with open(input_path, 'w') as input_file:
+        input_file.write('{"text": "hello"}\n')
+    output_path = str(tmpdir.join('parsed.conll'))
+
+    assert main([input_path, output_path, '--batch-size', '0']) == 2
+    assert 'batch_size' in error_line()
+
+    missing_path = str(tmpdir.join('missing.jsonl'))
+    assert main([missing_path, output_path, '--quiet']) == 1
+    assert missing_path in error_line()
+
+    with open(input_path, 'a') as input_file:
+        input_file.write('{"text": \n')
+    assert main([input_path, output_path, '--quiet']) == 1
+    assert 'line 2' in error_line()
+
+    input_path = str(tmpdir.join('tweets.txt'))
+    with open(input_path, 'w') as input_file:
+        input_file.write('hello\n')
+    assert main([input_path, output_path, '--port', '8999', '--quiet']) == 1
+    assert '8999' in error_line()
+
+    from tweebo_parser.fake_server import FakeServer
+    for transport in ['requests', 'http.client']:
+        with FakeServer('127.0.0.1', 0, failure_rate=1.0) as server:
+            assert main([input_path, output_path, '--hostname', '127.0.0.1',
+                         '--port', str(server.port), '--retries', '0',
+                         '--transport', transport, '--quiet']) == 1
+            assert '503' in error_line()
+        with FakeServer('127.0.0.1', 0, garble_rate=1.0) as server:
+            assert main([input_path, output_path, '--hostname', '127.0.0.1',
+                         '--port', str(server.port), '--retries', '0',
+                         '--transport', transport, '--quiet']) == 1
+            assert 'not valid json' in error_line()
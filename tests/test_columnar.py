@@ -0,0 +1,129 @@
+import pytest
+
+from tweebo_parser import API
+from tweebo_parser.columnar import TokenTable, token_tables
+from tweebo_parser.columnar import TokenTableWriter
+from tweebo_parser.conll import conll_to_stanford
+from tweebo_parser.fake_server import synthetic_conll
+from tweebo_parser.parsed import ParsedTweet
+from test_api import CONLL_0, TEST_SENTENCES_0
+
+CONLL_MWE = '1\tRT\t_\t~\t~\t_\t-1\t_\t_\t_\n' \
+            '2\tNew\t_\t^\t^\t_\t3\tMWE\t_\t_\n' \
+            '3\tYork\t_\t^\t^\t_\t0\t_\t_\t_'
+EXPECTED = {'tweet_id': [0, 0, 0, 2, 2],
+            'token_index': [1, 2, 3, 1, 2],
+            'word': ['RT', 'New', 'York', 'hello', 'world'],
+            'pos': ['~', '^', '^', 'N', 'N'],
+            'head': [-1, 3, 0, 0, 1],
+            'dep': ['_', 'MWE', 'ROOT', 'ROOT', '_']}
+
+
+def conlls():
+    return [CONLL_MWE, '', synthetic_conll('hello world')]
+
+
+def test_token_table():
+    '''
+    Tests:
+
+    1. CoNLL strings, Stanford styled dicts and ParsedTweets give the same
+       table, with ids that default to the position of the result.
+    2. Given ids, and the wrong number of ids.
+    3. Streaming a table per chunk, with ids that carry on between chunks.
+    4. API.parse_table
+    '''
+    stanford = [conll_to_stanford(conll, index)
+                for index, conll in enumerate(conlls())]
+    tweets = [ParsedTweet.from_conll(conll, index)
+              for index, conll in enumerate(conlls())]
+    for results in [conlls(), stanford, tweets]:
+        table = TokenTable()
+        table.extend(results)
+        assert table.to_dict() == EXPECTED
+        assert table.num_tweets == 3
+        assert len(table) == table.num_tokens == 5
+
+    table = TokenTable()
+    table.extend(conlls()[:1], ids=['a'])
+    table.extend(tweets[1:], ids=['b', 'c'])
+    assert table.to_dict()['tweet_id'] == ['a'] * 3 + ['c'] * 2
+    with pytest.raises(ValueError):
+        table.extend(conlls(), ids=[1])
+    with pytest.raises(TypeError):
+        table.extend([1])
+
+    tables = token_tables(conlls() * 3, chunk_size=2)
+    assert [chunk.to_dict()['tweet_id'] for chunk in tables] == \
+        [[0, 0, 0], [2, 2, 3, 3, 3], [5, 5], [6, 6, 6], [8, 8]]
+    tables = token_tables(conlls(), ids=[10, 11, 12], chunk_size=2)
+    assert [chunk.to_dict()['tweet_id'] for chunk in tables] == \
+        [[10, 10, 10], [12, 12]]
+
+    table = API().parse_table(TEST_SENTENCES_0[:1], ids=[7])
+    assert table.to_dict()['word'] == [line.split('\t')[1]
+                                       for line in CONLL_0.split('\n')]
+    assert set(table.to_dict()['tweet_id']) == {7}
+    with pytest.raises(ValueError):
+        API().parse_table(TEST_SENTENCES_0, ids=[7])
+
+
+def test_token_table_numpy():
+    numpy = pytest.importorskip('numpy')
+    table = TokenTable()
+    table.extend(conlls())
+    columns = table.to_numpy()
+    assert {name: column.tolist() for name, column in columns.items()} == \
+        EXPECTED
+    assert columns['head'].dtype == numpy.int32
+    encoded = table.to_numpy(encoded=True)
+    assert encoded['pos'].dtype == numpy.int16
+    assert encoded['pos_vocab'][encoded['pos']].tolist() == EXPECTED['pos']
+    assert encoded['dep_vocab'][encoded['dep']].tolist() == EXPECTED['dep']
+
+    trees = table.tree_arrays()
+    assert trees['length'].tolist() == [len(conll.split('\n'))
+                                        if conll else 0
+                                        for conll in conlls()]
+    assert trees['token_index'].tolist() == EXPECTED['token_index']
+    assert trees['head'].tolist() == EXPECTED['head']
+    assert encoded['dep_vocab'][trees['dep']].tolist() == EXPECTED['dep']
+    assert trees['head'].dtype == numpy.int64
+
+
+def test_token_table_arrow(tmp_path):
+    '''
+    Tests:
+
+    1. The Arrow table, with dictionary encoded POS tags and labels.
+    2. Writing Parquet and Arrow stream files in chunks.
+    '''
+    pyarrow = pytest.importorskip('pyarrow')
+    import pyarrow.parquet
+
+    table = TokenTable()
+    table.extend(conlls())
+    arrow_table = table.to_arrow()
+    assert arrow_table.to_pydict() == EXPECTED
+    assert pyarrow.types.is_dictionary(arrow_table.schema.field('pos').type)
+    assert pyarrow.types.is_dictionary(arrow_table.schema.field('dep').type)
+
+    path = tmp_path / 'tokens.parquet'
+    with TokenTableWriter(path, chunk_size=2) as writer:
+        writer.write(conlls())
+        writer.write(conlls())
+    assert writer.num_tweets == 6
+    assert writer.num_tokens == 10
+    written = pyarrow.parquet.read_table(str(path)).to_pydict()
+    assert written['tweet_id'] == [0, 0, 0, 2, 2, 3, 3, 3, 5, 5]
+    assert written['dep'] == EXPECTED['dep'] * 2
+
+    path = tmp_path / 'tokens.arrows'
+    with TokenTableWriter(path, format='arrow', chunk_size=2) as writer:
+        writer.write(conlls() * 2, ids=range(100, 106))
+    with pyarrow.ipc.open_stream(str(path)) as reader:
+        written = reader.read_all().to_pydict()
+    assert written['tweet_id'] == [100] * 3 + [102] * 2 + [103] * 3 + \
+        [105] * 2
+    with pytest.raises(ValueError):
+        TokenTableWriter(path, format='csv')
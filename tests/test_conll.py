@@ -0,0 +1,30 @@
+import json
+
+from tweebo_parser.conll import conll_to_stanford
+from test_api import B_DEP_0, B_DEP_1, B_DEP_2, CONLL_0, CONLL_1, CONLL_2
+from test_api import TOKENS_0, TOKENS_1, TOKENS_2
+
+
+def test_conll_to_stanford():
+    '''
+    Tests that the Stanford styled output created from the CoNLL output is \
+    the same, including the order of the keys, as the Stanford styled \
+    output of the server for:
+
+    1. 3 different sentences that include unattached tokens (head -1), \
+    multiple ROOTs and MWE labels.
+    2. An empty sentence.
+    '''
+
+    for index, conll, tokens, dependencies in [(0, CONLL_0, TOKENS_0, B_DEP_0),
+                                               (1, CONLL_1, TOKENS_1, B_DEP_1),
+                                               (2, CONLL_2, TOKENS_2,
+                                                B_DEP_2)]:
+        expected = {'index': index, 'tokens': tokens,
+                    'basicDependencies': dependencies}
+        stanford = conll_to_stanford(conll, index)
+        assert expected == stanford
+        assert json.dumps(expected) == json.dumps(stanford)
+
+    empty = {'index': 4, 'tokens': [], 'basicDependencies': []}
+    assert empty == conll_to_stanford('', 4)
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from tweebo_parser import API
+from tweebo_parser.corpus import CorpusJournal, parse_corpus
+from test_api import TEST_SENTENCES_1
+
+
+def test_corpus_journal(tmpdir):
+    '''
+    Tests that the journal:
+
+    1. Keeps the completed batches when it is re-opened.
+    2. Removes a batch that was only partly written to the results or \
+    index file.
+    3. Cannot be re-opened with a different batch size.
+    '''
+
+    directory = str(tmpdir.join('journal'))
+    with CorpusJournal(directory, batch_size=2) as journal:
+        journal.append(0, ['a', 'b'])
+        journal.append(1, ['c', 'd'])
+        assert journal.batch(1) == ['c', 'd']
+
+    results_path = tmpdir.join('journal', 'results.jsonl')
+    index_path = tmpdir.join('journal', 'index.tsv')
+    # A batch written to the results file but not the index, followed by a
+    # batch killed part way through writing.
+    with open(str(results_path), 'ab') as results_file:
+        results_file.write(json.dumps({'batch': 2,
+                                       'results': ['e', 'f']}).encode())
+        results_file.write(b'\n{"batch": 3, "res')
+    with CorpusJournal(directory, batch_size=2) as journal:
+        assert journal.completed == {0, 1}
+        assert list(journal.results()) == ['a', 'b', 'c', 'd']
+        journal.append(2, ['e', 'f'])
+    # An index line killed part way through writing.
+    with open(str(index_path), 'ab') as index_file:
+        index_file.write(b'3\t10')
+    with CorpusJournal(directory, batch_size=2) as journal:
+        assert journal.completed == {0, 1, 2}
+        assert list(journal.results()) == ['a', 'b', 'c', 'd', 'e', 'f']
+
+    with pytest.raises(ValueError):
+        CorpusJournal(directory, batch_size=3)
+
+
+def test_parse_corpus(tmpdir):
+    '''
+    Tests that parsing a corpus gives the same results as \
+    :py:meth:`tweebo_parser.API.parse_stanford`, and that when resumed only \
+    the missing batches are parsed.
+    '''
+
+    texts = TEST_SENTENCES_1 * 3
+    expected = API().parse_stanford(texts)
+    directory = str(tmpdir.join('journal'))
+
+    def stopped_texts():
+        # A job that stops part way through the third batch.
+        yield from texts[:8]
+        raise KeyboardInterrupt()
+
+    with pytest.raises(KeyboardInterrupt):
+        parse_corpus(API(batch_size=2), stopped_texts(), directory,
+                     'stanford', batch_size=3)
+    with CorpusJournal(directory, 3, 'stanford') as journal:
+        assert journal.completed == {0, 1}
+        assert list(journal.results()) == expected[:6]
+
+    journal = parse_corpus(API(batch_size=2), texts, directory,
+                           'stanford', batch_size=3)
+    assert len(journal) == 5
+    assert list(journal.results()) == expected
+
+
+def test_parse_corpus_grown(tmpdir):
+    '''
+    Tests that when texts are added to a corpus whose last batch was short,
+    the batch is parsed again with the added texts, along with the new
+    batches.
+    '''
+    texts = TEST_SENTENCES_1 * 3
+    expected = API().parse_conll(texts)
+    directory = str(tmpdir.join('journal'))
+    journal = parse_corpus(API(), texts[:4], directory, batch_size=3)
+    assert journal.num_texts(1) == 1
+    journal = parse_corpus(API(), texts, directory, batch_size=3)
+    assert journal.completed == {0, 1, 2, 3, 4}
+    assert journal.num_texts(1) == 3
+    assert list(journal.results()) == expected
+    with CorpusJournal(directory, batch_size=3) as journal:
+        assert journal.num_texts(1) == 3
+        assert list(journal.results()) == expected
@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+
+import pytest
+
+from tweebo_parser import API
+from tweebo_parser.error_log import ErrorLog
+from tweebo_parser.fake_server import FakeServer
+
+
+def _write_child(error_log: ErrorLog) -> None:
+    error_log.write('child error')
+    error_log.close()
+
+
+def test_error_log(tmpdir):
+    '''
+    Tests:
+
+    1. Texts are written to the file of the process id once closed.
+    2. The log is rotated once it reaches max_bytes.
+    3. A forked process writes to its own file.
+    4. The log can be pickled.
+    '''
+    path = str(tmpdir.join('tweebo_log.{pid}'))
+    error_log = ErrorLog(path, max_bytes=100, backup_count=2)
+    assert error_log.filename == str(tmpdir.join(f'tweebo_log.{os.getpid()}'))
+    error_log.write('first error')
+    error_log.write('second error')
+    error_log.close()
+    with open(error_log.filename, 'r') as log_file:
+        assert log_file.read() == 'first error\nsecond error\n'
+
+    for _ in range(10):
+        error_log.write('x' * 40)
+    error_log.close()
+    assert os.path.isfile(f'{error_log.filename}.1')
+    assert os.path.isfile(f'{error_log.filename}.2')
+    assert not os.path.isfile(f'{error_log.filename}.3')
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        process = multiprocessing.get_context('fork').Process(
+            target=_write_child, args=(error_log,))
+        process.start()
+        process.join()
+        child_log = str(tmpdir.join(f'tweebo_log.{process.pid}'))
+        with open(child_log, 'r') as log_file:
+            assert log_file.read() == 'child error\n'
+
+    unpickled = pickle.loads(pickle.dumps(error_log))
+    assert unpickled.path == path
+    assert unpickled.dropped == 0
+
+
+def test_error_log_close_full_queue(tmpdir):
+    '''
+    Tests that the log can be closed while its queue is full, writing the
+    queued texts, and that texts that did not fit are counted as dropped.
+    '''
+    error_log = ErrorLog(str(tmpdir.join('tweebo_log')), queue_size=2)
+    error_log.write('first error')
+    error_log.close()
+    error_log.write('second error')
+    # Holds the file handler's lock, stopping the background thread from
+    # writing, so that the queue fills up.
+    file_handler = error_log._listener.handlers[0]
+    locked = threading.Event()
+    unlock = threading.Event()
+
+    def hold_lock() -> None:
+        with file_handler.lock:
+            locked.set()
+            unlock.wait()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    locked.wait()
+    record_queue = error_log._listener.queue
+    num_texts = 0
+    # The background thread may take one more text from the queue before
+    # it blocks on the lock, thus the queue is filled twice.
+    for _ in range(2):
+        while not record_queue.full():
+            error_log.write(f'error {num_texts}')
+            num_texts += 1
+        time.sleep(0.05)
+    error_log.write('dropped error')
+    assert error_log.dropped == 1
+    assert record_queue.full()
+    threading.Timer(0.2, unlock.set).start()
+    error_log.close()
+    holder.join()
+    with open(error_log.filename, 'r') as log_file:
+        lines = log_file.read().split('\n')[:-1]
+    assert lines == ['first error', 'second error'] + \
+        [f'error {index}' for index in range(num_texts)]
+
+
+def test_api_log_errors(tmpdir):
+    '''
+    Tests that responses that cannot be decoded are logged, and that an
+    API does not truncate an existing log.
+    '''
+    log_path = str(tmpdir.join('tweebo_log'))
+    with open(log_path, 'w') as log_file:
+        log_file.write('old error\n')
+    with FakeServer('127.0.0.1', 0, garble_rate=1.0) as server:
+        with API('127.0.0.1', server.port, retries=0, log_errors=True,
+                 log_path=log_path) as tweebo_api:
+            with pytest.raises(Exception):
+                tweebo_api.parse_conll(['hello'])
+    with open(log_path, 'r') as log_file:
+        lines = log_file.read().split('\n')
+    assert lines[0] == 'old error'
+    assert lines[1].startswith('["1\\thello')
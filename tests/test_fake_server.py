@@ -0,0 +1,57 @@
+import json
+import time
+
+import pytest
+import requests
+
+from tweebo_parser import API
+from tweebo_parser.conll import conll_to_stanford
+from tweebo_parser.fake_server import FakeServer, synthetic_conll
+from test_api import CONLL_0, TEST_SENTENCES_0
+
+
+def test_synthetic_conll():
+    assert synthetic_conll('') == ''
+    assert synthetic_conll('  hello   world ') == \
+        '1\thello\t_\tN\tN\t_\t0\t_\t_\t_\n2\tworld\t_\tN\tN\t_\t1\t_\t_\t_'
+
+
+def test_fake_server():
+    '''
+    Tests:
+
+    1. Fixture replay, synthetic parses and both output types.
+    2. Requests that are not a list of strings are responded to with a 500.
+    3. Latency per request and per token.
+    4. Injected failures and garbled json.
+    '''
+    fixtures = {TEST_SENTENCES_0[0]: CONLL_0}
+    with FakeServer('127.0.0.1', 0, fixtures=fixtures) as server:
+        api = API('127.0.0.1', server.port)
+        texts = [TEST_SENTENCES_0[0], 'hello world']
+        assert api.parse_conll(texts) == [CONLL_0, synthetic_conll(texts[1])]
+        assert api.parse_stanford(texts) == \
+            [conll_to_stanford(CONLL_0, 0),
+             conll_to_stanford(synthetic_conll(texts[1]), 1)]
+        assert server.requests == 2
+        assert server.texts == 4
+        with pytest.raises(requests.exceptions.HTTPError):
+            api.parse_conll('hello')
+
+    with FakeServer('127.0.0.1', 0, latency=0.05,
+                    token_latency=0.01) as server:
+        api = API('127.0.0.1', server.port)
+        start_time = time.monotonic()
+        api.parse_conll(['one two three four five'])
+        assert time.monotonic() - start_time >= 0.1
+
+    with FakeServer('127.0.0.1', 0, failure_rate=1.0) as server:
+        url = f'http://127.0.0.1:{server.port}'
+        data = {'texts': ['hello'], 'output_type': 'conll'}
+        assert requests.post(url, json=data).status_code == 503
+    with FakeServer('127.0.0.1', 0, garble_rate=1.0) as server:
+        url = f'http://127.0.0.1:{server.port}'
+        response = requests.post(url, json=data)
+        assert response.status_code == 200
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(response.text)
@@ -0,0 +1,101 @@
+import pickle
+import time
+
+import pytest
+
+from tweebo_parser import API
+from tweebo_parser.fake_server import FakeServer
+from tweebo_parser.hedging import HedgePolicy
+
+
+def test_hedge_policy():
+    '''
+    Tests:
+
+    1. No delay until min_samples latencies have been recorded, then the
+       percentile of the recorded latencies, at least min_delay.
+    2. Hedges are limited by the budget, which starts empty.
+    3. The policy can be pickled.
+    '''
+    with pytest.raises(ValueError):
+        HedgePolicy(percentile=101)
+    policy = HedgePolicy(percentile=90, min_delay=0.002, budget_ratio=0.5,
+                         budget_size=1.0, window=10, min_samples=5)
+    for latency in [0.001, 0.001, 0.001, 0.001]:
+        policy.record_latency(latency)
+    assert policy.delay() is None
+    policy.record_latency(0.001)
+    assert policy.delay() == 0.002
+    for latency in range(1, 11):
+        policy.record_latency(latency)
+    assert policy.delay() == 9
+
+    assert not policy.try_hedge()
+    for _ in range(5):
+        policy.record_request()
+    assert policy.try_hedge()
+    assert not policy.try_hedge()
+    stats = policy.stats()
+    assert stats['requests'] == 5
+    assert stats['hedges'] == 1
+    assert stats['budget_exhausted'] == 2
+    assert stats['delay'] == 9
+
+    unpickled = pickle.loads(pickle.dumps(policy))
+    assert unpickled.stats() == stats
+
+
+def test_api_hedge():
+    '''
+    Tests that requests to a stalled server are hedged to another server,
+    so that calls take about as long as the fast server, and that without
+    budget the requests wait on the stalled server.
+    '''
+    with FakeServer('127.0.0.1', 0, latency=1.0) as stalled, \
+            FakeServer('127.0.0.1', 0) as fast:
+        endpoints = [('127.0.0.1', stalled.port), ('127.0.0.1', fast.port)]
+        policy = HedgePolicy(min_delay=0.01, budget_ratio=1.0, min_samples=1)
+        policy.record_latency(0.01)
+        tweebo_api = API(endpoints=endpoints, hedge=policy)
+        expected = API('127.0.0.1', fast.port).parse_conll(['hello there'])
+        start_time = time.monotonic()
+        for _ in range(4):
+            assert tweebo_api.parse_conll(['hello there']) == expected
+        assert time.monotonic() - start_time < 1.0
+        stats = policy.stats()
+        assert stats['hedges'] >= 1
+        assert stats['hedge_wins'] == stats['hedges']
+
+        policy = HedgePolicy(min_delay=0.01, budget_ratio=0.0, min_samples=1)
+        policy.record_latency(0.01)
+        tweebo_api = API(endpoints=endpoints, hedge=policy)
+        start_time = time.monotonic()
+        for _ in range(2):
+            assert tweebo_api.parse_conll(['hello there']) == expected
+        assert time.monotonic() - start_time >= 1.0
+        assert policy.stats()['hedges'] == 0
+        assert policy.stats()['budget_exhausted'] == 1
+
+
+def test_api_hedge_cancel():
+    '''
+    Tests that, through the http.client transport, the request to a stalled
+    server that a hedge responds to first is stopped rather than waiting
+    on the server, freeing its endpoint, which stays healthy.
+    '''
+    with FakeServer('127.0.0.1', 0, latency=2.0) as stalled, \
+            FakeServer('127.0.0.1', 0) as fast:
+        endpoints = [('127.0.0.1', stalled.port), ('127.0.0.1', fast.port)]
+        policy = HedgePolicy(min_delay=0.01, budget_ratio=1.0, min_samples=1)
+        policy.record_latency(0.01)
+        tweebo_api = API(endpoints=endpoints, hedge=policy,
+                         transport='http.client')
+        start_time = time.monotonic()
+        while policy.stats()['hedge_wins'] == 0:
+            tweebo_api.parse_conll(['hello there'])
+        time.sleep(0.2)
+        stalled_endpoint = tweebo_api.endpoints.endpoints[0]
+        assert stalled_endpoint.port == stalled.port
+        assert stalled_endpoint.in_flight == 0
+        assert stalled_endpoint.healthy
+        assert time.monotonic() - start_time < 1.0
@@ -0,0 +1,63 @@
+import pickle
+
+from tweebo_parser import API
+from tweebo_parser.metrics import MetricsCollector, RequestEvent
+from test_api import TEST_SENTENCES_0
+
+
+def test_metrics_collector():
+    '''
+    Tests:
+
+    1. Successful and failed events are counted separately.
+    2. The histograms are cumulative and include an infinite bucket.
+    3. The Prometheus export contains the counters and histograms.
+    4. The collector can be pickled and reset.
+    '''
+    metrics = MetricsCollector()
+    metrics(RequestEvent('conll', 3, 100, 200, 0.001, 0.02, 0.003, 0.0005))
+    metrics(RequestEvent('conll', 3, 100, 0, wait_time=0.5, retry=0,
+                         error='ServerError'))
+    metrics(RequestEvent('conll', 3, 100, 200, wait_time=0.01, retry=1))
+    snapshot = metrics.snapshot()
+    assert snapshot['requests'] == 3
+    assert snapshot['retries'] == 1
+    assert snapshot['texts'] == 6
+    assert snapshot['errors'] == {'ServerError': 1}
+    assert snapshot['batch_size']['count'] == 2
+    wait = snapshot['phase_seconds']['wait']
+    assert wait['count'] == 3
+    assert abs(wait['sum'] - 0.53) < 1e-9
+    assert dict(wait['buckets'])[0.01] == 1
+    assert dict(wait['buckets'])[0.025] == 2
+    assert dict(wait['buckets'])[float('inf')] == 3
+
+    prometheus = metrics.to_prometheus()
+    assert '# TYPE tweebo_parser_requests_total counter' in prometheus
+    assert 'tweebo_parser_requests_total 3\n' in prometheus
+    assert 'tweebo_parser_errors_total{error="ServerError"} 1\n' in prometheus
+    assert 'tweebo_parser_phase_seconds_bucket{phase="wait",le="0.025"} 2\n' \
+        in prometheus
+    assert 'tweebo_parser_phase_seconds_bucket{phase="wait",le="+Inf"} 3\n' \
+        in prometheus
+    assert 'tweebo_parser_batch_size_count 2\n' in prometheus
+    assert prometheus.count('# TYPE tweebo_parser_phase_seconds') == 1
+
+    unpickled = pickle.loads(pickle.dumps(metrics))
+    assert unpickled.snapshot() == snapshot
+    metrics.reset()
+    assert metrics.snapshot()['requests'] == 0
+
+
+def test_metrics_collector_api():
+    '''
+    Tests that a collector given to :py:class:`tweebo_parser.API` as an
+    instrument counts each batch sent as one request.
+    '''
+    metrics = MetricsCollector()
+    tweebo_api = API(batch_size=1, max_in_flight=3, instruments=[metrics])
+    tweebo_api.parse_stanford(TEST_SENTENCES_0)
+    snapshot = metrics.snapshot()
+    assert snapshot['requests'] == 3
+    assert snapshot['texts'] == 3
+    assert snapshot['batch_size']['buckets'][0] == (1, 3)
@@ -0,0 +1,36 @@
+import pytest
+
+from tweebo_parser.packing import pack_batches, text_cost
+
+
+def test_pack_batches():
+    '''
+    Tests:
+
+    1. Every text is in one batch, of at most batch_size texts, using the
+       fewest batches.
+    2. The longest texts are spread across the batches, evening out the
+       total cost of each batch.
+    3. A custom cost function, and invalid batch sizes.
+    '''
+    assert text_cost('  hello   world ') == 2
+    assert pack_batches([], 3) == []
+
+    lengths = [30, 1, 2, 25, 1, 3, 1, 20, 2]
+    texts = [' '.join(['a'] * length) for length in lengths]
+    batches = pack_batches(texts, 3)
+    assert len(batches) == 3
+    assert sorted(index for batch in batches for index in batch) == \
+        list(range(len(texts)))
+    assert all(len(batch) <= 3 for batch in batches)
+    assert all(batch == sorted(batch) for batch in batches)
+    assert batches == sorted(batches)
+    totals = [sum(lengths[index] for index in batch) for batch in batches]
+    # In order the batches would cost 33, 29 and 23, the longest text with
+    # the two shortest (32) is the least the most costly batch can cost.
+    assert sorted(totals) == [25, 28, 32]
+
+    batches = pack_batches(texts, 4, cost=lambda text: 1)
+    assert [len(batch) for batch in batches] == [3, 3, 3]
+    with pytest.raises(ValueError):
+        pack_batches(texts, 0)
@@ -0,0 +1,50 @@
+import pickle
+
+from tweebo_parser.parsed import DEP_VOCAB, POS_VOCAB, ParsedTweet
+from tweebo_parser.parsed import Vocabulary
+from test_api import B_DEP_0, B_DEP_2, CONLL_0, CONLL_2, TOKENS_0, TOKENS_2
+
+
+def test_vocabulary():
+    '''
+    Tests that the same string is always given the same id.
+    '''
+
+    vocabulary = Vocabulary(['a', 'b'])
+    assert vocabulary.add('b') == 1
+    assert vocabulary.add('c') == 2
+    assert vocabulary.add('a') == 0
+    assert vocabulary.lookup(2) == 'c'
+    assert vocabulary.strings == ['a', 'b', 'c']
+    assert 'c' in vocabulary and 'd' not in vocabulary
+    assert 'ROOT' in DEP_VOCAB and '@' in POS_VOCAB
+
+
+def test_parsed_tweet():
+    '''
+    Tests that a ParsedTweet created from either the CoNLL or the Stanford \
+    styled output:
+
+    1. Is equal to and converts back to the Stanford styled output.
+    2. Converts back to the CoNLL output.
+    3. Can be pickled.
+    4. Is empty for an empty text.
+    '''
+
+    for index, conll, tokens, dependencies in [(0, CONLL_0, TOKENS_0, B_DEP_0),
+                                               (5, CONLL_2, TOKENS_2,
+                                                B_DEP_2)]:
+        stanford = {'index': index, 'tokens': tokens,
+                    'basicDependencies': dependencies}
+        for tweet in [ParsedTweet.from_conll(conll, index),
+                      ParsedTweet.from_stanford(stanford)]:
+            assert tweet == stanford
+            assert tweet.to_stanford() == stanford
+            assert tweet['tokens'] == tokens
+            assert tweet.to_conll() == conll
+            assert tweet.num_tokens == len(tokens)
+            assert pickle.loads(pickle.dumps(tweet)) == stanford
+
+    empty = ParsedTweet.from_conll('', 3)
+    assert empty == {'index': 3, 'tokens': [], 'basicDependencies': []}
+    assert empty.to_conll() == ''
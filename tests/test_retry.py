@@ -0,0 +1,77 @@
+import json
+
+import requests
+
+from tweebo_parser import ServerError
+from tweebo_parser.retry import RetryPolicy
+
+
+def http_error(status_code: int) -> requests.exceptions.HTTPError:
+    response = requests.models.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(response=response)
+
+
+def test_retry_policy_limits():
+    '''
+    Tests that:
+
+    1. Json decoding errors and retry status codes are retried up to \
+    max_retries times.
+    2. Connection errors are retried up to connection_retries times.
+    3. Other status codes are never retried.
+    4. Failures and wasted bytes are recorded.
+    '''
+
+    policy = RetryPolicy(max_retries=3, connection_retries=1)
+    decode_error = json.JSONDecodeError('error', '', 0)
+    server_error = ServerError(requests.exceptions.ConnectionError(),
+                               '0.0.0.0', 8000)
+    for error, max_retries in [(decode_error, 3), (http_error(503), 3),
+                               (server_error, 1), (http_error(500), 0),
+                               (http_error(400), 0)]:
+        for retries in range(max_retries):
+            assert policy.retry_delay(error, retries, 10) is not None
+        assert policy.retry_delay(error, max_retries, 10) is None
+
+    stats = policy.stats()
+    assert stats['retries'] == 7
+    assert stats['failures'] == {'JSONDecodeError': 4, 'HTTPError': 6,
+                                 'ServerError': 2}
+    assert stats['wasted_bytes'] == 120
+    policy.reset_stats()
+    assert policy.stats()['retries'] == 0
+
+
+def test_retry_policy_backoff():
+    '''
+    Tests that the wait doubles with each retry up to max_backoff, and that \
+    jitter only ever shortens the wait.
+    '''
+
+    error = json.JSONDecodeError('error', '', 0)
+    policy = RetryPolicy(backoff=0.1, max_backoff=0.5, jitter=0)
+    delays = [policy.retry_delay(error, retries) for retries in range(5)]
+    assert delays == [0.1, 0.2, 0.4, 0.5, 0.5]
+
+    policy = RetryPolicy(backoff=0.1, max_backoff=0.5, jitter=0.5)
+    for retries in range(5):
+        delay = policy.retry_delay(error, retries)
+        assert delays[retries] / 2 <= delay <= delays[retries]
+
+
+def test_retry_policy_budget():
+    '''
+    Tests that once the retry budget is used up failed requests are not \
+    retried until enough requests have been made to refill it.
+    '''
+
+    error = json.JSONDecodeError('error', '', 0)
+    policy = RetryPolicy(budget_size=2, budget_ratio=0.5)
+    assert policy.retry_delay(error, 0) is not None
+    assert policy.retry_delay(error, 0) is not None
+    assert policy.retry_delay(error, 0) is None
+    assert policy.stats()['budget_exhausted'] == 1
+    policy.record_request()
+    policy.record_request()
+    assert policy.retry_delay(error, 0) is not None
@@ -0,0 +1,50 @@
+from tweebo_parser.conll import conll_to_stanford
+from tweebo_parser.retweet import splice_retweet, split_retweet
+from test_api import CONLL_2, TEST_SENTENCES_0
+
+
+def body_conll(conll: str) -> str:
+    '''
+    :return: The CoNLL parse of a retweet without its three prefix tokens.
+    '''
+    lines = []
+    for line in conll.split('\n')[3:]:
+        columns = line.split('\t')
+        columns[0] = str(int(columns[0]) - 3)
+        if int(columns[6]) > 0:
+            columns[6] = str(int(columns[6]) - 3)
+        lines.append('\t'.join(columns))
+    return '\n'.join(lines)
+
+
+def test_split_retweet():
+    '''
+    Tests that only texts starting with `RT @handle:` followed by a body
+    are split.
+    '''
+    assert split_retweet(TEST_SENTENCES_0[2]) == \
+        ('@DjBlack_Pearl', 'wat muhfuckaz wearin 4 the lingerie party?????')
+    assert split_retweet('RT  @a_1 :\thello') == ('@a_1', 'hello')
+    assert split_retweet('RT @a: RT @b: hi') == ('@a', 'RT @b: hi')
+    for text in [TEST_SENTENCES_0[0], 'RT @a: ', 'RT @a:hello',
+                 'RT: hello', ' RT @a: hello', 'rt @a: hello']:
+        assert split_retweet(text) is None
+
+
+def test_splice_retweet():
+    '''
+    Tests that adding the prefix to the parse of the body of the retweet
+    fixture gives the parse of the whole retweet, in both formats, without
+    changing the parse of the body.
+    '''
+    body = body_conll(CONLL_2)
+    assert body.split('\n')[0] == '1\twat\t_\tO\tO\t_\t0\t_\t_\t_'
+    assert splice_retweet(body, '@DjBlack_Pearl') == CONLL_2
+    body_stanford = conll_to_stanford(body, 4)
+    assert splice_retweet(body_stanford, '@DjBlack_Pearl') == \
+        conll_to_stanford(CONLL_2, 4)
+    assert body_stanford == conll_to_stanford(body, 4)
+    assert splice_retweet('', '@a') == \
+        '1\tRT\t_\t~\t~\t_\t-1\t_\t_\t_\n' \
+        '2\t@a\t_\t@\t@\t_\t-1\t_\t_\t_\n' \
+        '3\t:\t_\t~\t~\t_\t-1\t_\t_\t_'
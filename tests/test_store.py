@@ -0,0 +1,114 @@
+import pytest
+
+from tweebo_parser.conll import conll_to_stanford
+from tweebo_parser.fake_server import synthetic_conll
+from tweebo_parser.parsed import ParsedTweet
+from tweebo_parser.store import ResultStore
+from test_api import CONLL_0, CONLL_2
+
+CONLL_NEW_TAG = '1\tx\t_\tQ\tQ\t_\t0\t_\t_\t_'
+
+
+def test_result_store(tmpdir):
+    '''
+    Tests:
+
+    1. CoNLL strings, Stanford styled dicts and ParsedTweets are stored and
+       read back as the same parse, including empty and non ASCII tweets.
+    2. Look ups by tweet id while the ids are in ascending order and after
+       they are not, where the last tweet added with an id is returned.
+    3. Appending after the store is re-opened, default ids and a POS tag
+       not within POS_VOCAB.
+    4. Wrong number of ids and a readonly store.
+    '''
+    directory = str(tmpdir.join('store'))
+    conlls = [CONLL_0, '', synthetic_conll('héllo wörld'), CONLL_2]
+    with ResultStore(directory) as store:
+        store.extend(conlls[:2], ids=[10, 20])
+        store.extend([conll_to_stanford(conlls[2], 0)], ids=[30])
+        store.extend([ParsedTweet.from_conll(conlls[3], 0)], ids=[40])
+        assert len(store) == 4
+        assert [store[tweet_id].to_conll()
+                for tweet_id in [10, 20, 30, 40]] == conlls
+        assert store[30].words == ('héllo', 'wörld')
+        assert store[30].word(1) == 'wörld'
+        assert store[10].to_parsed() == \
+            ParsedTweet.from_conll(CONLL_0, 10)
+        assert [tweet.tweet_id for tweet in store] == [10, 20, 30, 40]
+        assert 25 not in store
+        with pytest.raises(KeyError):
+            store[25]
+        assert store.get(25) is None
+
+        store.extend([CONLL_2], ids=[20])
+        assert store[20].to_conll() == CONLL_2
+        assert 15 not in store
+
+    with ResultStore(directory) as store:
+        assert store.tweet_ids() == [10, 20, 30, 40, 20]
+        assert store[20].to_conll() == CONLL_2
+        store.extend([CONLL_NEW_TAG])
+        assert store[41].pos == ['Q']
+        with pytest.raises(ValueError):
+            store.extend(conlls, ids=[1])
+
+    with ResultStore(directory, readonly=True) as store:
+        assert store[41].pos == ['Q']
+        assert [tweet.to_conll() for tweet in store.scan(2, 4)] == \
+            conlls[2:]
+        with pytest.raises(ValueError):
+            store.extend(conlls)
+    with pytest.raises(FileNotFoundError):
+        ResultStore(str(tmpdir.join('missing')), readonly=True)
+
+
+def test_result_store_failed_extend(tmpdir):
+    '''
+    Tests that a POS tag added while encoding a call to extend that then
+    fails is saved by the next call that uses it.
+    '''
+    # A tag that no other test adds to POS_VOCAB, so that it is not within
+    # the vocabulary of a new store.
+    conll = '1\tx\t_\tQF\tQF\t_\t0\t_\t_\t_'
+    directory = str(tmpdir.join('store'))
+    oversized = ParsedTweet(0, ['a'] * 40000, ['N'] * 40000, [0] * 40000,
+                            ['_'] * 40000)
+    with ResultStore(directory) as store:
+        with pytest.raises(ValueError):
+            store.extend([conll, oversized], ids=[1, 2])
+        assert len(store) == 0
+        store.extend([conll], ids=[3])
+    with ResultStore(directory, readonly=True) as store:
+        assert store.tweet_ids() == [3]
+        assert store[3].pos == ['QF']
+
+
+def test_result_store_recovery(tmpdir):
+    '''
+    Tests:
+
+    1. Tweets whose record or index entry was only partly written are
+       removed when the store is re-opened for appending.
+    2. A readonly store only reads tweets whose record and index entry are
+       complete, and reads those added by another store on refresh.
+    '''
+    directory = tmpdir.join('store')
+    with ResultStore(str(directory)) as store:
+        store.extend([CONLL_0, CONLL_2])
+    size = directory.join('tweets.bin').size()
+
+    with open(str(directory.join('tweets.bin')), 'ab') as tweets_file:
+        tweets_file.write(b'\x05\x00')
+    with open(str(directory.join('index.bin')), 'ab') as index_file:
+        index_file.write(b'\x02\x00\x00')
+    with ResultStore(str(directory), readonly=True) as reader:
+        assert len(reader) == 2
+        with ResultStore(str(directory)) as store:
+            assert len(store) == 2
+            assert directory.join('tweets.bin').size() == size
+            assert directory.join('index.bin').size() == 32
+            store.extend([CONLL_NEW_TAG])
+        assert len(reader) == 2
+        reader.refresh()
+        assert reader[2].to_conll() == CONLL_NEW_TAG
+        assert reader[1].to_conll() == CONLL_2
@@ -0,0 +1,69 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from tweebo_parser.stream import iter_json_array, json_loads
+
+
+def test_iter_json_array():
+    '''
+    Tests that arrays split at every position decode the same as
+    json.loads, including strings containing brackets, commas, quotes and
+    escapes, and that invalid or incomplete arrays raise a JSONDecodeError.
+    '''
+    arrays = [[], ['a'], ['1\tI\t_\tO', '"quoted" \\ back', '[{,}]'],
+              [{'index': 0, 'tokens': [{'word': 'RT', 'pos': '~'}],
+                'basicDependencies': []}, {'word': '》have :)'}], [[1, [2]]]]
+    for array in arrays:
+        data = json.dumps(array).encode('utf-8')
+        for split in range(len(data) + 1):
+            chunks = [data[:split], data[split:]]
+            assert list(iter_json_array(chunks)) == array
+        one_byte_chunks = [data[i: i + 1] for i in range(len(data))]
+        assert list(iter_json_array(one_byte_chunks)) == array
+    assert list(iter_json_array([b'  [1 , 2]\n'])) == [1, 2]
+
+    for invalid in [b'', b'[', b'["a", "b', b'[1,]', b'{"a": 1}', b'[1}',
+                    b'[1] 2']:
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array([invalid]))
+
+
+def test_iter_json_array_lazy():
+    '''
+    Tests that elements are yielded before the rest of the array has been
+    read.
+    '''
+    def chunks():
+        yield b'["first",'
+        raise AssertionError('Read too far')
+
+    assert next(iter_json_array(chunks())) == 'first'
+
+
+def test_json_loads():
+    '''
+    Tests that each backend gives its decoding function, and that orjson is
+    only imported once its backend is asked for, not by importing the
+    package.
+    '''
+    assert json_loads('json') is json.loads
+    with pytest.raises(ValueError):
+        json_loads('simplejson')
+    try:
+        import orjson
+    except ImportError:
+        assert json_loads('auto') is json.loads
+        with pytest.raises(ImportError):
+            json_loads('orjson')
+    else:
+        assert json_loads('orjson') is orjson.loads
+        data = b'["a", {"b": [1, 2]}]'
+        assert list(iter_json_array([data], json_loads('orjson'))) == \
+            ['a', {'b': [1, 2]}]
+
+    code = 'import sys, tweebo_parser; print("orjson" in sys.modules)'
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.strip() == b'False'
@@ -0,0 +1,141 @@
+import json
+import pickle
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from tweebo_parser import API, ServerError
+from tweebo_parser.conll import conll_to_stanford
+from tweebo_parser.fake_server import FakeServer, synthetic_conll
+from tweebo_parser.retry import RetryPolicy
+from tweebo_parser.transport import Cancellation, ConnectionFailed
+from tweebo_parser.transport import create_transport, HTTPClientTransport
+from tweebo_parser.transport import HTTPStatusError, RequestsTransport
+from tweebo_parser.transport import Transport, TransportTimeout
+
+
+def test_http_client_transport():
+    '''
+    Tests:
+
+    1. The API parses the same through the http.client transport as through
+       the requests transport.
+    2. Connections are re-used, and a connection the server has closed is
+       replaced without an error.
+    3. Error status codes raise HTTPStatusError, and are retried.
+    4. Timeouts and servers that are not running raise ServerError.
+    5. Streamed responses.
+    '''
+    texts = ['hello world', 'RT @user : a b c']
+    conlls = [synthetic_conll(text) for text in texts]
+    with FakeServer('127.0.0.1', 0) as server:
+        server_url = f'http://127.0.0.1:{server.port}'
+        with API('127.0.0.1', server.port, transport='http.client') as api:
+            assert isinstance(api.transport, HTTPClientTransport)
+            assert api.parse_conll(texts) == conlls
+            assert api.parse_stanford(texts) == \
+                [conll_to_stanford(conll, index)
+                 for index, conll in enumerate(conlls)]
+            assert list(api.parse_stream(texts)) == conlls
+            idle = api.transport._idle[('127.0.0.1', server.port)]
+            assert len(idle) == 1
+            connection = idle[0][0]
+            assert api.parse_conll(texts) == conlls
+            assert idle[0][0] is connection
+            # As if the server had closed the idle connection.
+            connection.sock.close()
+            assert api.parse_conll(texts) == conlls
+            assert idle[0][0] is not connection
+
+            with pytest.raises(HTTPStatusError) as error:
+                api.parse_conll('hello')
+            assert error.value.response.status_code == 500
+            assert error.value.response.url == server_url
+
+    with FakeServer('127.0.0.1', 0, latency=0.5) as server:
+        policy = RetryPolicy(connection_retries=0)
+        api = API('127.0.0.1', server.port, transport='http.client',
+                  timeout=0.05, retry_policy=policy)
+        with pytest.raises(ServerError) as error:
+            api.parse_conll(texts)
+        assert isinstance(error.value.__context__, TransportTimeout)
+        assert 'Time out' in error.value.message
+    port = server.port
+    api = API('127.0.0.1', port, transport='http.client',
+              retry_policy=RetryPolicy(connection_retries=0))
+    with pytest.raises(ServerError):
+        api.parse_conll(texts)
+
+    with FakeServer('127.0.0.1', 0, failure_rate=1.0) as server:
+        policy = RetryPolicy(max_retries=2, backoff=0.0)
+        api = API('127.0.0.1', server.port, transport='http.client',
+                  retry_policy=policy)
+        with pytest.raises(HTTPStatusError):
+            api.parse_conll(texts)
+        assert policy.retries == 2
+        assert server.requests == 3
+
+
+def test_transport_cancellation():
+    '''
+    Tests that a request waiting on a slow server is stopped, raising
+    ConnectionFailed, once it is cancelled from another thread, and that
+    its connection is not re-used.
+    '''
+    body = json.dumps({'texts': ['hello'], 'output_type': 'conll'})
+    headers = {'Content-Type': 'application/json'}
+    with FakeServer('127.0.0.1', 0, latency=2.0) as server:
+        url = f'http://127.0.0.1:{server.port}'
+        transport = HTTPClientTransport()
+        cancellation = Cancellation()
+        threading.Timer(0.1, cancellation.cancel).start()
+        start_time = time.monotonic()
+        with pytest.raises(ConnectionFailed):
+            transport.post(url, body.encode('utf-8'), headers,
+                           cancellation=cancellation)
+        assert time.monotonic() - start_time < 1.0
+        assert transport._idle == {}
+        with pytest.raises(ConnectionFailed):
+            transport.post(url, body.encode('utf-8'), headers,
+                           cancellation=cancellation)
+
+
+def test_create_transport():
+    '''
+    Tests:
+
+    1. Transports are created by name, unknown names raise a ValueError.
+    2. Transports can be pickled, without their connections.
+    3. Importing the package does not import requests.
+    4. A transport that does not implement every method cannot be
+       created.
+    '''
+    transport = create_transport('requests', keep_alive=False,
+                                 pool_maxsize=4)
+    assert isinstance(transport, RequestsTransport)
+    assert not transport.keep_alive
+    assert transport.pool_maxsize == 4
+    with pytest.raises(ValueError):
+        create_transport('urllib')
+    with pytest.raises(ValueError):
+        API(transport='urllib')
+
+    api = API(transport='http.client', pool_maxsize=3)
+    unpickled = pickle.loads(pickle.dumps(api))
+    assert isinstance(unpickled.transport, HTTPClientTransport)
+    assert unpickled.transport.pool_maxsize == 3
+    assert unpickled.transport._idle == {}
+
+    code = 'import sys, tweebo_parser; print("requests" in sys.modules)'
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.strip() == b'False'
+
+    class PostOnlyTransport(Transport):
+        def post(self, url, body, headers, timeout=None, stream=False):
+            return None
+
+    with pytest.raises(TypeError):
+        PostOnlyTransport()
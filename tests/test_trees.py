@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from tweebo_parser.columnar import TokenTable
+from tweebo_parser.parsed import ParsedTweet
+from test_api import CONLL_0
+
+pytest.importorskip('numpy')
+from tweebo_parser.trees import TreeBatch  # noqa: E402
+
+# Two roots (3 and 5), an unattached token (1) and the multi word
+# expressions 2-3 and 6-7-5.
+HEADS = [-1, 3, 0, 3, 0, 7, 5, 5]
+LABELS = ['_', 'MWE', 'ROOT', '_', 'ROOT', 'MWE', 'MWE', '_']
+
+
+def random_tweet(num_tokens: int) -> ParsedTweet:
+    heads = [0] * num_tokens
+    order = random.sample(range(num_tokens), num_tokens)
+    for position, token in enumerate(order):
+        if position and random.random() < 0.9:
+            heads[token] = order[random.randrange(position)] + 1
+        else:
+            heads[token] = random.choice([0, -1])
+    return ParsedTweet(0, ['w'] * num_tokens, ['N'] * num_tokens, heads,
+                       ['_'] * num_tokens)
+
+
+def ancestors(heads, token):
+    '''
+    :return: The ancestors of the token (starting at 1), nearest first.
+    '''
+    found = []
+    while heads[token - 1] > 0:
+        token = heads[token - 1]
+        found.append(token)
+    return found
+
+
+def test_tree_batch():
+    '''
+    Tests:
+
+    1. The indexes of a tweet with several roots, an unattached token and
+       multi word expressions, after an empty tweet.
+    2. Paths, governed tokens and lowest common ancestors across a batch of
+       random forests against looping over the heads of each token.
+    3. Heads that contain a cycle or do not refer to a token.
+    '''
+    tweet = ParsedTweet(0, [str(index) for index in range(1, 9)],
+                        ['N'] * 8, HEADS, LABELS)
+    batch = TreeBatch(['', tweet])
+    assert batch.num_tweets == 2
+    assert batch.offsets.tolist() == [0, 0, 8]
+    assert batch.parent.tolist() == [-1, 2, -1, 2, -1, 6, 4, 4]
+    assert batch.depth.tolist() == [0, 1, 0, 1, 0, 2, 1, 1]
+    assert batch.top.tolist() == [0, 2, 2, 2, 4, 4, 4, 4]
+    assert batch.span_start.tolist() == [1, 2, 2, 4, 5, 6, 6, 8]
+    assert batch.span_end.tolist() == [1, 2, 4, 4, 8, 6, 7, 8]
+    assert batch.subtree_size.tolist() == [1, 1, 3, 1, 4, 1, 2, 1]
+    assert batch.children_of(4).tolist() == [6, 7]
+    assert batch.roots().tolist() == [2, 4]
+    assert [rows.tolist() for rows in batch.forest(1)] == \
+        [[0], [1, 2, 3], [4, 5, 6, 7]]
+    assert [rows.tolist() for rows in batch.mwe_groups()] == \
+        [[1, 2], [4, 5, 6]]
+    assert batch.subtree(4).tolist() == [4, 5, 6, 7]
+    assert batch.path(5, 7) == [5, 6, 4, 7]
+    assert batch.path(1, 3) == [1, 2, 3]
+    assert batch.path(0, 3) is None
+    assert batch.rows([1, 1], [1, 8]).tolist() == [0, 7]
+
+    table = TokenTable()
+    table.extend([CONLL_0])
+    assert TreeBatch(table).depth.tolist() == \
+        TreeBatch([CONLL_0]).depth.tolist()
+
+    random.seed(0)
+    tweets = [random_tweet(random.randint(1, 30)) for _ in range(50)]
+    batch = TreeBatch(tweets)
+    pairs = [(tweet_index, random.randint(1, tweet.num_tokens),
+              random.randint(1, tweet.num_tokens))
+             for tweet_index, tweet in enumerate(tweets) for _ in range(5)]
+    tweet_indexes, tokens_a, tokens_b = zip(*pairs)
+    rows_a = batch.rows(tweet_indexes, tokens_a)
+    rows_b = batch.rows(tweet_indexes, tokens_b)
+    expected_lengths = []
+    expected_governs = []
+    for tweet_index, token_a, token_b in pairs:
+        heads = tweets[tweet_index].heads
+        path_a = [token_a] + ancestors(heads, token_a)
+        path_b = [token_b] + ancestors(heads, token_b)
+        common = [token for token in path_a if token in path_b]
+        expected_lengths.append(path_a.index(common[0]) +
+                                path_b.index(common[0]) if common else -1)
+        expected_governs.append(token_a in path_b[1:])
+    assert batch.path_lengths(rows_a, rows_b).tolist() == expected_lengths
+    assert batch.governs(rows_a, rows_b).tolist() == expected_governs
+    for row_a, row_b, length in zip(rows_a, rows_b, expected_lengths):
+        path = batch.path(row_a, row_b)
+        assert (path is None and length == -1) or len(path) == length + 1
+
+    governed = batch.governed_mask(rows_a)
+    expected = []
+    for tweet_index, tweet in enumerate(tweets):
+        heads_of = {token_a for index, token_a in
+                    zip(tweet_indexes, tokens_a) if index == tweet_index}
+        expected.extend(bool(heads_of.intersection(ancestors(tweet.heads,
+                                                             token)))
+                        for token in range(1, tweet.num_tokens + 1))
+    assert governed.tolist() == expected
+
+    cycle = ParsedTweet(0, ['a', 'b', 'c'], ['N'] * 3, [0, 3, 2],
+                        ['_'] * 3)
+    with pytest.raises(ValueError):
+        TreeBatch([cycle])
+    with pytest.raises(ValueError):
+        TreeBatch([ParsedTweet(0, ['a'], ['N'], [2], ['_'])])
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from tweebo_parser.tuning import AdaptiveController
+
+
+def test_adaptive_controller():
+    '''
+    Tests that the controller:
+
+    1. Takes turns increasing the batch size and in flight after each \
+    window without errors.
+    2. Halves both after a window with an error or a slow request.
+    3. Keeps the settings within their bounds.
+    '''
+
+    controller = AdaptiveController(batch_size=10, in_flight=2,
+                                    max_batch_size=30, max_in_flight=3,
+                                    batch_size_step=10, window=2,
+                                    target_latency=1.0, drop_tolerance=0)
+    settings = []
+    for _ in range(5):
+        controller.record(10, 0.1)
+        controller.record(10, 0.1)
+        settings.append((controller.batch_size, controller.in_flight))
+    assert settings == [(20, 2), (20, 3), (30, 3), (30, 3), (30, 3)]
+
+    controller.record(10, 0.1)
+    controller.record(10, 0.1, error=True)
+    assert (controller.batch_size, controller.in_flight) == (15, 1)
+    controller.record(10, 0.1)
+    controller.record(10, 2.0)
+    assert (controller.batch_size, controller.in_flight) == (7, 1)
+
+    current = controller.settings()
+    assert current['batch_size'] == 7 and current['in_flight'] == 1
+    assert current['increases'] == 5 and current['decreases'] == 2
+
+    with pytest.raises(ValueError):
+        AdaptiveController(min_batch_size=10, max_batch_size=5)
+    with pytest.raises(ValueError):
+        AdaptiveController(decrease_factor=1)
+
+
+def test_adaptive_controller_idle():
+    '''
+    Tests that time with no requests in flight, such as the client being
+    idle between calls, does not lower the throughput and cause a decrease.
+    '''
+
+    controller = AdaptiveController(batch_size=10, in_flight=2, window=2,
+                                    target_latency=None)
+    for pause in [0, 0, 0, 0.5]:
+        time.sleep(pause)
+        for _ in range(2):
+            time.sleep(0.01)
+            controller.record(10, 0.01)
+    assert controller.decreases == 0
+    assert controller.increases == 4
+    assert (controller.batch_size, controller.in_flight) == (42, 4)
@@ -1 +1,4 @@
-from tweebo_parser.api import API, ServerError
+from tweebo_parser.api import API, DeadlineExceeded, ResponseDecodeError
+from tweebo_parser.api import ServerError
+from tweebo_parser.async_api import AsyncAPI
+from tweebo_parser.parsed import ParsedTweet
@@ -0,0 +1,5 @@
+import sys
+
+from tweebo_parser.cli import main
+
+sys.exit(main())
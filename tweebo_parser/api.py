@@ -2,12 +2,43 @@
 Module contains the following class:
 '''
 
-from pathlib import Path
+from collections import deque, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import wait
+import itertools
 import json
-import tempfile
-from typing import List, Dict, Union
+import os
+import threading
+import time
+import urllib.parse
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional
+from typing import Tuple, Union
 
-import requests
+from tweebo_parser.cache import LRUCache
+from tweebo_parser.columnar import TokenTable
+from tweebo_parser.conll import conll_to_stanford
+from tweebo_parser.endpoints import Endpoint, EndpointPool
+from tweebo_parser.error_log import ErrorLog
+from tweebo_parser.hedging import HedgePolicy
+from tweebo_parser.metrics import RequestEvent
+from tweebo_parser.packing import pack_batches
+from tweebo_parser.parsed import ParsedTweet
+from tweebo_parser.retry import RetryPolicy
+from tweebo_parser.retweet import splice_retweet, split_retweet
+from tweebo_parser.stream import iter_json_array, json_loads
+from tweebo_parser.transport import Cancellation, connection_errors
+from tweebo_parser.transport import create_transport, HTTPClientTransport
+from tweebo_parser.transport import Response, status_errors, timeout_errors
+from tweebo_parser.transport import Transport, TransportTimeout
+from tweebo_parser.tuning import AdaptiveController
+
+# Number of texts per request in API.parse_iter, and the starting batch size
+# when auto tuning, when API.batch_size is None
+ITER_BATCH_SIZE = 100
+_HEADERS = {'Content-Type': 'application/json'}
+# Characters the TweeboParser tokeniser treats as whitespace, texts made up
+# of only these characters have no tokens.
+_WHITESPACE = ' \t\n\r\x0b\x0c'
 
 
 class API(object):
@@ -20,29 +51,298 @@ class API(object):
     1. hostname -- The IP address of the TweeboParser API server.
     2. port -- The Port that the TweeboParser API server is attached to.
     3. retries -- Number of times to retry json decoding the returned data.
+       Ignored if a retry_policy is given.
     4. log_errors -- Whether to log errors or not. If this is True it logs
-       errors under `tweebo_log` file within your temp_dir
+       errors to error_log, by default the `tweebo_log.<process id>` file
+       within your temp_dir
+    5. keep_alive -- Whether to re-use connections to the server through a
+       connection pool. If False a new connection is made (and closed) for
+       every request.
+    6. pool_maxsize -- Maximum number of connections kept open in the pool.
+    7. pool_idle_timeout -- Number of seconds a pool can be left unused
+       before its connections are closed and a new pool is created.
+    8. batch_size -- Maximum number of texts to send to the server in one
+       request. If None all of the texts are sent in one request.
+    9. max_in_flight -- Maximum number of requests (batches) that can be
+       waiting on the server at the same time.
+    10. endpoints -- The servers that requests are spread across, by default
+        only the server at `hostname`:`port`. See
+        :py:class:`tweebo_parser.endpoints.EndpointPool`
+    11. cache -- :py:class:`tweebo_parser.cache.LRUCache` of parsed texts,
+        None if caching is disabled.
+    12. stanford_from_conll -- Whether the Stanford styled output is created
+        locally from the CoNLL output of the server.
+    13. retry_policy -- :py:class:`tweebo_parser.retry.RetryPolicy` that
+        decides which failed requests are retried and records the retries.
+    14. tuner -- :py:class:`tweebo_parser.tuning.AdaptiveController` that
+        sets the batch size and number of batches in flight, None if
+        batch_size and max_in_flight are used.
+    15. instruments -- Functions called with a
+        :py:class:`tweebo_parser.metrics.RequestEvent` after every attempt
+        at a request, e.g. a :py:class:`tweebo_parser.metrics.MetricsCollector`
+    16. error_log -- :py:class:`tweebo_parser.error_log.ErrorLog` that errors
+        are written to, from a background thread.
+    17. timeout -- Seconds to wait to connect to the server and between
+        bytes of the response, as (connect, read) or one number for both.
+        None waits forever.
+    18. deadline -- Seconds a call has to finish within, across all of its
+        batches and retries, None for no limit.
+    19. hedge_policy -- :py:class:`tweebo_parser.hedging.HedgePolicy` that
+        decides when a slow request is duplicated to another endpoint, None
+        if requests are not hedged.
+    20. transport -- :py:class:`tweebo_parser.transport.Transport` that
+        requests are sent through. keep_alive, pool_maxsize and
+        pool_idle_timeout configure the transport created by name. With the
+        `http.client` transport error status codes are raised as
+        :py:class:`tweebo_parser.transport.HTTPStatusError` rather than
+        :py:class:`requests.exceptions.HTTPError`
+    21. pack_batches -- Whether the texts of a call are split into batches
+        of similar total length, rather than in order.
+    22. reuse_retweets -- Whether only the body of a retweet is parsed and
+        the `RT @handle:` prefix added to its parse locally.
+
     .. automethod:: __init__
     '''
 
     def __init__(self, hostname: str = '0.0.0.0',
                  port: int = 8000, retries: int = 10,
-                 log_errors: bool = False) -> None:
+                 log_errors: bool = False, keep_alive: bool = True,
+                 pool_maxsize: int = 10,
+                 pool_idle_timeout: Optional[float] = 30.0,
+                 batch_size: Optional[int] = None,
+                 max_in_flight: int = 1,
+                 endpoints: Optional[List[Tuple[str, int]]] = None,
+                 probe_interval: float = 5.0, cache_size: int = 0,
+                 stanford_from_conll: bool = False,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 auto_tune: Union[bool, AdaptiveController] = False,
+                 instruments: Optional[List[Callable[[RequestEvent], Any]]]
+                 = None, log_path: Optional[str] = None,
+                 timeout: Optional[Union[float, Tuple[Optional[float],
+                                                      Optional[float]]]]
+                 = None, deadline: Optional[float] = None,
+                 hedge: Union[bool, HedgePolicy] = False,
+                 transport: Union[str, Transport] = 'requests',
+                 pack_batches: bool = False,
+                 reuse_retweets: bool = False) -> None:
         '''
         :param hostname: The IP address of the TweeboParser API server.
         :param port: The Port that the TweeboParser API server is attached to.
         :param retries: Number of times to retry json decoding the
                         returned data.
-
+        :param log_errors: Whether to log errors to the `tweebo_log` file.
+        :param keep_alive: Whether to keep connections open and re-use them
+                           between requests.
+        :param pool_maxsize: Maximum number of connections to keep open.
+        :param pool_idle_timeout: Seconds the connection pool can be idle
+                                  before it is closed. None never closes
+                                  an idle pool.
+        :param batch_size: Maximum number of texts per request, texts are
+                           split into batches of this size and sent
+                           concurrently. None sends all texts in one request.
+        :param max_in_flight: Maximum number of batches to send concurrently.
+        :param endpoints: (hostname, port) of each TweeboParser API server to
+                          spread requests across, each request goes to the
+                          server with the fewest requests in flight. Servers
+                          that cannot be connected to are not used until
+                          they are running again. Overrides hostname and
+                          port, which are set to the first endpoint.
+        :param probe_interval: Seconds between checking whether servers that
+                               could not be connected to are running again.
+        :param cache_size: Number of parsed texts to keep in memory, per
+                           output type, so that texts that have been parsed
+                           before are not sent to the server again. 0
+                           disables the cache.
+        :param stanford_from_conll: Whether :py:meth:`parse_stanford` should
+            request the CoNLL output from the server and convert it locally
+            using :py:func:`tweebo_parser.conll.conll_to_stanford`, which
+            sends and decodes far less data.
+        :param retry_policy: Decides which failed requests are retried and
+                             how long to wait before retrying. Defaults to
+                             RetryPolicy(max_retries=retries).
+        :param auto_tune: Whether to tune the batch size and number of
+                          batches in flight from the observed latency and
+                          throughput of the server instead of using
+                          batch_size and max_in_flight. True uses an
+                          AdaptiveController starting from batch_size and
+                          max_in_flight, a controller can also be given.
+        :param instruments: Functions called with the timings, sizes and
+                            errors of every attempt at a request, within the
+                            thread that sent the request.
+        :param log_path: Path of the error log file, `{pid}` is replaced
+                         with the process id. Default
+                         `tweebo_log.{pid}` within the temp directory.
+        :param timeout: Seconds to wait to connect to the server and to wait
+                        for each read of the response, either one number
+                        for both or a (connect, read) tuple. None waits
+                        forever.
+        :param deadline: Seconds each call of :py:meth:`parse_conll`,
+                         :py:meth:`parse_stanford` and :py:meth:`parse_tweets`
+                         has to finish within, including all of its batches
+                         and retries, and each batch of :py:meth:`parse_iter`
+                         and :py:meth:`parse_stream`. A call that cannot
+                         finish in time raises
+                         :py:class:`tweebo_parser.DeadlineExceeded`. None for
+                         no limit.
+        :param hedge: Whether to send a duplicate of a request to another
+                      endpoint when it is slower than most recent requests,
+                      using the response that arrives first. True uses a
+                      HedgePolicy with its defaults, a policy can also be
+                      given. Has no effect with only one endpoint.
+        :param transport: `requests` to send requests using the `requests`
+                          package, `http.client` to use the standard
+                          library, which has less overhead per request and
+                          does not import `requests`, or a
+                          :py:class:`tweebo_parser.transport.Transport`
+        :param pack_batches: Whether :py:meth:`parse_conll`,
+                             :py:meth:`parse_stanford` and
+                             :py:meth:`parse_tweets` split the texts into
+                             batches of similar total number of tokens,
+                             rather than in order, so that a batch of long
+                             texts does not hold up the call. The results
+                             are returned in the order of the texts.
+        :param reuse_retweets: Whether :py:meth:`parse_conll`,
+                               :py:meth:`parse_stanford`,
+                               :py:meth:`parse_tweets` and
+                               :py:meth:`parse_iter` only send the body of
+                               texts that start with `RT @handle:`, adding
+                               the prefix to the parse of the body with
+                               :py:func:`tweebo_parser.retweet.splice_retweet`.
+                               The body of a retweet is then de-duplicated
+                               and cached together with the tweet retweeted.
+        :raises ValueError: If batch_size or max_in_flight are less than 1,
+                            deadline is not positive or the transport is
+                            not known.
         '''
-        self.hostname = hostname
-        self.port = port
+        if deadline is not None and deadline <= 0:
+            raise ValueError(f'deadline has to be positive: {deadline}')
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f'batch_size has to be at least 1: {batch_size}')
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight has to be at least 1: '
+                             f'{max_in_flight}')
+        if endpoints is None:
+            endpoints = [(hostname, port)]
+        self.endpoints = EndpointPool(endpoints, _probe_endpoint,
+                                      probe_interval)
+        self.hostname = self.endpoints.endpoints[0].hostname
+        self.port = self.endpoints.endpoints[0].port
         self.retries = retries
+        if retry_policy is None:
+            retry_policy = RetryPolicy(max_retries=retries)
+        self.retry_policy = retry_policy
         self.log_errors = log_errors
-        self._log_fp = Path(tempfile.gettempdir(), 'tweebo_log')
-        # Delete the old file
-        if self._log_fp.is_file():
-            self._log_fp.open('w').close()
+        self.keep_alive = keep_alive
+        self.pool_maxsize = pool_maxsize
+        self.pool_idle_timeout = pool_idle_timeout
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.stanford_from_conll = stanford_from_conll
+        self.tuner = None
+        if auto_tune is True:
+            self.tuner = AdaptiveController(
+                batch_size=batch_size or ITER_BATCH_SIZE,
+                in_flight=max_in_flight,
+                max_in_flight=max(max_in_flight, 16))
+        elif auto_tune:
+            self.tuner = auto_tune
+        self.instruments = list(instruments or [])
+        self.cache = None
+        if cache_size > 0:
+            self.cache = LRUCache(cache_size)
+        self.error_log = ErrorLog(log_path)
+        self.timeout = timeout
+        self.deadline = deadline
+        self.hedge_policy = None
+        if hedge is True:
+            self.hedge_policy = HedgePolicy()
+        elif hedge:
+            self.hedge_policy = hedge
+        if isinstance(transport, str):
+            pool_maxsize = max(pool_maxsize, max_in_flight)
+            if self.tuner is not None:
+                pool_maxsize = max(pool_maxsize, self.tuner.max_in_flight)
+            transport = create_transport(transport, keep_alive, pool_maxsize,
+                                         pool_idle_timeout,
+                                         len(self.endpoints))
+        self.transport = transport
+        self.pack_batches = pack_batches
+        self.reuse_retweets = reuse_retweets
+        self._executor_lock = threading.Lock()
+        self._reset_executors()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Thread pools and locks cannot be pickled, they are re-created when
+        # the object is un-pickled e.g. within a multiprocessing worker.
+        state = self.__dict__.copy()
+        for attribute in ['_executor_lock', '_executor_pid', '_executor',
+                          '_hedge_executor']:
+            del state[attribute]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._executor_lock = threading.Lock()
+        self._reset_executors()
+
+    def __enter__(self) -> 'API':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _reset_executors(self) -> None:
+        self._executor = None
+        self._hedge_executor = None
+        self._executor_pid = os.getpid()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        '''
+        :return: The thread pool used to send batches concurrently. It is
+                 re-created after the process has been forked.
+        '''
+        with self._executor_lock:
+            if self._executor_pid != os.getpid():
+                self._reset_executors()
+            if self._executor is None:
+                max_workers = self.max_in_flight
+                if self.tuner is not None:
+                    max_workers = max(max_workers, self.tuner.max_in_flight)
+                self._executor = ThreadPoolExecutor(max_workers)
+            return self._executor
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        '''
+        :return: The thread pool that hedged requests and the requests they
+                 duplicate are sent from. It is separate from the thread pool
+                 of the batches, which may be waiting on these requests.
+        '''
+        with self._executor_lock:
+            if self._executor_pid != os.getpid():
+                self._reset_executors()
+            if self._hedge_executor is None:
+                max_workers = max(self.pool_maxsize, self.max_in_flight)
+                if self.tuner is not None:
+                    max_workers = max(max_workers, self.tuner.max_in_flight)
+                self._hedge_executor = ThreadPoolExecutor(2 * max_workers)
+            return self._hedge_executor
+
+    def close(self) -> None:
+        '''
+        Closes all of the connections within the connection pool, stops
+        the threads used to send batches and waits for errors to be written
+        to the error log.
+        '''
+        self.endpoints.close()
+        self.error_log.close()
+        self.transport.close()
+        with self._executor_lock:
+            if self._executor_pid == os.getpid():
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                if self._hedge_executor is not None:
+                    self._hedge_executor.shutdown(wait=False)
+            self._reset_executors()
 
     def log_error(self, text: str) -> None:
         '''
@@ -51,17 +351,679 @@ class API(object):
         :param text: Error text to log
         '''
         if self.log_errors:
-            with self._log_fp.open('a+') as log_file:
-                log_file.write(f'{text}\n')
+            self.error_log.write(text)
+
+    def _post(self, body: bytes, stream: bool = False,
+              deadline: Optional[float] = None,
+              endpoint: Optional[Endpoint] = None,
+              cancellation: Optional[Cancellation] = None,
+              failover: bool = True) -> Response:
+        '''
+        Sends the data to one of the servers, if the server cannot be
+        connected to the data is sent to the next server until every server
+        has been tried.
+
+        :param body: The json encoded data to send to the server.
+        :param stream: Whether to return once the headers of the response
+                       have been received, leaving the body to be read.
+        :param deadline: time.monotonic() by which the response has to be
+                         received, None for no limit.
+        :param endpoint: The endpoint to send the data to first, already
+                         acquired, None to acquire one.
+        :param cancellation: Stops the request, and the data is not sent to
+                             another server, once it is cancelled.
+        :param failover: Whether to send the data to the next server if the
+                         first cannot be connected to.
+        :return: The response from the server.
+        :raises ServerError: Caused when none of the servers are running.
+        :raises DeadlineExceeded: If the deadline has passed.
+        :raises :py:class:`requests.exceptions.HTTPError`: Caused when the
+                server returns an error status code.
+        '''
+        tried = []
+        while True:
+            if endpoint is None:
+                endpoint = self.endpoints.acquire(exclude=tried)
+            try:
+                timeout = self._timeout(deadline)
+            except DeadlineExceeded:
+                self.endpoints.release(endpoint)
+                raise
+            try:
+                response = self._post_endpoint(endpoint, body, stream,
+                                               timeout, cancellation)
+            except ServerError as server_error:
+                cancelled = cancellation is not None and \
+                    cancellation.cancelled
+                # A time out, which may have been shortened to the time left
+                # before the deadline, does not show the server is down,
+                # neither does closing the connection to cancel the request.
+                self.endpoints.release(
+                    endpoint, healthy=server_error.timed_out or cancelled)
+                tried.append(endpoint)
+                if cancelled or not failover or \
+                        len(tried) == len(self.endpoints):
+                    raise
+                endpoint = None
+            else:
+                self.endpoints.release(endpoint)
+                return response
+
+    def _hedged_post(self, body: bytes, deadline: Optional[float] = None
+                     ) -> Response:
+        '''
+        As :py:meth:`_post`, but if the response takes longer than the delay
+        of self.hedge_policy, and its budget allows, the data is also sent
+        to another endpoint and the first response is returned. The other
+        request is cancelled if it has not been sent yet, else it is stopped
+        by closing its connection, see
+        :py:class:`tweebo_parser.transport.Cancellation`. The server cannot
+        be told to stop parsing it.
+
+        :param body: The json encoded data to send to the server.
+        :param deadline: time.monotonic() by which the response has to be
+                         received, None for no limit.
+        :return: The response from the server, with its body read.
+        :raises ServerError: Caused when none of the servers are running.
+        :raises DeadlineExceeded: If the deadline has passed.
+        :raises :py:class:`requests.exceptions.HTTPError`: Caused when the
+                server returns an error status code.
+        '''
+        policy = self.hedge_policy
+        policy.record_request()
+        executor = self._get_hedge_executor()
+        start_time = time.monotonic()
+        # The endpoint is chosen within this thread, rather than by the
+        # request, so that the hedge is never sent to the same endpoint.
+        endpoint = self.endpoints.acquire()
+        cancellation = Cancellation()
+        request = executor.submit(self._hedge_attempt, body, deadline,
+                                  endpoint, cancellation, True)
+        attempts = {request: (endpoint, cancellation)}
+        delay = policy.delay()
+        if deadline is not None and delay is not None:
+            delay = min(delay, max(0.0, deadline - start_time))
+        done, _ = wait([request], timeout=delay)
+        hedge = None
+        if not done:
+            endpoint = self.endpoints.acquire(exclude=[endpoint])
+            if endpoint is not None and not policy.try_hedge():
+                self.endpoints.release(endpoint)
+                endpoint = None
+            if endpoint is not None:
+                cancellation = Cancellation()
+                hedge = executor.submit(self._hedge_attempt, body, deadline,
+                                        endpoint, cancellation, False)
+                attempts[hedge] = (endpoint, cancellation)
+        pending = list(attempts)
+        try:
+            while True:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                first = request if request in done else done.pop()
+                pending.remove(first)
+                if first.exception() is None or not pending:
+                    response = first.result()
+                    break
+        finally:
+            # The other request is no longer needed.
+            for future in pending:
+                endpoint, cancellation = attempts[future]
+                if future.cancel():
+                    self.endpoints.release(endpoint)
+                else:
+                    cancellation.cancel()
+        if first is hedge:
+            policy.record_hedge_win()
+        else:
+            policy.record_latency(time.monotonic() - start_time)
+        return response
+
+    def _hedge_attempt(self, body: bytes, deadline: Optional[float],
+                       endpoint: Endpoint, cancellation: Cancellation,
+                       failover: bool) -> Optional[Response]:
+        '''
+        Sends one of the requests of :py:meth:`_hedged_post`.
+
+        :param body: The json encoded data to send to the server.
+        :param deadline: time.monotonic() by which the response has to be
+                         received, None for no limit.
+        :param endpoint: The endpoint to send the request to, already
+                         acquired.
+        :param cancellation: Cancelled once the other request has
+                             responded.
+        :param failover: See :py:meth:`_post`, False for the hedge.
+        :return: The response with its body read, None if the other request
+                 responded first.
+        '''
+        response = self._post(body, True, deadline, endpoint, cancellation,
+                              failover)
+        if cancellation.cancelled:
+            response.close()
+            return None
+        # Read the body within this thread.
+        response.content
+        return response
+
+    def _post_endpoint(self, endpoint: Endpoint, body: bytes,
+                       stream: bool = False, timeout: Any = None,
+                       cancellation: Optional[Cancellation] = None
+                       ) -> Response:
+        '''
+        :param endpoint: The server to send the data to.
+        :param body: The json encoded data to send to the server.
+        :param stream: Whether to return once the headers of the response
+                       have been received, leaving the body to be read.
+        :param timeout: The (connect, read) timeout of the request.
+        :param cancellation: Stops the request once it is cancelled.
+        :return: The response from the server.
+        :raises ServerError: Caused when the server is not running.
+        :raises :py:class:`requests.exceptions.HTTPError`: Caused when the
+                server returns an error status code.
+        '''
+        try:
+            response = self.transport.post(endpoint.url, body, _HEADERS,
+                                           timeout, stream, cancellation)
+            response.raise_for_status()
+        except connection_errors() as server_error:
+            raise ServerError(server_error, endpoint.hostname, endpoint.port)
+        return response
+
+    def _call_deadline(self) -> Optional[float]:
+        '''
+        :return: The time.monotonic() by which a call starting now has to
+                 finish, None if self.deadline is None.
+        '''
+        if self.deadline is None:
+            return None
+        return time.monotonic() + self.deadline
+
+    def _timeout(self, deadline: Optional[float]) -> Any:
+        '''
+        :param deadline: time.monotonic() by which the request has to
+                         finish, None for no limit.
+        :return: The timeout of a request, self.timeout with each
+                 part limited to the time left before the deadline.
+        :raises DeadlineExceeded: If the deadline has passed.
+        '''
+        if deadline is None:
+            return self.timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(self.deadline, self.hostname, self.port)
+        if self.timeout is None:
+            return remaining
+        connect_timeout = read_timeout = self.timeout
+        if isinstance(self.timeout, tuple):
+            connect_timeout, read_timeout = self.timeout
+        if connect_timeout is not None:
+            connect_timeout = min(connect_timeout, remaining)
+        if read_timeout is not None:
+            read_timeout = min(read_timeout, remaining)
+        return (connect_timeout, read_timeout)
+
+    def _retry_within_deadline(self, error: Exception, delay: float,
+                               deadline: Optional[float]) -> None:
+        '''
+        :param error: The error the request failed with.
+        :param delay: Seconds to wait before retrying the request.
+        :param deadline: time.monotonic() by which the request has to
+                         finish, None for no limit.
+        :raises DeadlineExceeded: If the deadline will have passed before
+                                  the request can be retried.
+        '''
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            raise DeadlineExceeded(self.deadline, self.hostname, self.port,
+                                   error) from error
+
+    def _request(self, texts: List[str], output_type: str,
+                 retry_count: int = 0, deadline: Optional[float] = None
+                 ) -> List[Any]:
+        '''
+        Sends one request to the server. Requests that fail are retried as
+        decided by self.retry_policy.
+
+        :param texts: The texts to be processed.
+        :param output_type: Either `conll` or `stanford`.
+        :param retry_count: The number of times it has already been retried.
+        :param deadline: time.monotonic() by which the request has to
+                         finish, default self.deadline seconds from now.
+        :return: The decoded response of the server.
+        :raises ServerError: Caused when the server is not running.
+        :raises DeadlineExceeded: If the request cannot finish before the
+                                  deadline.
+        :raises :py:class:`requests.exceptions.HTTPError`: Caused when the
+                server returns an error status code.
+        :raises ResponseDecodeError: Caused if the response cannot be json
+                                     decoded and it is not retried.
+        '''
+        if deadline is None:
+            deadline = self._call_deadline()
+        if output_type == 'stanford' and self.stanford_from_conll:
+            conlls = self._request(texts, 'conll', retry_count, deadline)
+            return [conll_to_stanford(conll, index)
+                    for index, conll in enumerate(conlls)]
+        start_time = time.perf_counter()
+        body = json.dumps({'texts': texts, 'output_type': output_type})
+        body = body.encode('utf-8')
+        serialise_time = time.perf_counter() - start_time
+        self.retry_policy.record_request()
+        while True:
+            wasted_bytes = len(body)
+            response = None
+            post_time = decode_time = 0.0
+            start_time = time.perf_counter()
+            try:
+                if self.hedge_policy is None:
+                    response = self._post(body, deadline=deadline)
+                else:
+                    response = self._hedged_post(body, deadline)
+                post_time = time.perf_counter() - start_time
+                results = response.json()
+                decode_time = time.perf_counter() - start_time - post_time
+                if self.instruments:
+                    self._instrument(texts, output_type, body, response,
+                                     serialise_time, post_time, decode_time,
+                                     retry_count)
+                return results
+            except (ServerError, json.JSONDecodeError) + status_errors() \
+                    as error:
+                if isinstance(error, DeadlineExceeded):
+                    raise
+                if isinstance(error, status_errors()):
+                    response = error.response
+                if response is not None:
+                    wasted_bytes += len(response.content)
+                if self.instruments:
+                    if not post_time:
+                        post_time = time.perf_counter() - start_time
+                    else:
+                        decode_time = time.perf_counter() - start_time - \
+                            post_time
+                    self._instrument(texts, output_type, body, response,
+                                     serialise_time, post_time, decode_time,
+                                     retry_count, error)
+                delay = self.retry_policy.retry_delay(error, retry_count,
+                                                      wasted_bytes)
+                if delay is None:
+                    if isinstance(error, json.JSONDecodeError):
+                        self.log_error(response.text)
+                        raise ResponseDecodeError(response.text)
+                    raise
+                self._retry_within_deadline(error, delay, deadline)
+                time.sleep(delay)
+                retry_count += 1
+                serialise_time = 0.0
+
+    def _instrument(self, texts: List[str], output_type: str, body: bytes,
+                    response: Optional[Response],
+                    serialise_time: float, post_time: float,
+                    decode_time: float, retry_count: int,
+                    error: Optional[Exception] = None) -> None:
+        '''
+        Calls each of self.instruments with the
+        :py:class:`tweebo_parser.metrics.RequestEvent` of an attempt at a
+        request. requests reads the whole response within the post, the
+        time until the headers were received (`response.elapsed`) is the
+        wait and the rest of the post the time spent receiving the body.
+
+        :param post_time: Seconds spent posting the request, including
+                          reading the response.
+        :param error: The error the attempt failed with, if it failed.
+        '''
+        wait_time = post_time
+        response_bytes = 0
+        url = None
+        if response is not None:
+            wait_time = min(post_time, response.elapsed.total_seconds())
+            response_bytes = len(response.content)
+            url = response.url
+        event = RequestEvent(output_type, len(texts), len(body),
+                             response_bytes, serialise_time, wait_time,
+                             post_time - wait_time, decode_time, retry_count,
+                             None if error is None else type(error).__name__,
+                             url)
+        for instrument in self.instruments:
+            instrument(event)
+
+    def _stream_request(self, texts: List[str], output_type: str,
+                        loads: Callable[[bytes], Any], chunk_size: int
+                        ) -> Iterator[Any]:
+        '''
+        Sends one request to the server and yields each result as soon as it
+        has been received and decoded. If a request fails after some of the
+        results have been yielded it is retried, as decided by
+        self.retry_policy, with only the texts that have no result yet.
+
+        :param texts: The texts to be processed.
+        :param output_type: Either `conll` or `stanford`.
+        :param loads: Function that json decodes the bytes of one result.
+        :param chunk_size: Bytes read from the response at a time.
+        :return: A generator of the results. For the `stanford` output type
+                 the `index` of each result is the index of the text within
+                 `texts`.
+        :raises ServerError: Caused when the server is not running.
+        :raises DeadlineExceeded: If the request cannot finish within
+                                  self.deadline seconds.
+        :raises :py:class:`requests.exceptions.HTTPError`: Caused when the
+                server returns an error status code.
+        :raises ResponseDecodeError: Caused if the response cannot be json
+                                     decoded and it is not retried.
+        '''
+        num_results = 0
+        retry_count = 0
+        deadline = self._call_deadline()
+        self.retry_policy.record_request()
+        while True:
+            start_time = time.perf_counter()
+            remaining = texts[num_results:]
+            body = json.dumps({'texts': remaining,
+                               'output_type': output_type}).encode('utf-8')
+            serialise_time = time.perf_counter() - start_time
+            # Bytes of the response received by this attempt.
+            received = [0]
+            start_time = time.perf_counter()
+            response = None
+
+            def chunks() -> Iterator[bytes]:
+                for chunk in response.iter_content(chunk_size):
+                    received[0] += len(chunk)
+                    yield chunk
+
+            try:
+                response = self._post(body, stream=True, deadline=deadline)
+                try:
+                    offset = num_results
+                    for result in iter_json_array(chunks(), loads):
+                        if num_results == len(texts):
+                            raise json.JSONDecodeError(
+                                f'More than {len(texts)} results', '', 0)
+                        if output_type == 'stanford':
+                            result['index'] += offset
+                        num_results += 1
+                        yield result
+                except connection_errors() as read_error:
+                    url = urllib.parse.urlsplit(response.url)
+                    raise ServerError(read_error, url.hostname, url.port)
+                finally:
+                    response.close()
+                if num_results != len(texts):
+                    raise json.JSONDecodeError(
+                        f'Expected {len(texts)} results but received '
+                        f'{num_results}', '', 0)
+                if self.instruments:
+                    self._instrument_stream(remaining, output_type, body,
+                                            response, received[0],
+                                            serialise_time, start_time,
+                                            retry_count)
+                return
+            except (ServerError, json.JSONDecodeError) + status_errors() \
+                    as error:
+                if isinstance(error, DeadlineExceeded):
+                    raise
+                if isinstance(error, status_errors()):
+                    response = error.response
+                    received[0] = len(response.content)
+                if self.instruments:
+                    self._instrument_stream(remaining, output_type, body,
+                                            response, received[0],
+                                            serialise_time, start_time,
+                                            retry_count, error)
+                delay = self.retry_policy.retry_delay(
+                    error, retry_count, len(body) + received[0])
+                if delay is None:
+                    if isinstance(error, json.JSONDecodeError):
+                        self.log_error(str(error))
+                        raise ResponseDecodeError(str(error))
+                    raise
+                self._retry_within_deadline(error, delay, deadline)
+                time.sleep(delay)
+                retry_count += 1
+
+    def _instrument_stream(self, texts: List[str], output_type: str,
+                           body: bytes, response: Optional[Response],
+                           response_bytes: int, serialise_time: float,
+                           start_time: float, retry_count: int,
+                           error: Optional[Exception] = None) -> None:
+        '''
+        As :py:meth:`_instrument` for an attempt of
+        :py:meth:`_stream_request`, where the body is decoded as it is
+        received so the decode time is counted within the receive time.
+
+        :param start_time: time.perf_counter() when the request was sent.
+        '''
+        total_time = time.perf_counter() - start_time
+        wait_time = total_time
+        url = None
+        if response is not None:
+            wait_time = min(total_time, response.elapsed.total_seconds())
+            url = response.url
+        event = RequestEvent(output_type, len(texts), len(body),
+                             response_bytes, serialise_time, wait_time,
+                             total_time - wait_time, 0.0, retry_count,
+                             None if error is None else type(error).__name__,
+                             url)
+        for instrument in self.instruments:
+            instrument(event)
+
+    def _parse(self, texts: List[str], output_type: str,
+               retry_count: int = 0,
+               send: Optional[Callable[..., List[Any]]] = None,
+               deadline: Optional[float] = None) -> List[Any]:
+        '''
+        Returns the results of empty (whitespace only) texts and texts that
+        are within the cache without contacting the server. The rest of the
+        texts are sent to the server once each, no matter how many times
+        they occur within `texts`. If self.reuse_retweets the body of a
+        retweet is used in place of the retweet.
+
+        :param texts: The texts to be processed.
+        :param output_type: Either `conll` or `stanford`.
+        :param retry_count: The number of times it has retried for.
+        :param send: Function that sends the texts that need parsing to the
+                     server, with the same arguments as this method. Default
+                     :py:meth:`_send`.
+        :return: The decoded results, one for each text. For the `stanford`
+                 output type the `index` of each result is the index of the
+                 text within `texts`.
+        '''
+        if send is None:
+            send = self._send
+        # Invalid input is left for the server to reject.
+        if not isinstance(texts, list) or \
+           not all(isinstance(text, str) for text in texts):
+            return send(texts, output_type, retry_count, deadline)
+
+        # Index of each retweet to the handle of the user retweeted.
+        retweets = {}
+        if self.reuse_retweets:
+            texts = list(texts)
+            for index, text in enumerate(texts):
+                split = split_retweet(text)
+                if split is not None:
+                    retweets[index], texts[index] = split
+        results = [None] * len(texts)
+        # Text to the indexes it occurs at, for texts that need parsing.
+        missing = OrderedDict()
+        for index, text in enumerate(texts):
+            if not text.strip(_WHITESPACE):
+                results[index] = _empty_result(output_type, index)
+                continue
+            if text in missing:
+                missing[text].append(index)
+                continue
+            result = None
+            if self.cache is not None:
+                result = self.cache.get((text, output_type))
+            if result is None:
+                missing[text] = [index]
+            else:
+                results[index] = _copy_result(result, index)
+        if missing:
+            missing_texts = list(missing)
+            parsed = send(missing_texts, output_type, retry_count,
+                          deadline)
+            for text, result in zip(missing_texts, parsed):
+                if self.cache is not None:
+                    # The cache keeps its own copy so that callers changing
+                    # the returned results do not change the cached results.
+                    self.cache.put((text, output_type), _copy_result(result))
+                indexes = missing[text]
+                if output_type == 'stanford':
+                    result['index'] = indexes[0]
+                results[indexes[0]] = result
+                for index in indexes[1:]:
+                    results[index] = _copy_result(result, index)
+        for index, handle in retweets.items():
+            results[index] = splice_retweet(results[index], handle)
+        return results
+
+    def _send(self, texts: List[str], output_type: str,
+              retry_count: int = 0, deadline: Optional[float] = None
+              ) -> List[Any]:
+        '''
+        Splits the texts into batches, sends them to the server concurrently
+        using :py:meth:`_dispatch` and returns the results in the same order
+        as the texts.
+
+        :param texts: The texts to be processed.
+        :param output_type: Either `conll` or `stanford`.
+        :param retry_count: The number of times it has retried for.
+        :return: The decoded results, one for each text. For the `stanford`
+                 output type the `index` of each result is the index of the
+                 text within `texts`.
+        '''
+        batch_size = self.batch_size
+        if self.tuner is None and \
+           (batch_size is None or len(texts) <= batch_size):
+            return self._request(texts, output_type, retry_count, deadline)
+
+        if self.pack_batches:
+            return self._send_packed(texts, output_type, retry_count,
+                                     deadline)
+        results = []
+        batches = self._dispatch(self._batches(iter(texts)), self._request,
+                                 output_type, retry_count, deadline)
+        for offset, batch_results in batches:
+            if output_type == 'stanford':
+                for result in batch_results:
+                    result['index'] += offset
+            results.extend(batch_results)
+        return results
+
+    def _send_packed(self, texts: List[str], output_type: str,
+                     retry_count: int = 0, deadline: Optional[float] = None
+                     ) -> List[Any]:
+        '''
+        As :py:meth:`_send`, but the texts are split into batches of similar
+        total cost using :py:func:`tweebo_parser.packing.pack_batches`,
+        rather than in order, so that no batch is far slower than the rest.
+        '''
+        batch_size, _ = self._batch_limits()
+        packed = pack_batches(texts, batch_size)
+        batches = ([texts[index] for index in indexes] for indexes in packed)
+        results = [None] * len(texts)
+        dispatched = self._dispatch(batches, self._request, output_type,
+                                    retry_count, deadline)
+        for (_, batch_results), indexes in zip(dispatched, packed):
+            for index, result in zip(indexes, batch_results):
+                if output_type == 'stanford':
+                    result['index'] = index
+                results[index] = result
+        return results
+
+    def _batch_limits(self) -> Tuple[int, int]:
+        '''
+        :return: The number of texts per batch and the number of batches
+                 that can be in flight, from self.tuner if auto tuning else
+                 from self.batch_size (ITER_BATCH_SIZE if None) and
+                 self.max_in_flight.
+        '''
+        if self.tuner is not None:
+            return self.tuner.batch_size, self.tuner.in_flight
+        return self.batch_size or ITER_BATCH_SIZE, self.max_in_flight
+
+    def _batches(self, texts: Iterator[str]) -> Iterator[List[str]]:
+        '''
+        :param texts: Iterator of the texts to be processed.
+        :return: A generator of batches of the texts, each of the batch size
+                 given by :py:meth:`_batch_limits` when it is read.
+        '''
+        while True:
+            batch_size, _ = self._batch_limits()
+            batch = list(itertools.islice(texts, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def _dispatch(self, batches: Iterator[List[str]],
+                  function: Callable[..., List[Any]], *args: Any
+                  ) -> Iterator[Tuple[int, List[Any]]]:
+        '''
+        Reads batches of texts from the iterator and calls the function on
+        each batch within the thread pool, keeping a limited number of
+        batches in flight (see :py:meth:`_batch_limits`). No more batches
+        are read until the oldest batch has finished.
+
+        :param batches: Iterator of the batches of texts to be processed.
+        :param function: Called with each batch and `args`.
+        :param args: Extra arguments for the function.
+        :return: A generator of the offset of each batch, the number of
+                 texts within the batches before it, and the function's
+                 return for the batch, in order.
+        '''
+        executor = self._get_executor()
+        in_flight = deque()
+        offset = 0
+        try:
+            while True:
+                _, max_in_flight = self._batch_limits()
+                while len(in_flight) < max_in_flight:
+                    batch = next(batches, None)
+                    if batch is None:
+                        break
+                    future = executor.submit(self._timed, function, batch,
+                                             *args)
+                    in_flight.append((offset, future))
+                    offset += len(batch)
+                    _, max_in_flight = self._batch_limits()
+                if not in_flight:
+                    return
+                batch_offset, future = in_flight.popleft()
+                yield batch_offset, future.result()
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+    def _timed(self, function: Callable[..., List[Any]], batch: List[str],
+               *args: Any) -> List[Any]:
+        '''
+        :param function: Called with the batch and `args`.
+        :param batch: Batch of texts.
+        :param args: Extra arguments for the function.
+        :return: The function's return, its latency and whether it raised an
+                 error are recorded by self.tuner if auto tuning.
+        '''
+        if self.tuner is None:
+            return function(batch, *args)
+        start_time = time.monotonic()
+        try:
+            results = function(batch, *args)
+        except Exception:
+            self.tuner.record(len(batch), time.monotonic() - start_time,
+                              error=True)
+            raise
+        self.tuner.record(len(batch), time.monotonic() - start_time)
+        return results
 
     def parse_conll(self, texts: List[str], retry_count: int = 0) -> List[str]:
         '''
         Processes the texts using TweeboParse and returns them in CoNLL format.
 
         :param texts: The List of Strings to be processed by TweeboParse.
-        :param retry_count: The number of times it has retried for. Default
-                            0 does not require setting, main purpose is for
-                            recursion.
+        :param retry_count: The number of times the request has already
+                            been retried, counted towards the retry limits
+                            of self.retry_policy. Default 0 does not require
+                            setting.
         :return: A list of CoNLL formated strings.
         :raises ServerError: Caused when the server is not running.
         :raises :py:class:`requests.exceptions.HTTPError`: Caused when the
@@ -73,26 +1035,8 @@ class API(object):
         :Example:
 
         '''
-        post_data = {'texts': texts, 'output_type': 'conll'}
-        try:
-            response = requests.post(f'http://{self.hostname}:{self.port}',
-                                     json=post_data,
-                                     headers={'Connection': 'close'})
-            response.raise_for_status()
-        except (requests.exceptions.ConnectionError,
-                requests.exceptions.Timeout) as server_error:
-            raise ServerError(server_error, self.hostname, self.port)
-        except requests.exceptions.HTTPError as http_error:
-            raise http_error
-        else:
-            try:
-                return response.json()
-            except json.JSONDecodeError as json_exception:
-                if retry_count == self.retries:
-                    self.log_error(response.text)
-                    raise Exception('Json Decoding error cannot parse this '
-                                    f':\n{response.text}')
-                return self.parse_conll(texts, retry_count + 1)
+        return self._parse(texts, 'conll', retry_count,
+                           deadline=self._call_deadline())
 
     def parse_stanford(self, texts: List[str], retry_count: int = 0
                        ) -> List[Dict[str, Union[str, int]]]:
@@ -102,9 +1046,10 @@ class API(object):
         CoreNLP server dependency parser).
 
         :param texts: The List of Strings to be processed by TweeboParse.
-        :param retry_count: The number of times it has retried for. Default
-                            0 does not require setting, main purpose is for
-                            recursion.
+        :param retry_count: The number of times the request has already
+                            been retried, counted towards the retry limits
+                            of self.retry_policy. Default 0 does not require
+                            setting.
         :return: A list of dicts.
         :raises ServerError: Caused when the server is not running.
         :raises :py:class:`requests.exceptions.HTTPError`: Caused when the
@@ -123,27 +1068,189 @@ class API(object):
             [{}]
         '''
 
-        post_data = {'texts': texts, 'output_type': 'stanford'}
-        try:
-            response = requests.post(f'http://{self.hostname}:{self.port}',
-                                     json=post_data,
-                                     headers={'Connection': 'close'})
-            response.raise_for_status()
-        except (requests.exceptions.ConnectionError,
-                requests.exceptions.Timeout,
-                requests.exceptions.InvalidSchema) as server_error:
-            raise ServerError(server_error, self.hostname, self.port)
-        except requests.exceptions.HTTPError as http_error:
-            raise http_error
-        else:
-            try:
-                return response.json()
-            except json.JSONDecodeError as json_exception:
-                if retry_count == self.retries:
-                    self.log_error(response.text)
-                    raise Exception('Json Decoding error cannot parse this '
-                                    f':\n{response.text}')
-                return self.parse_stanford(texts, retry_count + 1)
+        return self._parse(texts, 'stanford', retry_count,
+                           deadline=self._call_deadline())
+
+    def parse_tweets(self, texts: List[str]) -> List[ParsedTweet]:
+        '''
+        Processes the texts using TweeboParse and returns them as
+        :py:class:`tweebo_parser.parsed.ParsedTweet` objects, which take far
+        less memory than the dicts returned by :py:meth:`parse_stanford`
+        while comparing equal to them.
+
+        :param texts: The List of Strings to be processed by TweeboParse.
+        :return: A list of ParsedTweet.
+        :raises ServerError: Caused when the server is not running.
+        :raises :py:class:`requests.exceptions.HTTPError`: Caused when the
+                input texts is not formated correctly e.g. When you give it a
+                String not a list of Strings.
+        '''
+        return [ParsedTweet.from_conll(conll, index)
+                for index, conll in enumerate(self.parse_conll(texts))]
+
+    def parse_table(self, texts: List[str],
+                    ids: Optional[Iterable[Any]] = None) -> TokenTable:
+        '''
+        Processes the texts using TweeboParse and returns them as a
+        :py:class:`tweebo_parser.columnar.TokenTable`, one row per token,
+        which can be exported as NumPy arrays or an Arrow table. For corpora
+        too large to hold in memory see
+        :py:func:`tweebo_parser.columnar.token_tables` and
+        :py:class:`tweebo_parser.columnar.TokenTableWriter`
+
+        :param texts: The List of Strings to be processed by TweeboParse.
+        :param ids: Id of each text e.g. the Twitter ids. Default the index
+                    of the text.
+        :return: A TokenTable of the tokens of every text.
+        :raises ServerError: Caused when the server is not running.
+        :raises ValueError: If the number of ids and texts differ.
+        '''
+        if ids is not None:
+            ids = list(ids)
+            if len(ids) != len(texts):
+                raise ValueError(f'{len(ids)} ids were given for '
+                                 f'{len(texts)} texts')
+        table = TokenTable()
+        table.extend(self.parse_conll(texts), ids)
+        return table
+
+    def parse_stream(self, texts: List[str], output_type: str = 'conll',
+                     json_backend: str = 'json', chunk_size: int = 65536
+                     ) -> Iterator[Union[str, Dict[str, Any]]]:
+        '''
+        Processes the texts using TweeboParse, yielding each result as soon
+        as it has been received rather than once the whole response has
+        been received. The response is decoded one result at a time so that
+        memory use depends on the size of one result rather than the whole
+        response. Batches of self.batch_size texts are sent one after
+        another, all of the texts in one request if that is None.
+
+        Unlike :py:meth:`parse_conll` and :py:meth:`parse_stanford` every
+        text is sent to the server, the cache and de-duplication are not
+        used.
+
+        :param texts: The List of Strings to be processed by TweeboParse.
+        :param output_type: Either `conll` or `stanford`.
+        :param json_backend: `json`, `orjson` or `auto`, see
+                             :py:func:`tweebo_parser.stream.json_loads`
+        :param chunk_size: Bytes read from the response at a time.
+        :return: A generator of results in the same order as the texts. For
+                 the `stanford` output type the `index` of each result is
+                 the index of the text within `texts`.
+        :raises ValueError: If the output_type is not `conll` or `stanford`.
+        :raises ImportError: If the `orjson` backend is used and it is not
+                             installed.
+        :raises ServerError: Caused when the server is not running.
+        :raises :py:class:`requests.exceptions.HTTPError`: Caused when the
+                input texts is not formated correctly.
+        '''
+        if output_type not in ('conll', 'stanford'):
+            raise ValueError('output_type has to be either `conll` or '
+                             f'`stanford` not: {output_type}')
+        loads = json_loads(json_backend)
+        if output_type == 'stanford' and self.stanford_from_conll:
+            conlls = self.parse_stream(texts, 'conll', json_backend,
+                                       chunk_size)
+            for index, conll in enumerate(conlls):
+                yield conll_to_stanford(conll, index)
+            return
+        batch_size = self.batch_size or max(len(texts), 1)
+        for offset in range(0, len(texts), batch_size):
+            batch = texts[offset: offset + batch_size]
+            for result in self._stream_request(batch, output_type, loads,
+                                               chunk_size):
+                if output_type == 'stanford':
+                    result['index'] += offset
+                yield result
+
+    def parse_iter(self, texts: Iterable[str], output_type: str = 'conll'
+                   ) -> Iterator[Union[str, Dict[str, Any], ParsedTweet]]:
+        '''
+        Processes the texts using TweeboParse lazily, texts are read from
+        the iterable in batches of self.batch_size (ITER_BATCH_SIZE if that
+        is None) and up to self.max_in_flight batches are waiting on the
+        server at any one time, or as set by self.tuner if auto tuning. No
+        more texts are read until the results of the oldest batch have been
+        yielded, thus memory use does not depend on the number of texts.
+
+        :param texts: Any iterable of Strings e.g. a file or a generator.
+        :param output_type: Either `conll`, `stanford` or `tweet`, the format
+                            of the results as returned by
+                            :py:meth:`parse_conll`, :py:meth:`parse_stanford`
+                            and :py:meth:`parse_tweets` respectively.
+        :return: A generator of results in the same order as the texts. For
+                 the `stanford` and `tweet` output types the `index` of each
+                 result is the position of the text within the iterable.
+        :raises ValueError: If the output_type is not `conll`, `stanford` or
+                            `tweet`.
+        :raises ServerError: Caused when the server is not running.
+
+        :Example:
+        ::
+            from tweebo_parser import API
+            tweebo_api = API(batch_size=100, max_in_flight=4)
+            with open('tweets.txt', 'r') as tweets:
+                texts = (line.rstrip('\n') for line in tweets)
+                for conll in tweebo_api.parse_iter(texts):
+                    print(conll)
+        '''
+        if output_type not in ('conll', 'stanford', 'tweet'):
+            raise ValueError('output_type has to be either `conll`, '
+                             f'`stanford` or `tweet` not: {output_type}')
+        request_type = 'conll' if output_type == 'tweet' else output_type
+        # Each batch is sent in one request, as splitting the batch again
+        # within the thread pool could wait on itself.
+        batches = self._dispatch(self._batches(iter(texts)), self._parse,
+                                 request_type, 0, self._request)
+        for batch_offset, batch_results in batches:
+            for index, result in enumerate(batch_results, batch_offset):
+                if output_type == 'stanford':
+                    result['index'] = index
+                elif output_type == 'tweet':
+                    result = ParsedTweet.from_conll(result, index)
+                yield result
+
+
+def _empty_result(output_type: str, index: int
+                  ) -> Union[str, Dict[str, Any]]:
+    '''
+    :param output_type: Either `conll` or `stanford`.
+    :param index: The index of the text within the texts given.
+    :return: The result the server returns for a text with no tokens.
+    '''
+    if output_type == 'stanford':
+        return {'index': index, 'tokens': [], 'basicDependencies': []}
+    return ''
+
+
+def _copy_result(result: Union[str, Dict[str, Any]],
+                 index: Optional[int] = None
+                 ) -> Union[str, Dict[str, Any]]:
+    '''
+    :param result: A CoNLL string or Stanford styled dict.
+    :param index: The index to give the copy of a Stanford styled dict. If
+                  None the index of `result` is kept.
+    :return: A copy of the result that shares no mutable data with it.
+    '''
+    if isinstance(result, str):
+        return result
+    if index is None:
+        index = result['index']
+    return {'index': index,
+            'tokens': [dict(token) for token in result['tokens']],
+            'basicDependencies': [dict(dependency) for dependency
+                                  in result['basicDependencies']]}
+
+
+def _probe_endpoint(endpoint: Endpoint) -> bool:
+    '''
+    :param endpoint: Server to check.
+    :return: True if the server responds to an empty request.
+    '''
+    body = json.dumps({'texts': [], 'output_type': 'conll'}).encode('utf-8')
+    transport = HTTPClientTransport(keep_alive=False)
+    response = transport.post(endpoint.url, body, _HEADERS, timeout=5)
+    return response.status_code == 200
 
 
 class ServerError(Exception):
@@ -154,23 +1261,84 @@ class ServerError(Exception):
 
     1. message -- Explains why it could not connect to the server, and
        details of the server it tried to connect to.
+    2. timed_out -- Whether connecting to the server or reading the
+       response timed out, rather than the connection failing.
 
     .. automethod:: __init__
     '''
 
-    def __init__(self, excpetion: requests.exceptions.RequestException,
-                 hostname: str, port: int) -> None:
+    def __init__(self, excpetion: Exception, hostname: str,
+                 port: int) -> None:
         '''
-        :param exception: The requests exception instance that is raised.
+        :param exception: The connection error of the transport that is
+                          raised.
         :param hostname: The IP address of the API server.
         :param port: The Port that the API server is attached to.
         '''
 
         message = f'Cannot connect to the server at {hostname}:{port}'
-        if isinstance(excpetion, requests.exceptions.Timeout):
+        self.timed_out = isinstance(excpetion, timeout_errors())
+        if self.timed_out:
             message = 'Error caused by Time out. This is most likely due to '\
                       f'the server not running at: {hostname}:{port}'
-        elif isinstance(excpetion, requests.exceptions.ConnectionError):
+        elif isinstance(excpetion, connection_errors()):
             message = 'Error caused by Connection Error. This is most likely '\
                       f'due to the server not running at {hostname}:{port}'
         self.message = message
+
+
+class DeadlineExceeded(ServerError):
+    '''
+    Exception raised when a call to the API cannot finish before its
+    deadline.
+
+    Attributes:
+
+    1. message -- Explains which deadline was exceeded, and the last error
+       if the call was waiting to retry a failed request.
+    2. deadline -- Seconds the call had to finish within.
+    3. error -- The last error, None if the call ran out of time while
+       waiting on the server.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, deadline: float, hostname: str, port: int,
+                 error: Optional[Exception] = None) -> None:
+        '''
+        :param deadline: Seconds the call had to finish within.
+        :param hostname: The IP address of the API server.
+        :param port: The Port that the API server is attached to.
+        :param error: The last error, if the call was waiting to retry.
+        '''
+        message = f'Could not finish within the deadline of {deadline} ' \
+                  f'seconds, sending to the server at {hostname}:{port}'
+        super().__init__(TransportTimeout(message), hostname, port)
+        if error is not None:
+            message += f'. The last error was: {type(error).__name__}'
+            if isinstance(error, ServerError):
+                message += f' {error.message}'
+        self.message = message
+        self.deadline = deadline
+        self.error = error
+
+
+class ResponseDecodeError(Exception):
+    '''
+    Exception raised when the response of the server cannot be json decoded
+    and it is not retried.
+
+    Attributes:
+
+    1. text -- The response, or for streamed responses the decoding error.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, text: str) -> None:
+        '''
+        :param text: The response, or for streamed responses the decoding
+                     error.
+        '''
+        super().__init__(f'Json Decoding error cannot parse this :\n{text}')
+        self.text = text
@@ -0,0 +1,383 @@
+'''
+Module contains the following class:
+
+1. AsyncAPI -- asyncio version of :py:class:`tweebo_parser.API`
+'''
+
+import asyncio
+import datetime
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from tweebo_parser.api import ResponseDecodeError, ServerError
+from tweebo_parser.error_log import ErrorLog
+from tweebo_parser.retry import RetryPolicy
+from tweebo_parser.transport import ConnectionFailed, Response
+from tweebo_parser.transport import status_errors, TransportTimeout
+
+
+def _import_aiohttp() -> Any:
+    '''
+    :return: The aiohttp module. It is imported when an AsyncAPI is first
+             created as it takes far longer to import than this package.
+    :raises ImportError: If aiohttp is not installed.
+    '''
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError('AsyncAPI requires aiohttp, install it using: '
+                          'pip install tweebo-parser-python-api[async]') \
+            from None
+    return aiohttp
+
+
+class AsyncAPI(object):
+    '''
+    asyncio client for the TweeboParse API server, it has the same methods
+    as :py:class:`tweebo_parser.API` but they are coroutines. All requests
+    made through one AsyncAPI instance share a connection pool and at most
+    `max_in_flight` of them are sent to the server at the same time.
+    Errors are raised as those of the `http.client` transport of
+    :py:class:`tweebo_parser.API`, e.g. error status codes as
+    :py:class:`tweebo_parser.transport.HTTPStatusError`
+
+    Requires the `aiohttp` package:
+    `pip install tweebo-parser-python-api[async]`
+
+    Attributes:
+
+    1. hostname -- The IP address of the TweeboParser API server.
+    2. port -- The Port that the TweeboParser API server is attached to.
+    3. retries -- Number of times to retry json decoding the returned data.
+       Ignored if a retry_policy is given.
+    4. log_errors -- Whether to log errors or not. If this is True it logs
+       errors to error_log, by default the `tweebo_log.<process id>` file
+       within your temp_dir
+    5. pool_maxsize -- Maximum number of connections kept open in the pool.
+    6. pool_idle_timeout -- Number of seconds an unused connection is kept
+       open for.
+    7. batch_size -- Maximum number of texts to send to the server in one
+       request. If None all of the texts are sent in one request.
+    8. max_in_flight -- Maximum number of requests that can be waiting on
+       the server at the same time, across all calls.
+    9. retry_policy -- :py:class:`tweebo_parser.retry.RetryPolicy` that
+       decides which failed requests are retried and records the retries.
+    10. error_log -- :py:class:`tweebo_parser.error_log.ErrorLog` that
+        errors are written to, without blocking the event loop.
+
+    :Example:
+    ::
+        import asyncio
+        from tweebo_parser import AsyncAPI
+
+        async def main():
+            async with AsyncAPI(batch_size=100, max_in_flight=8) as api:
+                return await api.parse_stanford(['hello how are you'])
+
+        result = asyncio.run(main())
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, hostname: str = '0.0.0.0', port: int = 8000,
+                 retries: int = 10, log_errors: bool = False,
+                 pool_maxsize: int = 100,
+                 pool_idle_timeout: Optional[float] = 30.0,
+                 batch_size: Optional[int] = None,
+                 max_in_flight: int = 100,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 log_path: Optional[str] = None) -> None:
+        '''
+        :param hostname: The IP address of the TweeboParser API server.
+        :param port: The Port that the TweeboParser API server is attached to.
+        :param retries: Number of times to retry json decoding the
+                        returned data.
+        :param log_errors: Whether to log errors to the `tweebo_log` file.
+        :param pool_maxsize: Maximum number of connections to keep open.
+        :param pool_idle_timeout: Seconds an unused connection is kept open.
+        :param batch_size: Maximum number of texts per request, texts are
+                           split into batches of this size and sent
+                           concurrently. None sends all texts in one request.
+        :param max_in_flight: Maximum number of requests to send concurrently.
+        :param retry_policy: Decides which failed requests are retried and
+                             how long to wait before retrying. Defaults to
+                             RetryPolicy(max_retries=retries).
+        :param log_path: Path of the error log file, `{pid}` is replaced
+                         with the process id. Default
+                         `tweebo_log.{pid}` within the temp directory.
+        :raises ImportError: If aiohttp is not installed.
+        :raises ValueError: If batch_size or max_in_flight are less than 1.
+        '''
+        _import_aiohttp()
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f'batch_size has to be at least 1: {batch_size}')
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight has to be at least 1: '
+                             f'{max_in_flight}')
+        self.hostname = hostname
+        self.port = port
+        self.retries = retries
+        if retry_policy is None:
+            retry_policy = RetryPolicy(max_retries=retries)
+        self.retry_policy = retry_policy
+        self.log_errors = log_errors
+        self.pool_maxsize = pool_maxsize
+        self.pool_idle_timeout = pool_idle_timeout
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.error_log = ErrorLog(log_path)
+        self._session = None
+        self._semaphore = None
+        self._loop = None
+        self._closing = None
+        self._closer = None
+
+    async def __aenter__(self) -> 'AsyncAPI':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @staticmethod
+    async def _close_session(session: 'aiohttp.ClientSession',
+                             closing: asyncio.Event) -> None:
+        '''
+        Closes the session once closing is set or this task is cancelled,
+        which `asyncio.run` does to the tasks still running before it closes
+        the event loop, so that the connections are closed within the loop
+        they belong to.
+        '''
+        try:
+            await closing.wait()
+        finally:
+            await session.close()
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        '''
+        :return: The session (connection pool) that all requests are sent
+                 through. It is created the first time it is needed within
+                 each event loop, e.g. by each call to `asyncio.run`, with a
+                 new semaphore, as neither can be used outside of the loop
+                 they were created in. The session of the previous loop is
+                 closed.
+        '''
+        loop = asyncio.get_running_loop()
+        if self._loop is not None and self._loop is not loop:
+            self._close_other_loop()
+        if self._session is None or self._session.closed:
+            aiohttp = _import_aiohttp()
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_maxsize,
+                keepalive_timeout=self.pool_idle_timeout)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+            self._closing = asyncio.Event()
+            self._closer = loop.create_task(
+                self._close_session(self._session, self._closing))
+        return self._session
+
+    def _close_other_loop(self) -> None:
+        '''
+        Closes the session of an event loop other than the running one,
+        within that loop: from the loop's own thread if it is running, else
+        by running it in a new thread until the session is closed. If the
+        loop has been closed, which `asyncio.run` does after the session has
+        been closed, the session cannot be closed.
+        '''
+        loop, closing, closer = self._loop, self._closing, self._closer
+        if loop.is_running():
+            loop.call_soon_threadsafe(closing.set)
+        elif not loop.is_closed():
+
+            async def close_session() -> None:
+                closing.set()
+                await closer
+
+            thread = threading.Thread(target=loop.run_until_complete,
+                                      args=(close_session(),))
+            thread.start()
+            thread.join()
+        self._reset_session()
+
+    def _reset_session(self) -> None:
+        self._session = None
+        self._semaphore = None
+        self._loop = None
+        self._closing = None
+        self._closer = None
+
+    async def close(self) -> None:
+        '''
+        Closes all of the connections within the connection pool and waits
+        for errors to be written to the error log.
+        '''
+        self.error_log.close()
+        if self._loop is asyncio.get_running_loop():
+            self._closing.set()
+            await self._closer
+            self._reset_session()
+        elif self._loop is not None:
+            self._close_other_loop()
+
+    def log_error(self, text: str) -> None:
+        '''
+        Given some error text it will log the text if self.log_errors is True
+
+        :param text: Error text to log
+        '''
+        if self.log_errors:
+            self.error_log.write(text)
+
+    async def _post(self, body: bytes) -> Response:
+        '''
+        :param body: The json encoded data to send to the server.
+        :return: The response from the server, as a
+                 :py:class:`tweebo_parser.transport.Response` so that it can
+                 be handled the same as the responses of
+                 :py:class:`tweebo_parser.API`
+        :raises ServerError: Caused when the server is not running.
+        :raises :py:class:`tweebo_parser.transport.HTTPStatusError`: Caused
+                when the server returns an error status code.
+        '''
+        # Imported here so that importing this package does not import it.
+        import aiohttp
+
+        url = f'http://{self.hostname}:{self.port}'
+        session = self._get_session()
+        headers = {'Content-Type': 'application/json'}
+        try:
+            async with self._semaphore:
+                start_time = time.monotonic()
+                async with session.post(url, data=body,
+                                        headers=headers) as aio_response:
+                    elapsed = datetime.timedelta(
+                        seconds=time.monotonic() - start_time)
+                    content = await aio_response.read()
+                    response = Response(aio_response.status,
+                                        aio_response.reason, url, elapsed,
+                                        content=content)
+        except asyncio.TimeoutError as timeout_error:
+            error = TransportTimeout(f'Timed out sending the request to '
+                                     f'{url}: {timeout_error!r}')
+            raise ServerError(error, self.hostname, self.port) \
+                from timeout_error
+        except aiohttp.ClientConnectionError as connection_error:
+            error = ConnectionFailed(f'Could not send the request to '
+                                     f'{url}: {connection_error!r}')
+            raise ServerError(error, self.hostname, self.port) \
+                from connection_error
+        response.raise_for_status()
+        return response
+
+    async def _request(self, texts: List[str], output_type: str) -> List[Any]:
+        '''
+        Sends one request to the server. Requests that fail are retried as
+        decided by self.retry_policy.
+
+        :param texts: The texts to be processed.
+        :param output_type: Either `conll` or `stanford`.
+        :return: The decoded response of the server.
+        :raises ServerError: Caused when the server is not running.
+        :raises :py:class:`tweebo_parser.transport.HTTPStatusError`: Caused
+                when the server returns an error status code.
+        :raises ResponseDecodeError: Caused if the response cannot be json
+                                     decoded and it is not retried.
+        '''
+        body = json.dumps({'texts': texts, 'output_type': output_type})
+        body = body.encode('utf-8')
+        self.retry_policy.record_request()
+        retry_count = 0
+        while True:
+            wasted_bytes = len(body)
+            response = None
+            try:
+                response = await self._post(body)
+                return response.json()
+            except (ServerError, json.JSONDecodeError) + status_errors() \
+                    as error:
+                if isinstance(error, status_errors()):
+                    response = error.response
+                if response is not None:
+                    wasted_bytes += len(response.content)
+                delay = self.retry_policy.retry_delay(error, retry_count,
+                                                      wasted_bytes)
+                if delay is None:
+                    if isinstance(error, json.JSONDecodeError):
+                        self.log_error(response.text)
+                        raise ResponseDecodeError(response.text)
+                    raise
+                await asyncio.sleep(delay)
+                retry_count += 1
+
+    async def _parse(self, texts: List[str], output_type: str) -> List[Any]:
+        '''
+        Splits the texts into batches of self.batch_size, sends them to the
+        server concurrently and returns the results in the same order as the
+        texts.
+
+        :param texts: The texts to be processed.
+        :param output_type: Either `conll` or `stanford`.
+        :return: The decoded results, one for each text. For the `stanford`
+                 output type the `index` of each result is the index of the
+                 text within `texts`.
+        '''
+        batch_size = self.batch_size
+        if batch_size is None or len(texts) <= batch_size:
+            return await self._request(texts, output_type)
+
+        offsets = range(0, len(texts), batch_size)
+        tasks = [asyncio.ensure_future(
+                     self._request(texts[offset: offset + batch_size],
+                                   output_type))
+                 for offset in offsets]
+        try:
+            all_batch_results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        results = []
+        for offset, batch_results in zip(offsets, all_batch_results):
+            if output_type == 'stanford':
+                for result in batch_results:
+                    result['index'] += offset
+            results.extend(batch_results)
+        return results
+
+    async def parse_conll(self, texts: List[str]) -> List[str]:
+        '''
+        Processes the texts using TweeboParse and returns them in CoNLL format.
+
+        :param texts: The List of Strings to be processed by TweeboParse.
+        :return: A list of CoNLL formated strings.
+        :raises ServerError: Caused when the server is not running.
+        :raises :py:class:`tweebo_parser.transport.HTTPStatusError`: Caused
+                when the input texts is not formated correctly e.g. When you
+                give it a String not a list of Strings.
+        :raises ResponseDecodeError: Caused if after self.retries attempts
+                                     to parse the data it cannot decode the
+                                     data.
+        '''
+        return await self._parse(texts, 'conll')
+
+    async def parse_stanford(self, texts: List[str]
+                             ) -> List[Dict[str, Union[str, int]]]:
+        '''
+        Processes the texts using TweeboParse and returns them in a Stanford
+        styled format (as in the same format as the json return of the Stanford
+        CoreNLP server dependency parser).
+
+        :param texts: The List of Strings to be processed by TweeboParse.
+        :return: A list of dicts.
+        :raises ServerError: Caused when the server is not running.
+        :raises :py:class:`tweebo_parser.transport.HTTPStatusError`: Caused
+                when the input texts is not formated correctly e.g. When you
+                give it a String not a list of Strings.
+        :raises ResponseDecodeError: Caused if after self.retries attempts
+                                     to parse the data it cannot decode the
+                                     data.
+        '''
+        return await self._parse(texts, 'stanford')
@@ -0,0 +1,106 @@
+'''
+Module contains the following class:
+
+1. LRUCache -- Thread safe least recently used cache.
+'''
+
+from collections import OrderedDict
+import threading
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache(object):
+    '''
+    Thread safe cache that holds at most `maxsize` items, when full the
+    least recently used item is removed to make room for a new one.
+
+    The cache is bounded by the number of items rather than their size in
+    bytes. The results of tweets are of similar size, a few KB at most as
+    tweets are short, thus the memory used is close to `maxsize` times the
+    size of a typical result. Measuring the size of each result, which for
+    the Stanford styled output means walking its nested lists and dicts,
+    would cost more than many cache look ups.
+
+    Attributes:
+
+    1. maxsize -- Maximum number of items stored.
+    2. hits -- Number of times :py:meth:`get` found the key.
+    3. misses -- Number of times :py:meth:`get` did not find the key.
+    4. evictions -- Number of items removed to make room for new ones.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, maxsize: int) -> None:
+        '''
+        :param maxsize: Maximum number of items stored.
+        :raises ValueError: If maxsize is less than 1.
+        '''
+        if maxsize < 1:
+            raise ValueError(f'maxsize has to be at least 1: {maxsize}')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        '''
+        :param key: Key of the item.
+        :return: The item stored under the key, None if it is not stored.
+        '''
+        with self._lock:
+            try:
+                value = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        '''
+        :param key: Key to store the item under.
+        :param value: The item to store.
+        '''
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        '''
+        Removes all of the items and resets the hit, miss and eviction
+        counts.
+        '''
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> Dict[str, int]:
+        '''
+        :return: The hits, misses, evictions, maxsize and current size of
+                 the cache.
+        '''
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'maxsize': self.maxsize,
+                    'size': len(self._items)}
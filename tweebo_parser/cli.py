@@ -0,0 +1,254 @@
+'''
+Command line interface that parses a file of tweets, run using either
+`python -m tweebo_parser` or `tweebo-parser`. Examples:
+
+    tweebo-parser tweets.txt parsed.conll
+    tweebo-parser tweets.jsonl parsed.jsonl --output-format stanford \\
+        --text-field text --id-field id --max-in-flight 8
+    cat tweets.tsv | tweebo-parser - - --input-format tsv --text-column 1 \\
+        --endpoints 10.0.0.1:8000 10.0.0.2:8000
+
+Module contains the following functions:
+
+1. read_records -- Reads (id, text) records from an input file.
+2. main -- Runs the command line interface.
+'''
+
+import argparse
+from collections import deque
+import json
+import sys
+import time
+from typing import Any, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from tweebo_parser.api import API, ResponseDecodeError, ServerError
+from tweebo_parser.transport import connection_errors, status_errors
+
+
+def read_records(lines: Iterable[str], input_format: str,
+                 text_field: str = 'text', id_field: Optional[str] = None,
+                 text_column: int = 0, id_column: Optional[int] = None
+                 ) -> Iterator[Tuple[Any, str]]:
+    '''
+    :param lines: Lines of the input file.
+    :param input_format: `text` one tweet per line, `jsonl` one json object
+                         per line or `tsv` tab separated columns.
+    :param text_field: Key of the text within each json object.
+    :param id_field: Key of the id within each json object.
+    :param text_column: Index of the text column within each tsv line.
+    :param id_column: Index of the id column within each tsv line.
+    :return: A generator of the id (None if no id field or column is given)
+             and text of each tweet.
+    :raises ValueError: If the input format is not known, or a line is not
+                        valid json or does not have the text or id.
+    '''
+    if input_format not in ('text', 'jsonl', 'tsv'):
+        raise ValueError('input_format has to be `text`, `jsonl` or `tsv` '
+                         f'not: {input_format}')
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if input_format == 'text':
+            yield None, line
+            continue
+        if input_format == 'jsonl' and not line.strip():
+            continue
+        try:
+            if input_format == 'jsonl':
+                record = json.loads(line)
+                record_id = None if id_field is None else record[id_field]
+                text = record[text_field]
+            else:
+                columns = line.split('\t')
+                record_id = None if id_column is None else \
+                    columns[id_column]
+                text = columns[text_column]
+        except (ValueError, LookupError, TypeError) as error:
+            raise ValueError(f'Cannot read line {line_number} of the input: '
+                             f'{type(error).__name__} {error}') from error
+        yield record_id, text
+
+
+def _guess_format(path: str) -> str:
+    if path.endswith(('.jsonl', '.json')):
+        return 'jsonl'
+    if path.endswith('.tsv'):
+        return 'tsv'
+    return 'text'
+
+
+def _parse_endpoint(endpoint: str) -> Tuple[str, int]:
+    hostname, _, port = endpoint.rpartition(':')
+    if not hostname:
+        raise argparse.ArgumentTypeError('Endpoints have to be of the form '
+                                         f'hostname:port not: {endpoint}')
+    return hostname, int(port)
+
+
+def _argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='tweebo-parser',
+        description='Parses a file of tweets using the TweeboParser API '
+                    'server(s), writing CoNLL or Stanford styled json lines.')
+    parser.add_argument('input', help='Input file, - for stdin')
+    parser.add_argument('output', nargs='?', default='-',
+                        help='Output file, - for stdout (default)')
+    parser.add_argument('--input-format', choices=['text', 'jsonl', 'tsv'],
+                        help='Default guessed from the input file extension, '
+                             'text if it cannot be guessed')
+    parser.add_argument('--output-format', choices=['conll', 'stanford'],
+                        default='conll')
+    parser.add_argument('--text-field', default='text',
+                        help='jsonl key of the text')
+    parser.add_argument('--id-field', help='jsonl key of the tweet id')
+    parser.add_argument('--text-column', type=int, default=0,
+                        help='tsv column (0 based) of the text')
+    parser.add_argument('--id-column', type=int,
+                        help='tsv column (0 based) of the tweet id')
+    parser.add_argument('--hostname', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--endpoints', nargs='+', type=_parse_endpoint,
+                        metavar='HOSTNAME:PORT',
+                        help='Servers to spread the requests across, '
+                             'overrides --hostname and --port')
+    parser.add_argument('--batch-size', type=int, default=100,
+                        help='Texts per request')
+    parser.add_argument('--max-in-flight', type=int, default=4,
+                        help='Requests sent at the same time')
+    parser.add_argument('--auto-tune', action='store_true',
+                        help='Tune the batch size and requests in flight '
+                             'from the server latency')
+    parser.add_argument('--timeout', type=float,
+                        help='Seconds to wait to connect to the server and '
+                             'for each read of a response')
+    parser.add_argument('--retries', type=int, default=10,
+                        help='Times to retry a request after an invalid '
+                             'response or error status code')
+    parser.add_argument('--deadline', type=float,
+                        help='Seconds each batch has to be parsed within, '
+                             'including retries')
+    parser.add_argument('--transport', choices=['requests', 'http.client'],
+                        default='requests',
+                        help='Library to send the requests with, '
+                             'http.client has less overhead')
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='Number of parsed texts to cache')
+    parser.add_argument('--reuse-retweets', action='store_true',
+                        help='Only parse the body of `RT @handle:` '
+                             'retweets')
+    parser.add_argument('--progress-interval', type=float, default=5.0,
+                        help='Seconds between progress reports')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Do not report progress')
+    return parser
+
+
+def _report(texts: int, start_time: float, log: TextIO,
+            final: bool = False) -> None:
+    elapsed = time.monotonic() - start_time
+    rate = texts / elapsed if elapsed else 0.0
+    prefix = 'Finished' if final else 'Parsed'
+    log.write(f'{prefix} {texts} texts in {elapsed:.1f}s '
+              f'({rate:.1f} texts/s)\n')
+    log.flush()
+
+
+def _first_line(message: str) -> str:
+    lines = message.strip().splitlines()
+    return lines[0] if lines else message
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    '''
+    :param argv: Command line arguments, default sys.argv[1:]
+    :return: Exit status, 0 on success, 2 if the arguments are not valid
+             and 1 for any other error e.g. the server cannot be connected
+             to, returns an error or the input cannot be read. Every error
+             is reported as one line on stderr.
+    '''
+    args = _argument_parser().parse_args(argv)
+    input_format = args.input_format or _guess_format(args.input)
+    output_type = args.output_format
+    log = sys.stderr
+    try:
+        api = API(args.hostname, args.port, args.retries,
+                  endpoints=args.endpoints, batch_size=args.batch_size,
+                  max_in_flight=args.max_in_flight,
+                  auto_tune=args.auto_tune, cache_size=args.cache_size,
+                  pool_maxsize=args.max_in_flight, timeout=args.timeout,
+                  deadline=args.deadline, transport=args.transport,
+                  reuse_retweets=args.reuse_retweets)
+    except ValueError as value_error:
+        log.write(f'Invalid arguments: {value_error}\n')
+        return 2
+
+    input_file = output_file = None
+    try:
+        input_file = sys.stdin if args.input == '-' else \
+            open(args.input, 'r', encoding='utf-8')
+        output_file = sys.stdout if args.output == '-' else \
+            open(args.output, 'w', encoding='utf-8')
+    except OSError as os_error:
+        log.write(f'Cannot open {os_error.filename}: {os_error.strerror}\n')
+        api.close()
+        if input_file not in (None, sys.stdin):
+            input_file.close()
+        return 1
+    records = read_records(input_file, input_format, args.text_field,
+                           args.id_field, args.text_column, args.id_column)
+    # The ids of the texts that have been read but not yet written, which
+    # is at most the texts in flight.
+    ids = deque()
+
+    def texts() -> Iterator[str]:
+        for record_id, text in records:
+            ids.append(record_id)
+            yield text
+
+    start_time = last_report = time.monotonic()
+    num_texts = 0
+    try:
+        for result in api.parse_iter(texts(), output_type):
+            record_id = ids.popleft()
+            if output_type == 'conll':
+                if record_id is not None:
+                    output_file.write(f'# id = {record_id}\n')
+                output_file.write(f'{result}\n\n')
+            else:
+                if record_id is not None:
+                    result['id'] = record_id
+                output_file.write(json.dumps(result) + '\n')
+            num_texts += 1
+            if not args.quiet and \
+               time.monotonic() - last_report >= args.progress_interval:
+                last_report = time.monotonic()
+                _report(num_texts, start_time, log)
+    except ServerError as server_error:
+        log.write(f'{_first_line(server_error.message)}\n')
+        return 1
+    except status_errors() as status_error:
+        response = status_error.response
+        log.write(f'The server returned an error: {response.status_code} '
+                  f'{response.reason} for {response.url}\n')
+        return 1
+    except connection_errors() as connection_error:
+        log.write('Cannot connect to the server: '
+                  f'{_first_line(str(connection_error))}\n')
+        return 1
+    except ResponseDecodeError as decode_error:
+        log.write('The response of the server is not valid json: '
+                  f'{_first_line(decode_error.text)}\n')
+        return 1
+    except ValueError as value_error:
+        log.write(f'{_first_line(str(value_error))}\n')
+        return 1
+    finally:
+        api.close()
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+        else:
+            output_file.flush()
+    if not args.quiet:
+        _report(num_texts, start_time, log, final=True)
+    return 0
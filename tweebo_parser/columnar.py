@@ -0,0 +1,465 @@
+'''
+Module contains the following classes:
+
+1. TokenTable -- Columnar table with one row per token of the parsed
+   tweets, exported as NumPy arrays or an Arrow table.
+2. TokenTableWriter -- Streaming sink that writes parse results to an Arrow
+   or Parquet file in chunks.
+
+And the following functions:
+
+1. token_tables -- Converts a stream of parse results into TokenTables of
+   a limited size.
+2. import_numpy, import_pyarrow -- Import the optional dependencies,
+   raising an ImportError that says how to install them.
+
+NumPy and pyarrow are optional, they are only imported by the methods that
+export to them: `pip install tweebo-parser-python-api[numpy]` or
+`pip install tweebo-parser-python-api[arrow]`.
+'''
+
+from array import array
+from collections.abc import Mapping
+import itertools
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from tweebo_parser.parsed import DEP_VOCAB, ParsedTweet, POS_VOCAB
+from tweebo_parser.utils import Lookup
+
+COLUMNS = ('tweet_id', 'token_index', 'word', 'pos', 'head', 'dep')
+_ROOT_ID = DEP_VOCAB.add('ROOT')
+# Number of CoNLL strings split into fields at a time.
+_CONLL_CHUNK = 1000
+
+
+def import_numpy() -> Any:
+    '''
+    :return: The numpy module.
+    :raises ImportError: If numpy is not installed.
+    '''
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('NumPy export requires numpy, install it using: '
+                          'pip install tweebo-parser-python-api[numpy]') \
+            from None
+    return numpy
+
+
+def import_pyarrow() -> Any:
+    '''
+    :return: The pyarrow module.
+    :raises ImportError: If pyarrow is not installed.
+    '''
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('Arrow export requires pyarrow, install it using: '
+                          'pip install tweebo-parser-python-api[arrow]') \
+            from None
+    return pyarrow
+
+
+class TokenTable(object):
+    '''
+    Parse results stored column by column, with one row per token:
+
+    1. tweet_id -- Id of the tweet the token belongs to, by default the
+       position of the tweet within the results added to the table.
+    2. token_index -- Index of the token within its tweet, starting at 1.
+    3. word -- The token.
+    4. pos -- The POS tag.
+    5. head -- Index of the token's head, 0 for ROOT and -1 for tokens that
+       are not attached to any other token.
+    6. dep -- The dependency label e.g. `_`, `MWE` or `ROOT`.
+
+    Each column is held in a compact array and results are added a whole
+    list at a time, the CoNLL strings of a list are split into columns
+    together rather than token by token. POS tags and dependency labels are
+    stored as ids into :py:data:`tweebo_parser.parsed.POS_VOCAB` and
+    :py:data:`tweebo_parser.parsed.DEP_VOCAB`, and exported dictionary
+    encoded.
+
+    .. code-block:: python
+
+        table = TokenTable()
+        table.extend(api.parse_conll(texts), ids=tweet_ids)
+        arrow_table = table.to_arrow()
+        columns = table.to_numpy()
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self) -> None:
+        self._next_id = 0
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    @property
+    def num_tweets(self) -> int:
+        '''
+        :return: Number of tweets added to the table.
+        '''
+        return len(self._ids)
+
+    @property
+    def num_tokens(self) -> int:
+        '''
+        :return: Number of tokens (rows) within the table.
+        '''
+        return len(self._words)
+
+    def clear(self) -> None:
+        '''
+        Removes all of the rows. The default tweet ids carry on from the
+        tweets added before clearing, so that a stream of results can be
+        converted a chunk at a time.
+        '''
+        # Per tweet.
+        self._ids = []
+        self._lengths = array('I')
+        # Per token.
+        self._token_index = array('i')
+        self._words = []
+        self._pos = array('h')
+        self._heads = array('i')
+        self._deps = array('h')
+
+    def extend(self, results: Iterable[Union[str, Dict[str, Any],
+                                             ParsedTweet]],
+               ids: Optional[Iterable[Any]] = None) -> None:
+        '''
+        :param results: Results of :py:meth:`tweebo_parser.API.parse_conll`,
+                        :py:meth:`tweebo_parser.API.parse_stanford` or
+                        :py:meth:`tweebo_parser.API.parse_tweets`
+        :param ids: Id of the tweet of each result e.g. the Twitter ids.
+                    Default the position of the result within all of the
+                    results added to the table.
+        :raises ValueError: If the number of ids and results differ.
+        '''
+        results = list(results)
+        if ids is None:
+            ids = range(self._next_id, self._next_id + len(results))
+        ids = list(ids)
+        if len(ids) != len(results):
+            raise ValueError(f'{len(ids)} ids were given for {len(results)}'
+                             ' results')
+        self._next_id += len(results)
+        self._ids.extend(ids)
+        # Consecutive CoNLL strings are converted together, in chunks so
+        # that the fields of only one chunk are held at a time.
+        conlls = []
+        for result in results:
+            if isinstance(result, str):
+                conlls.append(result)
+                if len(conlls) == _CONLL_CHUNK:
+                    self._extend_conll(conlls)
+                    conlls = []
+                continue
+            self._extend_conll(conlls)
+            conlls = []
+            if isinstance(result, ParsedTweet):
+                self._extend_parsed(result)
+            elif isinstance(result, Mapping):
+                self._extend_stanford(result)
+            else:
+                raise TypeError('Results have to be CoNLL strings, Stanford '
+                                f'styled dicts or ParsedTweets not: '
+                                f'{type(result)}')
+        self._extend_conll(conlls)
+
+    def _extend_conll(self, conlls: List[str]) -> None:
+        if not conlls:
+            return
+        self._lengths.extend(conll.count('\n') + 1 if conll else 0
+                             for conll in conlls)
+        text = '\n'.join(conll for conll in conlls if conll)
+        if not text:
+            return
+        # Every line has 10 fields, thus splitting all of the lines at once
+        # gives column n at every 10th field from n.
+        fields = text.replace('\n', '\t').split('\t')
+        to_int = Lookup(int)
+        self._token_index.extend(map(to_int.__getitem__, fields[0::10]))
+        self._words.extend(fields[1::10])
+        self._pos.extend(map(Lookup(POS_VOCAB.add).__getitem__,
+                             fields[3::10]))
+        head_fields = fields[6::10]
+        self._heads.extend(map(to_int.__getitem__, head_fields))
+        # The label of a token whose head is 0 is ROOT.
+        dep_ids = Lookup(lambda head_label: _ROOT_ID
+                         if head_label[0] == '0'
+                         else DEP_VOCAB.add(head_label[1]))
+        self._deps.extend(map(dep_ids.__getitem__,
+                              zip(head_fields, fields[7::10])))
+
+    def _extend_parsed(self, parsed: ParsedTweet) -> None:
+        num_tokens = parsed.num_tokens
+        self._lengths.append(num_tokens)
+        self._token_index.extend(range(1, num_tokens + 1))
+        self._words.extend(parsed.words)
+        # The unsigned ids of a ParsedTweet have the same bytes as the
+        # signed ids of the table, as there are far fewer than 2 ** 15.
+        self._pos.frombytes(parsed.pos_ids.tobytes())
+        self._heads.extend(parsed.heads)
+        self._deps.frombytes(parsed.dep_ids.tobytes())
+
+    def _extend_stanford(self, stanford: Dict[str, Any]) -> None:
+        tokens = stanford['tokens']
+        dependencies = sorted(stanford['basicDependencies'],
+                              key=lambda dependency: dependency['dependent'])
+        self._lengths.append(len(tokens))
+        self._token_index.extend(token['index'] for token in tokens)
+        self._words.extend(token['word'] for token in tokens)
+        self._pos.extend(POS_VOCAB.add(token['pos']) for token in tokens)
+        self._heads.extend(dependency['governor']
+                           for dependency in dependencies)
+        self._deps.extend(DEP_VOCAB.add(dependency['dep'])
+                          for dependency in dependencies)
+
+    def _token_ids(self) -> List[Any]:
+        '''
+        :return: The tweet id of each token.
+        '''
+        return list(itertools.chain.from_iterable(
+            map(itertools.repeat, self._ids, self._lengths)))
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        '''
+        :return: Dictionary of column name to a list of the column's values,
+                 with the POS tags and dependency labels as strings.
+        '''
+        pos_strings = POS_VOCAB.strings
+        dep_strings = DEP_VOCAB.strings
+        return {'tweet_id': self._token_ids(),
+                'token_index': self._token_index.tolist(),
+                'word': list(self._words),
+                'pos': [pos_strings[pos_id] for pos_id in self._pos],
+                'head': self._heads.tolist(),
+                'dep': [dep_strings[dep_id] for dep_id in self._deps]}
+
+    def to_numpy(self, encoded: bool = False) -> Dict[str, Any]:
+        '''
+        :param encoded: Whether the `pos` and `dep` columns are returned as
+                        int16 ids into `pos_vocab` and `dep_vocab`, which
+                        are then also returned, rather than as strings.
+        :return: Dictionary of column name to NumPy array. token_index and
+                 head are int32, word an object array of strings.
+        :raises ImportError: If numpy is not installed.
+        '''
+        numpy = import_numpy()
+        tweet_ids = numpy.asarray(self._ids)
+        if tweet_ids.dtype.kind not in 'iu':
+            tweet_ids = numpy.asarray(self._ids, dtype=object)
+        columns = {
+            'tweet_id': numpy.repeat(tweet_ids,
+                                     numpy.asarray(self._lengths,
+                                                   dtype=numpy.int64)),
+            'token_index': numpy.array(self._token_index, dtype=numpy.int32),
+            'word': numpy.array(self._words, dtype=object),
+            'pos': numpy.array(self._pos, dtype=numpy.int16),
+            'head': numpy.array(self._heads, dtype=numpy.int32),
+            'dep': numpy.array(self._deps, dtype=numpy.int16)}
+        pos_vocab = numpy.array(POS_VOCAB.strings, dtype=object)
+        dep_vocab = numpy.array(DEP_VOCAB.strings, dtype=object)
+        if encoded:
+            columns['pos_vocab'] = pos_vocab
+            columns['dep_vocab'] = dep_vocab
+        else:
+            columns['pos'] = pos_vocab[columns['pos']]
+            columns['dep'] = dep_vocab[columns['dep']]
+        return columns
+
+    def tree_arrays(self) -> Dict[str, Any]:
+        '''
+        :return: The columns that describe the dependency trees, as int64
+                 NumPy arrays: `length`, the number of tokens of each
+                 tweet, and per token `token_index`, `head` and `dep`, the
+                 id of the label within
+                 :py:data:`tweebo_parser.parsed.DEP_VOCAB`.
+        :raises ImportError: If numpy is not installed.
+        '''
+        numpy = import_numpy()
+        return {'length': numpy.array(self._lengths, dtype=numpy.int64),
+                'token_index': numpy.array(self._token_index,
+                                           dtype=numpy.int64),
+                'head': numpy.array(self._heads, dtype=numpy.int64),
+                'dep': numpy.array(self._deps, dtype=numpy.int64)}
+
+    def to_arrow(self) -> Any:
+        '''
+        :return: A :py:class:`pyarrow.Table` of the columns, with the `pos`
+                 and `dep` columns dictionary encoded.
+        :raises ImportError: If pyarrow is not installed.
+        '''
+        pyarrow = import_pyarrow()
+        num_tokens = len(self)
+
+        def int_column(values: array, arrow_type: Any) -> Any:
+            # tobytes copies the array, so the table can still be added to.
+            return pyarrow.Array.from_buffers(
+                arrow_type, num_tokens,
+                [None, pyarrow.py_buffer(values.tobytes())])
+
+        def dictionary_column(values: array, strings: List[str]) -> Any:
+            return pyarrow.DictionaryArray.from_arrays(
+                int_column(values, pyarrow.int16()),
+                pyarrow.array(strings, pyarrow.string()))
+
+        # The ids are converted per tweet, so that their type does not
+        # depend on whether the tweets have tokens, and then repeated.
+        tweet_of_token = array('i', itertools.chain.from_iterable(
+            map(itertools.repeat, range(len(self._ids)), self._lengths)))
+        tweet_ids = pyarrow.array(self._ids).take(
+            int_column(tweet_of_token, pyarrow.int32()))
+        return pyarrow.Table.from_arrays(
+            [tweet_ids,
+             int_column(self._token_index, pyarrow.int32()),
+             pyarrow.array(self._words, pyarrow.string()),
+             dictionary_column(self._pos, POS_VOCAB.strings),
+             int_column(self._heads, pyarrow.int32()),
+             dictionary_column(self._deps, DEP_VOCAB.strings)],
+            names=list(COLUMNS))
+
+
+def token_tables(results: Iterable[Union[str, Dict[str, Any],
+                                         ParsedTweet]],
+                 ids: Optional[Iterable[Any]] = None,
+                 chunk_size: int = 10000) -> Iterator[TokenTable]:
+    '''
+    Converts a stream of results, e.g. from
+    :py:meth:`tweebo_parser.API.parse_iter`, into tables of `chunk_size`
+    tweets, so that only one chunk is held in memory at a time.
+
+    :param results: Results of parsing each tweet.
+    :param ids: Id of the tweet of each result. Default the position of the
+                result within the stream.
+    :param chunk_size: Number of tweets per table.
+    :return: A generator of the tables. The same table is cleared and
+             yielded for each chunk, convert it before reading the next.
+    :raises ValueError: If chunk_size is less than 1.
+    '''
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size has to be at least 1: {chunk_size}')
+    results = iter(results)
+    ids = None if ids is None else iter(ids)
+    table = TokenTable()
+    while True:
+        chunk = list(itertools.islice(results, chunk_size))
+        if not chunk:
+            return
+        chunk_ids = None
+        if ids is not None:
+            chunk_ids = list(itertools.islice(ids, len(chunk)))
+        table.clear()
+        table.extend(chunk, chunk_ids)
+        yield table
+
+
+class TokenTableWriter(object):
+    '''
+    Streaming sink that adds parse results to a :py:class:`TokenTable` and
+    writes it to a file each time it holds `chunk_size` tweets, so that a
+    whole corpus can be written without holding it in memory:
+
+    .. code-block:: python
+
+        with TokenTableWriter('tokens.parquet') as writer:
+            writer.write(api.parse_iter(texts), ids=tweet_ids)
+
+    Attributes:
+
+    1. path -- The file written to.
+    2. format -- `parquet` or `arrow` (the Arrow IPC stream format).
+    3. chunk_size -- Number of tweets per written chunk.
+    4. num_tweets, num_tokens -- Number of tweets and tokens written.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, path: Union[str, Path], format: str = 'parquet',
+                 chunk_size: int = 10000) -> None:
+        '''
+        :param path: The file to write to.
+        :param format: `parquet` or `arrow` (the Arrow IPC stream format).
+        :param chunk_size: Number of tweets per written chunk.
+        :raises ImportError: If pyarrow is not installed.
+        :raises ValueError: If the format is not known or chunk_size is less
+                            than 1.
+        '''
+        if format not in ('parquet', 'arrow'):
+            raise ValueError('format has to be either `parquet` or `arrow` '
+                             f'not: {format}')
+        if chunk_size < 1:
+            raise ValueError(f'chunk_size has to be at least 1: {chunk_size}')
+        import_pyarrow()
+        self.path = str(path)
+        self.format = format
+        self.chunk_size = chunk_size
+        self.num_tweets = 0
+        self.num_tokens = 0
+        self._table = TokenTable()
+        self._writer = None
+
+    def __enter__(self) -> 'TokenTableWriter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def write(self, results: Iterable[Union[str, Dict[str, Any],
+                                            ParsedTweet]],
+              ids: Optional[Iterable[Any]] = None) -> None:
+        '''
+        :param results: Results of parsing each tweet, read a chunk at a
+                        time.
+        :param ids: Id of the tweet of each result. Default the position of
+                    the result within everything written.
+        '''
+        results = iter(results)
+        ids = None if ids is None else iter(ids)
+        while True:
+            space = self.chunk_size - self._table.num_tweets
+            chunk = list(itertools.islice(results, space))
+            if not chunk:
+                return
+            chunk_ids = None
+            if ids is not None:
+                chunk_ids = list(itertools.islice(ids, len(chunk)))
+            self._table.extend(chunk, chunk_ids)
+            if self._table.num_tweets >= self.chunk_size:
+                self.flush()
+
+    def flush(self) -> None:
+        '''
+        Writes the results added since the last flush to the file.
+        '''
+        if not self._table.num_tweets:
+            return
+        table = self._table.to_arrow()
+        if self._writer is None:
+            pyarrow = import_pyarrow()
+            if self.format == 'parquet':
+                import pyarrow.parquet
+
+                self._writer = pyarrow.parquet.ParquetWriter(self.path,
+                                                             table.schema)
+            else:
+                self._writer = pyarrow.ipc.new_stream(self.path,
+                                                      table.schema)
+        self._writer.write_table(table)
+        self.num_tweets += self._table.num_tweets
+        self.num_tokens += self._table.num_tokens
+        self._table.clear()
+
+    def close(self) -> None:
+        '''
+        Writes any results not yet written and closes the file.
+        '''
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
@@ -0,0 +1,51 @@
+'''
+Module contains the following function:
+
+1. conll_to_stanford -- Converts the CoNLL output of TweeboParser into the
+   Stanford styled output.
+'''
+
+from typing import Any, Dict
+
+
+def conll_to_stanford(conll: str, index: int) -> Dict[str, Any]:
+    '''
+    Creates the same Stanford styled dict that the TweeboParser API server
+    returns for the `stanford` output type from the CoNLL formated string it
+    returns for the `conll` output type. The CoNLL string is far smaller to
+    send and decode than the Stanford styled json.
+
+    The governorGloss of a token whose head is 0 is `ROOT` and of a token
+    whose head is -1 (not attached) is `$$NAN$$`. The dep label is `ROOT`
+    when the head is 0 else the label within the CoNLL string (`MWE` or `_`).
+
+    :param conll: CoNLL formated string as returned by
+                  :py:meth:`tweebo_parser.API.parse_conll`
+    :param index: The index of the text within the texts that were parsed.
+    :return: Stanford styled dict as returned by
+             :py:meth:`tweebo_parser.API.parse_stanford`
+    '''
+    tokens = []
+    dependencies = []
+    if conll:
+        rows = [line.split('\t') for line in conll.split('\n')]
+        words = [row[1] for row in rows]
+        for token_index, row in enumerate(rows, 1):
+            word = row[1]
+            head = int(row[6])
+            tokens.append({'index': token_index, 'word': word,
+                           'originalText': word, 'pos': row[3]})
+            if head == 0:
+                dep = governor_gloss = 'ROOT'
+            elif head == -1:
+                dep = row[7]
+                governor_gloss = '$$NAN$$'
+            else:
+                dep = row[7]
+                governor_gloss = words[head - 1]
+            dependencies.append({'dep': dep, 'governor': head,
+                                 'governorGloss': governor_gloss,
+                                 'dependent': token_index,
+                                 'dependentGloss': word})
+    return {'index': index, 'tokens': tokens,
+            'basicDependencies': dependencies}
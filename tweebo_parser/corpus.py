@@ -0,0 +1,260 @@
+'''
+Module contains the following class and function:
+
+1. CorpusJournal -- On disk record of the parsed batches of a corpus.
+2. parse_corpus -- Parses a corpus, skipping the batches already within
+   the journal, so that a job that stopped part way can be resumed.
+'''
+
+from collections import deque
+import itertools
+import json
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Union
+
+from tweebo_parser.api import API
+from tweebo_parser.utils import append_synced, truncate_synced
+from tweebo_parser.utils import write_synced
+
+
+class CorpusJournal(object):
+    '''
+    Records the results of each batch of a corpus as it is parsed, within a
+    directory containing:
+
+    1. `journal.json` -- The batch size and output type, a journal can only
+       be resumed with the same settings as the batch ids depend on them.
+    2. `results.jsonl` -- One json line per batch: `{"batch": id,
+       "results": [...]}`. Batch `id` holds the results of texts
+       `id * batch_size` to `(id + 1) * batch_size - 1` of the corpus.
+    3. `index.tsv` -- One line per batch of the batch id, the byte offset
+       and length of its line within `results.jsonl` and its number of
+       texts. A batch written again, such as the last batch of a corpus
+       that has grown, replaces the earlier one.
+
+    A batch is written to `results.jsonl` and then to `index.tsv`, each
+    write is flushed to disk before the next, thus a batch is complete only
+    once it is within the index. When a journal is opened anything after
+    the last complete batch, such as a line half written when a process was
+    killed, is removed.
+
+    Attributes:
+
+    1. directory -- The directory of the journal.
+    2. batch_size -- Number of texts per batch.
+    3. output_type -- Either `conll` or `stanford`.
+    4. completed -- The ids of the batches within the journal, the last of
+       which may have fewer than batch_size texts.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, directory: Union[str, Path], batch_size: int = 1000,
+                 output_type: str = 'conll') -> None:
+        '''
+        :param directory: Directory of the journal, created if it does not
+                          exist.
+        :param batch_size: Number of texts per batch.
+        :param output_type: Either `conll` or `stanford`.
+        :raises ValueError: If the output_type is not `conll` or `stanford`,
+                            or the directory contains a journal created with
+                            a different batch_size or output_type.
+        '''
+        if output_type not in ('conll', 'stanford'):
+            raise ValueError('output_type has to be either `conll` or '
+                             f'`stanford` not: {output_type}')
+        if batch_size < 1:
+            raise ValueError(f'batch_size has to be at least 1: {batch_size}')
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.output_type = output_type
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._settings_fp = self.directory / 'journal.json'
+        self._results_fp = self.directory / 'results.jsonl'
+        self._index_fp = self.directory / 'index.tsv'
+        self._check_settings()
+        # Batch id to the offset and length of its results line and its
+        # number of texts.
+        self._index = {}
+        self._recover()
+        self.completed = set(self._index)
+        self._results_file = self._results_fp.open('ab')
+        self._index_file = self._index_fp.open('ab')
+
+    def __enter__(self) -> 'CorpusJournal':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __contains__(self, batch_id: int) -> bool:
+        return batch_id in self.completed
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def _check_settings(self) -> None:
+        settings = {'batch_size': self.batch_size,
+                    'output_type': self.output_type}
+        if self._settings_fp.is_file():
+            with self._settings_fp.open('r') as settings_file:
+                saved_settings = json.load(settings_file)
+            if saved_settings != settings:
+                raise ValueError(f'The journal at {self.directory} was '
+                                 f'created with {saved_settings} not '
+                                 f'{settings}')
+        else:
+            write_synced(self._settings_fp, json.dumps(settings).encode())
+
+    def _recover(self) -> None:
+        '''
+        Reads the index, and removes any batch lines that were not
+        completely written to either the index or results file.
+        '''
+        results_size = 0
+        if self._results_fp.is_file():
+            results_size = self._results_fp.stat().st_size
+        index_size = 0
+        results_end = 0
+        if self._index_fp.is_file():
+            with self._index_fp.open('rb') as index_file:
+                for line in index_file:
+                    if not line.endswith(b'\n'):
+                        break
+                    batch_id, offset, length, num_texts = \
+                        map(int, line.split(b'\t'))
+                    if offset + length > results_size:
+                        break
+                    self._index[batch_id] = (offset, length, num_texts)
+                    results_end = max(results_end, offset + length)
+                    index_size += len(line)
+            truncate_synced(self._index_fp, index_size)
+        if results_size > results_end:
+            truncate_synced(self._results_fp, results_end)
+
+    def append(self, batch_id: int, results: List[Any]) -> None:
+        '''
+        Writes the results of a batch to the journal, once this returns the
+        batch has been flushed to disk.
+
+        :param batch_id: Id of the batch.
+        :param results: The results of the batch.
+        '''
+        line = json.dumps({'batch': batch_id, 'results': results})
+        line = f'{line}\n'.encode('utf-8')
+        offset = self._results_file.tell()
+        append_synced(self._results_file, line)
+        entry = (offset, len(line), len(results))
+        index_line = '\t'.join(map(str, (batch_id,) + entry))
+        append_synced(self._index_file, f'{index_line}\n'.encode())
+        self._index[batch_id] = entry
+        self.completed.add(batch_id)
+
+    def num_texts(self, batch_id: int) -> int:
+        '''
+        :param batch_id: Id of a completed batch.
+        :return: The number of texts of the batch.
+        :raises KeyError: If the batch is not within the journal.
+        '''
+        return self._index[batch_id][2]
+
+    def batch(self, batch_id: int) -> List[Any]:
+        '''
+        :param batch_id: Id of a completed batch.
+        :return: The results of the batch.
+        :raises KeyError: If the batch is not within the journal.
+        '''
+        offset, length, _ = self._index[batch_id]
+        with self._results_fp.open('rb') as results_file:
+            results_file.seek(offset)
+            return json.loads(results_file.read(length))['results']
+
+    def results(self) -> Iterator[Any]:
+        '''
+        :return: A generator of the results of every completed batch, in
+                 batch id order.
+        '''
+        if not self._results_file.closed:
+            self._results_file.flush()
+        with self._results_fp.open('rb') as results_file:
+            for batch_id in sorted(self._index):
+                offset, length, _ = self._index[batch_id]
+                results_file.seek(offset)
+                record = json.loads(results_file.read(length))
+                yield from record['results']
+
+    def close(self) -> None:
+        '''
+        Closes the journal's files.
+        '''
+        self._results_file.close()
+        self._index_file.close()
+
+
+def parse_corpus(api: API, texts: Iterable[str],
+                 directory: Union[str, Path], output_type: str = 'conll',
+                 batch_size: int = 1000) -> CorpusJournal:
+    '''
+    Parses the texts, recording the results of each batch of texts within a
+    :py:class:`CorpusJournal`. If the journal already exists the batches
+    within it are not parsed again, thus a job that was stopped part way
+    resumes from the first batch that did not finish. The texts have to be
+    given in the same order each time, texts can be added to the end of the
+    corpus.
+
+    :param api: The API used to parse the texts, its
+                :py:meth:`tweebo_parser.API.parse_iter` is used so its
+                batch_size and max_in_flight control the requests to the
+                server.
+    :param texts: The corpus.
+    :param directory: Directory of the journal.
+    :param output_type: Either `conll` or `stanford`.
+    :param batch_size: Number of texts per journal batch.
+    :return: The closed journal, use :py:meth:`CorpusJournal.results` to
+             read the results. For the `stanford` output type the `index` of
+             each result is the position of the text within the corpus.
+    :raises ValueError: If the journal exists with a different batch_size or
+                        output_type.
+
+    :Example:
+    ::
+        from tweebo_parser import API
+        from tweebo_parser.corpus import parse_corpus
+        with open('tweets.txt', 'r') as tweets:
+            texts = (line.rstrip('\\n') for line in tweets)
+            journal = parse_corpus(API(batch_size=100, max_in_flight=4),
+                                   texts, 'tweets_journal')
+        for conll in journal.results():
+            print(conll)
+    '''
+    with CorpusJournal(directory, batch_size, output_type) as journal:
+        texts = iter(texts)
+        # (batch id, number of texts) of the batches sent to be parsed
+        # whose results have not all been returned.
+        pending = deque()
+
+        def texts_to_parse() -> Iterator[str]:
+            for batch_id in itertools.count():
+                batch = list(itertools.islice(texts, batch_size))
+                if not batch:
+                    return
+                # A batch journaled with fewer texts than it now has, the
+                # last batch of a corpus that has since grown, is parsed
+                # again.
+                if batch_id in journal and \
+                        journal.num_texts(batch_id) == len(batch):
+                    continue
+                pending.append((batch_id, len(batch)))
+                yield from batch
+
+        batch_results = []
+        for result in api.parse_iter(texts_to_parse(), output_type):
+            batch_id, num_texts = pending[0]
+            if output_type == 'stanford':
+                result['index'] = batch_id * batch_size + len(batch_results)
+            batch_results.append(result)
+            if len(batch_results) == num_texts:
+                journal.append(batch_id, batch_results)
+                pending.popleft()
+                batch_results = []
+    return journal
@@ -0,0 +1,193 @@
+'''
+Module contains the following classes:
+
+1. Endpoint -- One TweeboParser API server (replica).
+2. EndpointPool -- Spreads requests across a number of Endpoints.
+'''
+
+import itertools
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class Endpoint(object):
+    '''
+    A TweeboParser API server that requests can be sent to.
+
+    Attributes:
+
+    1. hostname -- The IP address of the server.
+    2. port -- The Port that the server is attached to.
+    3. url -- The URL to send requests to.
+    4. in_flight -- Number of requests currently waiting on the server.
+    5. healthy -- False if the last request to the server failed to connect.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, hostname: str, port: int) -> None:
+        '''
+        :param hostname: The IP address of the server.
+        :param port: The Port that the server is attached to.
+        '''
+        self.hostname = hostname
+        self.port = port
+        self.url = f'http://{hostname}:{port}'
+        self.in_flight = 0
+        self.healthy = True
+
+    def __repr__(self) -> str:
+        return f'Endpoint({self.hostname!r}, {self.port!r})'
+
+
+class EndpointPool(object):
+    '''
+    Chooses which server each request is sent to. Requests go to the
+    healthy server with the fewest requests in flight, ties are broken in a
+    round-robin order. Servers that fail to connect are marked unhealthy and
+    are not used again until a background thread finds, using the `probe`
+    function, that they are running again. If every server is unhealthy the
+    servers are still tried, so that a restarted server is used straight
+    away.
+
+    Attributes:
+
+    1. endpoints -- The servers requests are spread across.
+    2. probe -- Function given an Endpoint that returns True if the server
+       is running.
+    3. probe_interval -- Seconds between probing unhealthy servers.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, endpoints: Iterable[Tuple[str, int]],
+                 probe: Callable[[Endpoint], bool],
+                 probe_interval: float = 5.0) -> None:
+        '''
+        :param endpoints: (hostname, port) of each server.
+        :param probe: Function given an Endpoint that returns True if the
+                      server is running.
+        :param probe_interval: Seconds between probing unhealthy servers.
+        :raises ValueError: If no endpoints are given.
+        '''
+        self.endpoints = [Endpoint(hostname, port)
+                          for hostname, port in endpoints]
+        if not self.endpoints:
+            raise ValueError('At least one endpoint is required')
+        self.probe = probe
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for attribute in ['_lock', '_pid', '_order', '_probe_thread',
+                          '_stop_probing']:
+            del state[attribute]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def _reset(self) -> None:
+        # In flight counts and the probing thread belong to the process that
+        # created them, forked children start again from no requests.
+        self._pid = os.getpid()
+        self._order = itertools.count()
+        self._probe_thread = None
+        self._stop_probing = threading.Event()
+        for endpoint in self.endpoints:
+            endpoint.in_flight = 0
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            self._reset()
+
+    def acquire(self, exclude: Iterable[Endpoint] = ()
+                ) -> Optional[Endpoint]:
+        '''
+        :param exclude: Endpoints that should not be chosen e.g. ones that
+                        have already failed for this request.
+        :return: The endpoint to send the next request to, its in flight
+                 count is incremented and has to be decremented using
+                 :py:meth:`release`. None if every endpoint is excluded.
+        '''
+        with self._lock:
+            self._check_pid()
+            candidates = [endpoint for endpoint in self.endpoints
+                          if endpoint not in exclude]
+            if not candidates:
+                return None
+            healthy = [endpoint for endpoint in candidates
+                       if endpoint.healthy]
+            candidates = healthy or candidates
+            # Rotating the candidates before taking the minimum spreads
+            # requests evenly between equally loaded endpoints.
+            start = next(self._order) % len(candidates)
+            candidates = candidates[start:] + candidates[:start]
+            endpoint = min(candidates, key=lambda endpoint: endpoint.in_flight)
+            endpoint.in_flight += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint, healthy: bool = True) -> None:
+        '''
+        :param endpoint: Endpoint returned by :py:meth:`acquire` whose
+                         request has finished.
+        :param healthy: Whether the request managed to connect to the server.
+                        If False the endpoint is marked as unhealthy and is
+                        probed in the background until it is running again.
+        '''
+        with self._lock:
+            self._check_pid()
+            endpoint.in_flight = max(0, endpoint.in_flight - 1)
+            endpoint.healthy = healthy
+            if not healthy and len(self.endpoints) > 1:
+                self._start_probing()
+
+    def _start_probing(self) -> None:
+        if self._probe_thread is not None and self._probe_thread.is_alive():
+            return
+        self._probe_thread = threading.Thread(target=self._probe_unhealthy,
+                                              args=(self._stop_probing,),
+                                              name='tweebo-endpoint-probe',
+                                              daemon=True)
+        self._probe_thread.start()
+
+    def _probe_unhealthy(self, stop_probing: threading.Event) -> None:
+        while not stop_probing.wait(self.probe_interval):
+            with self._lock:
+                unhealthy = [endpoint for endpoint in self.endpoints
+                             if not endpoint.healthy]
+                if not unhealthy:
+                    return
+            for endpoint in unhealthy:
+                try:
+                    running = self.probe(endpoint)
+                except Exception:
+                    running = False
+                if running:
+                    with self._lock:
+                        endpoint.healthy = True
+
+    def healthy_endpoints(self) -> List[Endpoint]:
+        '''
+        :return: The endpoints that are currently thought to be running.
+        '''
+        with self._lock:
+            return [endpoint for endpoint in self.endpoints
+                    if endpoint.healthy]
+
+    def close(self) -> None:
+        '''
+        Stops probing unhealthy endpoints.
+        '''
+        with self._lock:
+            self._stop_probing.set()
+            self._stop_probing = threading.Event()
+            self._probe_thread = None
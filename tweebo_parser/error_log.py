@@ -0,0 +1,173 @@
+'''
+Module contains the following class:
+
+1. ErrorLog -- Writes error text to a rotating log file from a background
+   thread.
+'''
+
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from logging.handlers import RotatingFileHandler
+import os
+from pathlib import Path
+import queue
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Union
+
+
+class _DroppingQueueHandler(QueueHandler):
+    '''
+    Drops records when the queue is full rather than blocking or raising.
+    '''
+
+    def __init__(self, record_queue: queue.Queue) -> None:
+        super().__init__(record_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class _BlockingStopQueueListener(QueueListener):
+    '''
+    Waits for room on a full queue for the stop marker, rather than raising
+    queue.Full, so that the listener can always be stopped.
+    '''
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class ErrorLog(object):
+    '''
+    Writes error text, such as responses that could not be decoded, to a
+    log file without blocking the thread that logs it: the text is put on a
+    queue and written to the file by a background thread. The file is
+    rotated once it reaches `max_bytes`, keeping `backup_count` old files.
+
+    By default each process writes to its own file,
+    `tweebo_log.<process id>` within the temp directory, so that processes
+    never write over or truncate each other's logs. A `{pid}` within a
+    given path is replaced with the process id. After a fork the child
+    starts its own background thread, writing to the path of its own pid.
+
+    If the queue is full, because errors are logged faster than they can be
+    written, the text is dropped and counted within `dropped`.
+
+    Attributes:
+
+    1. path -- Path of the log file, may contain `{pid}`.
+    2. max_bytes -- Size at which the log file is rotated, 0 to never
+       rotate.
+    3. backup_count -- Number of rotated log files to keep.
+    4. queue_size -- Maximum number of texts waiting to be written.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 max_bytes: int = 10 * 2 ** 20, backup_count: int = 3,
+                 queue_size: int = 10000) -> None:
+        '''
+        :param path: Path of the log file, `{pid}` is replaced with the
+                     process id. Default `tweebo_log.{pid}` within the temp
+                     directory.
+        :param max_bytes: Size at which the log file is rotated, 0 to never
+                          rotate.
+        :param backup_count: Number of rotated log files to keep.
+        :param queue_size: Maximum number of texts waiting to be written.
+        '''
+        if path is None:
+            path = Path(tempfile.gettempdir(), 'tweebo_log.{pid}')
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for attribute in ['_lock', '_handler', '_listener', '_pid']:
+            del state[attribute]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._handler = None
+        self._listener = None
+        self._pid = os.getpid()
+
+    @property
+    def filename(self) -> str:
+        '''
+        :return: Path of the log file of the current process.
+        '''
+        return self.path.replace('{pid}', str(os.getpid()))
+
+    @property
+    def dropped(self) -> int:
+        '''
+        :return: Number of texts dropped, within the current process,
+                 because the queue was full.
+        '''
+        if self._handler is None or self._pid != os.getpid():
+            return 0
+        return self._handler.dropped
+
+    def _get_handler(self) -> _DroppingQueueHandler:
+        '''
+        :return: The handler that puts records on the queue, starting the
+                 background thread the first time this is called within
+                 a process.
+        '''
+        with self._lock:
+            if self._pid != os.getpid():
+                # The background thread of the parent process does not
+                # exist within the child.
+                self._reset()
+            if self._handler is None:
+                file_handler = RotatingFileHandler(
+                    self.filename, maxBytes=self.max_bytes,
+                    backupCount=self.backup_count, encoding='utf-8',
+                    delay=True)
+                record_queue = queue.Queue(self.queue_size)
+                self._listener = _BlockingStopQueueListener(record_queue,
+                                                            file_handler)
+                self._listener.start()
+                self._handler = _DroppingQueueHandler(record_queue)
+            return self._handler
+
+    def write(self, text: str) -> None:
+        '''
+        Queues the text to be written to the log file, returns without
+        waiting for it to be written.
+
+        :param text: Text to log.
+        '''
+        record = logging.makeLogRecord({'msg': text, 'levelno': logging.ERROR,
+                                        'levelname': 'ERROR'})
+        self._get_handler().handle(record)
+
+    def close(self) -> None:
+        '''
+        Waits for the queued texts to be written and closes the log file,
+        including when the queue is full. The log can still be written to
+        afterwards, which starts a new background thread.
+        '''
+        with self._lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+                for handler in self._listener.handlers:
+                    handler.close()
+            self._reset()
@@ -0,0 +1,281 @@
+'''
+A stand-in for the TweeboParser API server, for testing and benchmarking
+the client without the Docker image. It can be run from the command line:
+
+    python -m tweebo_parser.fake_server --port 8000 --latency 0.01
+
+Module contains the following class and functions:
+
+1. FakeServer -- Serves the TweeboParser API protocol from a thread.
+2. synthetic_conll -- Creates a CoNLL parse of any text.
+3. main -- Runs a FakeServer from the command line.
+'''
+
+import argparse
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import random
+from socketserver import ThreadingMixIn
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from tweebo_parser.conll import conll_to_stanford
+
+
+def synthetic_conll(text: str) -> str:
+    '''
+    :param text: Text to parse.
+    :return: A CoNLL formated string with one token per whitespace
+             separated word of the text, each tagged as a noun (`N`) and
+             attached to the token before it, the first token being the
+             root. An empty string if the text has no words.
+    '''
+    rows = []
+    for index, word in enumerate(text.split(), 1):
+        rows.append(f'{index}\t{word}\t_\tN\tN\t_\t{index - 1}\t_\t_\t_')
+    return '\n'.join(rows)
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self) -> None:
+        super().setup()
+        fake_server = self.server.fake_server
+        with fake_server._lock:
+            fake_server.connections += 1
+        # Responses are written as several small writes, without this Nagle's
+        # algorithm delays them waiting on the client's delayed ACK.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        status, response = self.server.fake_server._respond(body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+
+class FakeServer(object):
+    '''
+    Serves the same protocol as the TweeboParser API server: a POST of the
+    json `{"texts": [...], "output_type": "conll" or "stanford"}` is
+    responded to with a json list of one CoNLL string or Stanford styled
+    dict per text. Texts within `fixtures` are responded to with their
+    recorded CoNLL parse and all others with :py:func:`synthetic_conll`.
+
+    Latency, limited server threads and failures can be added to measure
+    and test the client against a slow or unreliable server:
+
+    1. Each request takes `latency` seconds plus `token_latency` seconds for
+       every token of its texts.
+    2. At most `threads` requests are processed at the same time, the rest
+       wait, as with the `--threads` flag of the Docker image.
+    3. A `failure_rate` fraction of requests are responded to with the
+       `failure_status` status code.
+    4. A `garble_rate` fraction of requests are responded to with json that
+       has been cut short and cannot be decoded.
+
+    Attributes:
+
+    1. hostname -- Hostname the server listens on.
+    2. port -- Port the server listens on, assigned when started if 0.
+    3. latency -- Seconds each request takes.
+    4. token_latency -- Extra seconds each request takes per token.
+    5. threads -- Maximum requests processed at the same time, None for no
+       limit.
+    6. failure_rate -- Fraction of requests that fail.
+    7. failure_status -- Status code of failed requests.
+    8. garble_rate -- Fraction of requests responded to with invalid json.
+    9. fixtures -- Dictionary of text to its CoNLL parse.
+    10. requests -- Number of requests received.
+    11. texts -- Number of texts received.
+    12. connections -- Number of connections accepted.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, hostname: str = '0.0.0.0', port: int = 8000,
+                 latency: float = 0.0, token_latency: float = 0.0,
+                 threads: Optional[int] = None, failure_rate: float = 0.0,
+                 failure_status: int = 503, garble_rate: float = 0.0,
+                 fixtures: Optional[Dict[str, str]] = None,
+                 seed: Optional[int] = None) -> None:
+        '''
+        :param hostname: Hostname to listen on.
+        :param port: Port to listen on, 0 for any free port.
+        :param latency: Seconds each request takes.
+        :param token_latency: Extra seconds each request takes per token.
+        :param threads: Maximum requests processed at the same time, None
+                        for no limit.
+        :param failure_rate: Fraction of requests that fail.
+        :param failure_status: Status code of failed requests.
+        :param garble_rate: Fraction of requests responded to with invalid
+                            json.
+        :param fixtures: Dictionary of text to its CoNLL parse.
+        :param seed: Seed of the random failures.
+        :raises ValueError: If threads is less than 1.
+        '''
+        if threads is not None and threads < 1:
+            raise ValueError(f'threads has to be at least 1: {threads}')
+        self.hostname = hostname
+        self.port = port
+        self.latency = latency
+        self.token_latency = token_latency
+        self.threads = threads
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.garble_rate = garble_rate
+        self.fixtures = fixtures or {}
+        self.requests = 0
+        self.texts = 0
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._slots = None
+        if threads is not None:
+            self._slots = threading.BoundedSemaphore(threads)
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> 'FakeServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        '''
+        Starts the server within a daemon thread.
+
+        :raises OSError: If the port cannot be listened on.
+        '''
+        server = _ThreadingHTTPServer((self.hostname, self.port), _Handler)
+        server.fake_server = self
+        self.port = server.server_address[1]
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        '''
+        Stops the server, closing the socket it listens on.
+        '''
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def _parse(self, texts: List[str], output_type: str) -> List[Any]:
+        conll = []
+        for text in texts:
+            if text in self.fixtures:
+                conll.append(self.fixtures[text])
+            else:
+                conll.append(synthetic_conll(text))
+        if output_type == 'stanford':
+            return [conll_to_stanford(parse, index)
+                    for index, parse in enumerate(conll)]
+        return conll
+
+    def _respond(self, body: bytes) -> Tuple[int, bytes]:
+        '''
+        :param body: Body of the POST request.
+        :return: The status code and body of the response.
+        '''
+        try:
+            data = json.loads(body.decode('utf-8'))
+            texts = data['texts']
+            output_type = data['output_type']
+            if not isinstance(texts, list) or \
+               not all(isinstance(text, str) for text in texts):
+                raise TypeError('texts has to be a list of strings')
+        except (ValueError, KeyError, TypeError) as error:
+            return 500, json.dumps({'error': str(error)}).encode()
+
+        with self._lock:
+            self.requests += 1
+            self.texts += len(texts)
+            fail = self._random.random() < self.failure_rate
+            garble = self._random.random() < self.garble_rate
+        if self._slots is not None:
+            self._slots.acquire()
+        try:
+            delay = self.latency
+            if self.token_latency:
+                num_tokens = sum(len(text.split()) for text in texts)
+                delay += self.token_latency * num_tokens
+            if delay:
+                time.sleep(delay)
+            if fail:
+                error = {'error': 'Injected failure'}
+                return self.failure_status, json.dumps(error).encode()
+            response = json.dumps(self._parse(texts, output_type)).encode()
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+        if garble:
+            response = response[:len(response) // 2]
+        return 200, response
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    '''
+    :param argv: Command line arguments, default sys.argv[1:]
+    '''
+    parser = argparse.ArgumentParser(
+        description='Stand-in for the TweeboParser API server.')
+    parser.add_argument('--hostname', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds each request takes')
+    parser.add_argument('--token-latency', type=float, default=0.0,
+                        help='Extra seconds each request takes per token')
+    parser.add_argument('--threads', type=int,
+                        help='Maximum requests processed at the same time')
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--failure-status', type=int, default=503)
+    parser.add_argument('--garble-rate', type=float, default=0.0)
+    parser.add_argument('--fixtures',
+                        help='json file of a dictionary of text to its '
+                             'CoNLL parse')
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    fixtures = None
+    if args.fixtures:
+        with open(args.fixtures, 'r', encoding='utf-8') as fixtures_file:
+            fixtures = json.load(fixtures_file)
+    server = FakeServer(args.hostname, args.port, args.latency,
+                        args.token_latency, args.threads, args.failure_rate,
+                        args.failure_status, args.garble_rate, fixtures,
+                        args.seed)
+    server.start()
+    print(f'Serving on {server.hostname}:{server.port}', flush=True)
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
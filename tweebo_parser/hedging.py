@@ -0,0 +1,155 @@
+'''
+Module contains the following class:
+
+1. HedgePolicy -- Decides when a slow request is sent again to another
+   server.
+'''
+
+from collections import deque
+import threading
+from typing import Any, Dict, Optional
+
+
+class HedgePolicy(object):
+    '''
+    Decides when to hedge a request: if the server has not responded within
+    the `percentile` of recent response times, a duplicate of the request is
+    sent to another server and whichever responds first is used. This stops
+    one stalled server holding up a whole call.
+
+    Hedges are limited by a budget so that they add at most `budget_ratio`
+    extra requests: each request adds `budget_ratio` to the budget, up to
+    `budget_size`, and each hedge takes 1 from it. The budget starts empty.
+
+    Attributes:
+
+    1. percentile -- Percentile (0-100) of the recent response times after
+       which a request is hedged.
+    2. min_delay -- Minimum seconds to wait before hedging.
+    3. budget_ratio -- Hedges added to the budget for each request.
+    4. budget_size -- Maximum number of hedges that can be saved up.
+    5. window -- Number of recent response times kept.
+    6. min_samples -- Number of response times needed before hedging.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, percentile: float = 95.0, min_delay: float = 0.005,
+                 budget_ratio: float = 0.05, budget_size: float = 10.0,
+                 window: int = 200, min_samples: int = 20) -> None:
+        '''
+        :param percentile: Percentile (0-100) of the recent response times
+                           after which a request is hedged.
+        :param min_delay: Minimum seconds to wait before hedging.
+        :param budget_ratio: Hedges added to the budget for each request,
+                             the maximum fraction of extra requests.
+        :param budget_size: Maximum number of hedges that can be saved up.
+        :param window: Number of recent response times kept.
+        :param min_samples: Number of response times needed before hedging.
+        :raises ValueError: If percentile is not between 0 and 100, or
+                            window or min_samples are less than 1.
+        '''
+        if not 0 <= percentile <= 100:
+            raise ValueError('percentile has to be between 0 and 100: '
+                             f'{percentile}')
+        if window < 1 or min_samples < 1:
+            raise ValueError('window and min_samples have to be at least 1: '
+                             f'{window}, {min_samples}')
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.budget_ratio = budget_ratio
+        self.budget_size = budget_size
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._budget = 0.0
+        self.reset_stats()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        '''
+        Records that a request (not a hedge) is about to be sent.
+        '''
+        with self._lock:
+            self.requests += 1
+            self._budget = min(self.budget_size,
+                               self._budget + self.budget_ratio)
+
+    def record_latency(self, latency: float) -> None:
+        '''
+        :param latency: Seconds a successful request took.
+        '''
+        with self._lock:
+            self._latencies.append(latency)
+
+    def delay(self) -> Optional[float]:
+        '''
+        :return: Seconds to wait for a response before hedging, None if not
+                 enough response times have been recorded.
+        '''
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        index = round(self.percentile / 100 * (len(latencies) - 1))
+        return max(self.min_delay, latencies[index])
+
+    def try_hedge(self) -> bool:
+        '''
+        :return: True if the budget allows a hedge, which is taken from the
+                 budget.
+        '''
+        with self._lock:
+            if self._budget < 1:
+                self.budget_exhausted += 1
+                return False
+            self._budget -= 1
+            self.hedges += 1
+            return True
+
+    def record_hedge_win(self) -> None:
+        '''
+        Records that a hedge responded before the request it duplicated.
+        '''
+        with self._lock:
+            self.hedge_wins += 1
+
+    def reset_stats(self) -> None:
+        '''
+        Sets all of the recorded statistics back to 0.
+        '''
+        with self._lock:
+            self.requests = 0
+            self.hedges = 0
+            self.hedge_wins = 0
+            self.budget_exhausted = 0
+
+    def stats(self) -> Dict[str, Any]:
+        '''
+        :return: Dictionary of:
+
+                 1. requests -- Number of requests made, not including
+                    hedges.
+                 2. hedges -- Number of hedges sent.
+                 3. hedge_wins -- Number of hedges that responded first.
+                 4. budget_exhausted -- Number of slow requests not hedged
+                    because the budget was empty.
+                 5. budget -- Number of hedges left in the budget.
+                 6. delay -- Current seconds to wait before hedging, None
+                    if not enough response times have been recorded.
+        '''
+        delay = self.delay()
+        with self._lock:
+            return {'requests': self.requests, 'hedges': self.hedges,
+                    'hedge_wins': self.hedge_wins,
+                    'budget_exhausted': self.budget_exhausted,
+                    'budget': self._budget, 'delay': delay}
@@ -0,0 +1,267 @@
+'''
+Module contains the following classes:
+
+1. RequestEvent -- Timings and sizes of one request sent to the server.
+2. MetricsCollector -- Instrument that aggregates request events into
+   metrics that can be exported as a dictionary or in the Prometheus text
+   format.
+'''
+
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Upper bounds of the histogram buckets.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+PHASES = ('serialise', 'wait', 'receive', 'decode')
+
+
+class RequestEvent(object):
+    '''
+    Describes one attempt at sending a request to the server, which
+    instruments given to :py:class:`tweebo_parser.API` are called with once
+    the attempt has finished. The time of a request is split into phases:
+
+    1. serialise -- json encoding the texts, only on the first attempt.
+    2. wait -- From sending the request until the headers of the response
+       are received, this includes the time the server spent parsing.
+    3. receive -- Reading the body of the response.
+    4. decode -- json decoding the body of the response.
+
+    Attributes:
+
+    1. output_type -- Either `conll` or `stanford`.
+    2. num_texts -- Number of texts within the request.
+    3. request_bytes -- Size of the request body.
+    4. response_bytes -- Size of the response body, 0 if there was no
+       response.
+    5. serialise_time, wait_time, receive_time, decode_time -- Seconds
+       spent in each phase.
+    6. retry -- Number of times the request had been retried before this
+       attempt.
+    7. error -- Name of the class of the error the attempt failed with, None
+       if it succeeded.
+    8. url -- URL of the server the request was sent to, None if no server
+       could be connected to.
+
+    .. automethod:: __init__
+    '''
+
+    __slots__ = ('output_type', 'num_texts', 'request_bytes',
+                 'response_bytes', 'serialise_time', 'wait_time',
+                 'receive_time', 'decode_time', 'retry', 'error', 'url')
+
+    def __init__(self, output_type: str, num_texts: int, request_bytes: int,
+                 response_bytes: int = 0, serialise_time: float = 0.0,
+                 wait_time: float = 0.0, receive_time: float = 0.0,
+                 decode_time: float = 0.0, retry: int = 0,
+                 error: Optional[str] = None,
+                 url: Optional[str] = None) -> None:
+        self.output_type = output_type
+        self.num_texts = num_texts
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+        self.serialise_time = serialise_time
+        self.wait_time = wait_time
+        self.receive_time = receive_time
+        self.decode_time = decode_time
+        self.retry = retry
+        self.error = error
+        self.url = url
+
+    @property
+    def total_time(self) -> float:
+        '''
+        :return: Seconds spent in all of the phases.
+        '''
+        return self.serialise_time + self.wait_time + self.receive_time + \
+            self.decode_time
+
+    def __repr__(self) -> str:
+        attributes = ', '.join(f'{name}={getattr(self, name)!r}'
+                               for name in self.__slots__)
+        return f'RequestEvent({attributes})'
+
+
+class _Histogram(object):
+
+    def __init__(self, buckets: Iterable[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = []
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        buckets.append((float('inf'), self.count))
+        return {'count': self.count, 'sum': self.sum, 'buckets': buckets}
+
+
+class MetricsCollector(object):
+    '''
+    An instrument that aggregates the :py:class:`RequestEvent` of every
+    request, safe to share between threads and API instances. When pickled,
+    e.g. with an API sent to a multiprocessing worker, each process collects
+    its own metrics:
+
+    .. code-block:: python
+
+        metrics = MetricsCollector()
+        api = API(instruments=[metrics])
+        api.parse_conll(texts)
+        print(metrics.snapshot()['phase_seconds']['wait']['sum'])
+        print(metrics.to_prometheus())
+
+    Attributes:
+
+    1. namespace -- Prefix of the Prometheus metric names.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, namespace: str = 'tweebo_parser') -> None:
+        '''
+        :param namespace: Prefix of the Prometheus metric names.
+        '''
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        '''
+        Records a request event.
+
+        :param event: The finished attempt at a request.
+        '''
+        with self._lock:
+            self._attempts += 1
+            if event.retry:
+                self._retries += 1
+            if event.error is None:
+                self._texts += event.num_texts
+                self._batch_size.observe(event.num_texts)
+            else:
+                self._errors[event.error] = \
+                    self._errors.get(event.error, 0) + 1
+            self._request_bytes.observe(event.request_bytes)
+            self._response_bytes.observe(event.response_bytes)
+            for phase in PHASES:
+                self._phases[phase].observe(getattr(event, f'{phase}_time'))
+
+    def reset(self) -> None:
+        '''
+        Sets all of the metrics back to 0.
+        '''
+        with self._lock:
+            self._attempts = 0
+            self._retries = 0
+            self._texts = 0
+            self._errors = {}
+            self._batch_size = _Histogram(BATCH_SIZE_BUCKETS)
+            self._request_bytes = _Histogram(BYTES_BUCKETS)
+            self._response_bytes = _Histogram(BYTES_BUCKETS)
+            self._phases = {phase: _Histogram(LATENCY_BUCKETS)
+                            for phase in PHASES}
+
+    def snapshot(self) -> Dict[str, Any]:
+        '''
+        :return: Dictionary of:
+
+                 1. requests -- Number of attempts, including retries.
+                 2. retries -- Number of attempts that were retries.
+                 3. texts -- Number of texts parsed by successful attempts.
+                 4. errors -- Number of failed attempts by the name of the
+                    error class.
+                 5. batch_size -- Histogram of the texts per successful
+                    attempt.
+                 6. request_bytes, response_bytes -- Histograms of the body
+                    sizes.
+                 7. phase_seconds -- Dictionary of phase name
+                    (`serialise`, `wait`, `receive` and `decode`) to a
+                    histogram of the seconds spent in the phase.
+
+                 Each histogram is a dictionary of the `count` and `sum` of
+                 the observed values and the `buckets`, a list of (upper
+                 bound, number of values less than or equal to the bound).
+        '''
+        with self._lock:
+            return {'requests': self._attempts, 'retries': self._retries,
+                    'texts': self._texts, 'errors': dict(self._errors),
+                    'batch_size': self._batch_size.snapshot(),
+                    'request_bytes': self._request_bytes.snapshot(),
+                    'response_bytes': self._response_bytes.snapshot(),
+                    'phase_seconds': {phase: histogram.snapshot()
+                                      for phase, histogram
+                                      in self._phases.items()}}
+
+    def to_prometheus(self) -> str:
+        '''
+        :return: The metrics in the Prometheus text exposition format.
+        '''
+        snapshot = self.snapshot()
+        name = self.namespace
+        lines = []
+
+        def counter(metric: str, help_text: str, value: Any,
+                    labels: str = '') -> None:
+            if f'# TYPE {name}_{metric} counter' not in lines:
+                lines.append(f'# HELP {name}_{metric} {help_text}')
+                lines.append(f'# TYPE {name}_{metric} counter')
+            lines.append(f'{name}_{metric}{labels} {value}')
+
+        def histogram(metric: str, help_text: str, values: Dict[str, Any],
+                      labels: Tuple[str, ...] = ()) -> None:
+            if f'# TYPE {name}_{metric} histogram' not in lines:
+                lines.append(f'# HELP {name}_{metric} {help_text}')
+                lines.append(f'# TYPE {name}_{metric} histogram')
+            for bound, count in values['buckets']:
+                bound = '+Inf' if bound == float('inf') else repr(bound)
+                bucket_labels = ','.join(list(labels) + [f'le="{bound}"'])
+                lines.append(f'{name}_{metric}_bucket{{{bucket_labels}}} '
+                             f'{count}')
+            label_text = f'{{{",".join(labels)}}}' if labels else ''
+            lines.append(f'{name}_{metric}_sum{label_text} {values["sum"]}')
+            lines.append(f'{name}_{metric}_count{label_text} '
+                         f'{values["count"]}')
+
+        counter('requests_total', 'Requests sent including retries.',
+                snapshot['requests'])
+        counter('retries_total', 'Requests that were retries.',
+                snapshot['retries'])
+        counter('texts_total', 'Texts parsed.', snapshot['texts'])
+        for error, count in sorted(snapshot['errors'].items()):
+            counter('errors_total', 'Failed requests by error class.', count,
+                    f'{{error="{error}"}}')
+        histogram('batch_size', 'Texts per successful request.',
+                  snapshot['batch_size'])
+        histogram('request_bytes', 'Size of the request bodies.',
+                  snapshot['request_bytes'])
+        histogram('response_bytes', 'Size of the response bodies.',
+                  snapshot['response_bytes'])
+        for phase, values in snapshot['phase_seconds'].items():
+            histogram('phase_seconds', 'Seconds spent in each phase of a '
+                      'request.', values, [f'phase="{phase}"'])
+        return '\n'.join(lines) + '\n'
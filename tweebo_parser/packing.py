@@ -0,0 +1,61 @@
+'''
+Module contains the following functions:
+
+1. text_cost -- Estimate of the work the server does to parse a text.
+2. pack_batches -- Splits texts into batches of similar total cost.
+'''
+
+import heapq
+import math
+from typing import Callable, List, Optional, Sequence
+
+
+def text_cost(text: str) -> int:
+    '''
+    :param text: Text to be parsed.
+    :return: The number of whitespace separated tokens, which the time the
+             server takes to parse the text grows with.
+    '''
+    return len(text.split())
+
+
+def pack_batches(texts: Sequence[str], batch_size: int,
+                 cost: Optional[Callable[[str], float]] = None
+                 ) -> List[List[int]]:
+    '''
+    Splits the texts into the fewest batches of at most `batch_size` texts,
+    such that the total cost of each batch is as even as possible. Texts
+    are assigned from the most to the least costly, each to the batch with
+    the lowest total cost so far that is not full. This stops one batch
+    getting several of the longest texts and being far slower than the
+    rest.
+
+    :param texts: Texts to split into batches.
+    :param batch_size: Maximum number of texts per batch.
+    :param cost: Function giving the cost of parsing a text. Default
+                 :py:func:`text_cost`
+    :return: The indexes of the texts within each batch, in ascending order
+             within each batch, and the batches ordered by their first
+             index.
+    :raises ValueError: If batch_size is less than 1.
+    '''
+    if batch_size < 1:
+        raise ValueError(f'batch_size has to be at least 1: {batch_size}')
+    if cost is None:
+        cost = text_cost
+    num_batches = math.ceil(len(texts) / batch_size)
+    batches = [[] for _ in range(num_batches)]
+    # (total cost, batch index) of the batches that are not full.
+    totals = [(0, batch_index) for batch_index in range(num_batches)]
+    costs = [cost(text) for text in texts]
+    for index in sorted(range(len(texts)), key=costs.__getitem__,
+                        reverse=True):
+        total, batch_index = heapq.heappop(totals)
+        batch = batches[batch_index]
+        batch.append(index)
+        if len(batch) < batch_size:
+            heapq.heappush(totals, (total + costs[index], batch_index))
+    for batch in batches:
+        batch.sort()
+    batches.sort()
+    return batches
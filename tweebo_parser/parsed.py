@@ -0,0 +1,258 @@
+'''
+Module contains the following classes:
+
+1. Vocabulary -- Maps strings, such as POS tags, to small integer ids.
+2. ParsedTweet -- Compact representation of one parsed tweet.
+
+And the following module attributes:
+
+1. POS_VOCAB -- Vocabulary of the POS tags of every ParsedTweet.
+2. DEP_VOCAB -- Vocabulary of the dependency labels of every ParsedTweet.
+'''
+
+from array import array
+from collections.abc import Mapping
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+
+class Vocabulary(object):
+    '''
+    Assigns each distinct string an integer id, so that the same string is
+    only stored once however many times it is used.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, strings: Iterable[str] = ()) -> None:
+        '''
+        :param strings: Strings to add to the vocabulary, in id order.
+        '''
+        self._strings = []
+        self._ids = {}
+        self._lock = threading.Lock()
+        for string in strings:
+            self.add(string)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __contains__(self, string: str) -> bool:
+        return string in self._ids
+
+    def add(self, string: str) -> int:
+        '''
+        :param string: String to add.
+        :return: The id of the string.
+        '''
+        try:
+            return self._ids[string]
+        except KeyError:
+            with self._lock:
+                if string not in self._ids:
+                    self._ids[string] = len(self._strings)
+                    self._strings.append(string)
+                return self._ids[string]
+
+    def lookup(self, string_id: int) -> str:
+        '''
+        :param string_id: Id returned by :py:meth:`add`.
+        :return: The string the id belongs to.
+        '''
+        return self._strings[string_id]
+
+    @property
+    def strings(self) -> List[str]:
+        '''
+        :return: All of the strings in id order.
+        '''
+        return list(self._strings)
+
+
+# The POS tags of the TweeboParser (Twitter POS tagger) tag set and the
+# dependency labels used in the Stanford styled output.
+POS_VOCAB = Vocabulary(['N', 'O', 'S', '^', 'Z', 'L', 'M', 'V', 'A', 'R',
+                        '!', 'D', 'P', '&', 'T', 'X', 'Y', '#', '@', '~',
+                        'U', 'E', '$', ',', 'G'])
+DEP_VOCAB = Vocabulary(['_', 'MWE', 'ROOT'])
+
+
+class ParsedTweet(Mapping):
+    '''
+    A parsed tweet stored as parallel arrays: the words, POS tag ids, head
+    (governor) indexes and dependency label ids of each token. POS tags and
+    dependency labels are stored as ids into POS_VOCAB and DEP_VOCAB.
+
+    It is a read only Mapping with the same keys and values as the Stanford
+    styled dicts returned by :py:meth:`tweebo_parser.API.parse_stanford`,
+    the `tokens` and `basicDependencies` lists of dicts are created each
+    time they are accessed. Thus a ParsedTweet is equal to the Stanford
+    styled dict of the same parse.
+
+    Attributes:
+
+    1. index -- The index of the text within the texts that were parsed.
+    2. words -- The tokens of the tweet.
+    3. pos_ids -- POS_VOCAB id of each token's POS tag.
+    4. heads -- Index of each token's head, 0 for ROOT and -1 for tokens
+       that are not attached to any other token.
+    5. dep_ids -- DEP_VOCAB id of each token's dependency label.
+
+    .. automethod:: __init__
+    '''
+
+    __slots__ = ('index', 'words', 'pos_ids', 'heads', 'dep_ids')
+
+    _KEYS = ('index', 'tokens', 'basicDependencies')
+
+    def __init__(self, index: int, words: Tuple[str, ...],
+                 pos: Iterable[str], heads: Iterable[int],
+                 deps: Iterable[str]) -> None:
+        '''
+        :param index: The index of the text within the texts that were
+                      parsed.
+        :param words: The tokens of the tweet.
+        :param pos: The POS tag of each token.
+        :param heads: Index of each token's head, 0 for ROOT and -1 for
+                      unattached tokens.
+        :param deps: The dependency label of each token e.g. `_`, `MWE` or
+                     `ROOT`.
+        '''
+        self.index = index
+        self.words = tuple(words)
+        self.pos_ids = array('H', [POS_VOCAB.add(tag) for tag in pos])
+        self.heads = array('i', heads)
+        self.dep_ids = array('H', [DEP_VOCAB.add(label) for label in deps])
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Vocabulary ids are only valid within this process, thus the tags
+        # and labels are pickled as strings.
+        return (self.__class__, (self.index, self.words, self.pos,
+                                 list(self.heads), self.deps))
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'index':
+            return self.index
+        if key == 'tokens':
+            return self.tokens
+        if key == 'basicDependencies':
+            return self.basic_dependencies
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return f'ParsedTweet(index={self.index!r}, words={self.words!r})'
+
+    @property
+    def num_tokens(self) -> int:
+        '''
+        :return: Number of tokens in the tweet.
+        '''
+        return len(self.words)
+
+    @property
+    def pos(self) -> List[str]:
+        '''
+        :return: The POS tag of each token.
+        '''
+        return [POS_VOCAB.lookup(pos_id) for pos_id in self.pos_ids]
+
+    @property
+    def deps(self) -> List[str]:
+        '''
+        :return: The dependency label of each token.
+        '''
+        return [DEP_VOCAB.lookup(dep_id) for dep_id in self.dep_ids]
+
+    @property
+    def tokens(self) -> List[Dict[str, Union[str, int]]]:
+        '''
+        :return: The `tokens` list of the Stanford styled output.
+        '''
+        return [{'index': index, 'word': word, 'originalText': word,
+                 'pos': pos}
+                for index, (word, pos) in enumerate(zip(self.words,
+                                                        self.pos), 1)]
+
+    @property
+    def basic_dependencies(self) -> List[Dict[str, Union[str, int]]]:
+        '''
+        :return: The `basicDependencies` list of the Stanford styled output.
+        '''
+        words = self.words
+        dependencies = []
+        for dependent, (head, dep) in enumerate(zip(self.heads,
+                                                    self.deps), 1):
+            if head == 0:
+                governor_gloss = 'ROOT'
+            elif head == -1:
+                governor_gloss = '$$NAN$$'
+            else:
+                governor_gloss = words[head - 1]
+            dependencies.append({'dep': dep, 'governor': head,
+                                 'governorGloss': governor_gloss,
+                                 'dependent': dependent,
+                                 'dependentGloss': words[dependent - 1]})
+        return dependencies
+
+    def to_stanford(self) -> Dict[str, Any]:
+        '''
+        :return: The Stanford styled dict, as returned by
+                 :py:meth:`tweebo_parser.API.parse_stanford`
+        '''
+        return {'index': self.index, 'tokens': self.tokens,
+                'basicDependencies': self.basic_dependencies}
+
+    def to_conll(self) -> str:
+        '''
+        :return: The CoNLL formated string, as returned by
+                 :py:meth:`tweebo_parser.API.parse_conll`
+        '''
+        lines = []
+        for index, (word, pos, head, dep) in enumerate(
+                zip(self.words, self.pos, self.heads, self.deps), 1):
+            label = 'MWE' if dep == 'MWE' else '_'
+            lines.append(f'{index}\t{word}\t_\t{pos}\t{pos}\t_\t{head}\t'
+                         f'{label}\t_\t_')
+        return '\n'.join(lines)
+
+    @classmethod
+    def from_stanford(cls, stanford: Dict[str, Any]) -> 'ParsedTweet':
+        '''
+        :param stanford: A Stanford styled dict as returned by
+                         :py:meth:`tweebo_parser.API.parse_stanford`
+        :return: The dict as a ParsedTweet.
+        '''
+        tokens = stanford['tokens']
+        dependencies = sorted(stanford['basicDependencies'],
+                              key=lambda dependency: dependency['dependent'])
+        return cls(stanford['index'],
+                   [token['word'] for token in tokens],
+                   [token['pos'] for token in tokens],
+                   [dependency['governor'] for dependency in dependencies],
+                   [dependency['dep'] for dependency in dependencies])
+
+    @classmethod
+    def from_conll(cls, conll: str, index: int) -> 'ParsedTweet':
+        '''
+        :param conll: A CoNLL formated string as returned by
+                      :py:meth:`tweebo_parser.API.parse_conll`
+        :param index: The index of the text within the texts that were
+                      parsed.
+        :return: The CoNLL string as a ParsedTweet.
+        '''
+        words, pos, heads, deps = [], [], [], []
+        if conll:
+            for line in conll.split('\n'):
+                columns = line.split('\t')
+                head = int(columns[6])
+                words.append(columns[1])
+                pos.append(columns[3])
+                heads.append(head)
+                deps.append('ROOT' if head == 0 else columns[7])
+        return cls(index, words, pos, heads, deps)
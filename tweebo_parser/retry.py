@@ -0,0 +1,189 @@
+'''
+Module contains the following class:
+
+1. RetryPolicy -- Decides if and when a failed request is sent again.
+'''
+
+import json
+import random
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from tweebo_parser.transport import status_errors
+
+
+class RetryPolicy(object):
+    '''
+    Decides whether a failed request should be sent again and how long to
+    wait before doing so. Requests are retried when:
+
+    1. The response cannot be json decoded, up to `max_retries` times.
+    2. The server responds with one of the `retry_statuses` status codes,
+       up to `max_retries` times.
+    3. The server cannot be connected to, raising
+       :py:class:`tweebo_parser.ServerError`, up to `connection_retries`
+       times.
+
+    The wait before the nth retry is a random fraction (`jitter`) of
+    `backoff * 2 ** n` seconds, capped at `max_backoff` seconds, so that
+    clients do not retry in step with each other. On top of the per request
+    limits all requests sharing the policy share a retry budget: each
+    request adds `budget_ratio` to the budget, up to `budget_size`, and each
+    retry takes 1 from it. When the budget is empty failed requests are not
+    retried, which stops an overloaded server being flooded with retries.
+
+    The number of requests, retries and the bytes sent and received by
+    failed attempts are recorded, see :py:meth:`stats`.
+
+    Attributes:
+
+    1. max_retries -- Maximum retries of a request after json decoding
+       errors or error status codes.
+    2. connection_retries -- Maximum retries of a request after connection
+       errors.
+    3. retry_statuses -- HTTP status codes that are retried.
+    4. backoff -- Seconds to wait before the first retry.
+    5. max_backoff -- Maximum seconds to wait before a retry.
+    6. jitter -- Fraction of the wait that is random, 0 for no randomness
+       and 1 for a wait between 0 and the full wait.
+    7. budget_size -- Maximum number of retries that can be saved up.
+    8. budget_ratio -- Retries added to the budget for each request.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, max_retries: int = 10, connection_retries: int = 2,
+                 retry_statuses: Iterable[int] = (502, 503, 504),
+                 backoff: float = 0.05, max_backoff: float = 5.0,
+                 jitter: float = 1.0, budget_size: float = 100.0,
+                 budget_ratio: float = 0.2) -> None:
+        '''
+        :param max_retries: Maximum retries of a request after json decoding
+                            errors or error status codes.
+        :param connection_retries: Maximum retries of a request after
+                                   connection errors.
+        :param retry_statuses: HTTP status codes that are retried.
+        :param backoff: Seconds to wait before the first retry, doubled for
+                        each following retry.
+        :param max_backoff: Maximum seconds to wait before a retry.
+        :param jitter: Fraction of the wait that is random.
+        :param budget_size: Maximum number of retries that can be saved up.
+        :param budget_ratio: Retries added to the budget for each request.
+        :raises ValueError: If jitter is not between 0 and 1.
+        '''
+        if not 0 <= jitter <= 1:
+            raise ValueError(f'jitter has to be between 0 and 1: {jitter}')
+        self.max_retries = max_retries
+        self.connection_retries = connection_retries
+        self.retry_statuses = frozenset(retry_statuses)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget_size = budget_size
+        self.budget_ratio = budget_ratio
+        self._lock = threading.Lock()
+        self._budget = budget_size
+        self.reset_stats()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _max_retries(self, error: Exception) -> int:
+        '''
+        :param error: The error the request failed with.
+        :return: The maximum number of retries for the error, 0 if the error
+                 is never retried.
+        '''
+        # Imported here as the api module imports this module.
+        from tweebo_parser.api import ServerError
+
+        if isinstance(error, ServerError):
+            return self.connection_retries
+        if isinstance(error, json.JSONDecodeError):
+            return self.max_retries
+        if isinstance(error, status_errors()):
+            response = error.response
+            if response is not None and \
+               response.status_code in self.retry_statuses:
+                return self.max_retries
+        return 0
+
+    def record_request(self) -> None:
+        '''
+        Records that a request (not a retry) is about to be sent.
+        '''
+        with self._lock:
+            self.requests += 1
+            self._budget = min(self.budget_size,
+                               self._budget + self.budget_ratio)
+
+    def retry_delay(self, error: Exception, retries: int,
+                    wasted_bytes: int = 0) -> Optional[float]:
+        '''
+        Records a failed attempt of a request and decides whether to retry
+        it.
+
+        :param error: The error the attempt failed with.
+        :param retries: The number of times the request has already been
+                        retried.
+        :param wasted_bytes: Bytes sent and received by the failed attempt.
+        :return: Seconds to wait before retrying, None if the request
+                 should not be retried.
+        '''
+        error_name = type(error).__name__
+        with self._lock:
+            self.failures[error_name] = self.failures.get(error_name, 0) + 1
+            self.wasted_bytes += wasted_bytes
+            if retries >= self._max_retries(error):
+                return None
+            if self._budget < 1:
+                self.budget_exhausted += 1
+                return None
+            self._budget -= 1
+            self.retries += 1
+        delay = min(self.max_backoff, self.backoff * 2 ** retries)
+        delay -= delay * self.jitter * random.random()
+        with self._lock:
+            self.retry_wait += delay
+        return delay
+
+    def reset_stats(self) -> None:
+        '''
+        Sets all of the recorded statistics back to 0.
+        '''
+        with self._lock:
+            self.requests = 0
+            self.retries = 0
+            self.failures = {}
+            self.wasted_bytes = 0
+            self.budget_exhausted = 0
+            self.retry_wait = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        '''
+        :return: Dictionary of:
+
+                 1. requests -- Number of requests made, not including
+                    retries.
+                 2. retries -- Number of retries made.
+                 3. failures -- Number of failed attempts by the name of the
+                    error class.
+                 4. wasted_bytes -- Bytes sent and received by failed
+                    attempts.
+                 5. budget_exhausted -- Number of failed attempts not
+                    retried because the retry budget was empty.
+                 6. budget -- Number of retries left in the budget.
+                 7. retry_wait -- Total seconds spent waiting to retry.
+        '''
+        with self._lock:
+            return {'requests': self.requests, 'retries': self.retries,
+                    'failures': dict(self.failures),
+                    'wasted_bytes': self.wasted_bytes,
+                    'budget_exhausted': self.budget_exhausted,
+                    'budget': self._budget, 'retry_wait': self.retry_wait}
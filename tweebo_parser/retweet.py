@@ -0,0 +1,79 @@
+'''
+Module contains the following functions:
+
+1. split_retweet -- Splits the `RT @handle:` prefix off a retweet.
+2. splice_retweet -- Adds the tokens of the `RT @handle:` prefix to the
+   parse of a retweet's body, giving the parse of the whole retweet.
+'''
+
+import re
+from typing import Any, Dict, Optional, Tuple, Union
+
+# `RT`, the handle of the user retweeted and `:` at the start of a text,
+# followed by a non empty body. TweeboParser tokenises the prefix as the
+# three tokens `RT`, `@handle` and `:`.
+_RETWEET_PREFIX = re.compile(r'RT[ \t]+(@[A-Za-z0-9_]+)[ \t]*:[ \t]+(?=\S)')
+_PREFIX_LENGTH = 3
+
+
+def split_retweet(text: str) -> Optional[Tuple[str, str]]:
+    '''
+    :param text: Text to be parsed.
+    :return: The handle (including the `@`) and the body of the text if it
+             starts with `RT @handle:`, else None.
+    '''
+    match = _RETWEET_PREFIX.match(text)
+    if match is None:
+        return None
+    return match.group(1), text[match.end():]
+
+
+def splice_retweet(result: Union[str, Dict[str, Any]], handle: str
+                   ) -> Union[str, Dict[str, Any]]:
+    '''
+    TweeboParser tags the `RT @handle:` prefix of a retweet as `~`, `@` and
+    `~` and does not attach it to any token (head -1), thus the parse of a
+    retweet is the parse of its body after the prefix tokens, with the
+    index and head of every body token shifted by three.
+
+    :param result: CoNLL formated string or Stanford styled dict of the
+                   parse of the retweet's body, as returned by
+                   :py:meth:`tweebo_parser.API.parse_conll` and
+                   :py:meth:`tweebo_parser.API.parse_stanford`
+    :param handle: Handle of the user retweeted, including the `@`.
+    :return: The parse of the whole retweet in the same format as the
+             result, the result itself is not changed.
+    '''
+    prefix = [('RT', '~'), (handle, '@'), (':', '~')]
+    if isinstance(result, str):
+        lines = [f'{index}\t{word}\t_\t{pos}\t{pos}\t_\t-1\t_\t_\t_'
+                 for index, (word, pos) in enumerate(prefix, 1)]
+        for line in result.split('\n') if result else []:
+            columns = line.split('\t')
+            columns[0] = str(int(columns[0]) + _PREFIX_LENGTH)
+            head = int(columns[6])
+            if head > 0:
+                columns[6] = str(head + _PREFIX_LENGTH)
+            lines.append('\t'.join(columns))
+        return '\n'.join(lines)
+
+    tokens = [{'index': index, 'word': word, 'originalText': word,
+               'pos': pos}
+              for index, (word, pos) in enumerate(prefix, 1)]
+    dependencies = [{'dep': '_', 'governor': -1, 'governorGloss': '$$NAN$$',
+                     'dependent': index, 'dependentGloss': word}
+                    for index, (word, _) in enumerate(prefix, 1)]
+    for token in result['tokens']:
+        token = dict(token)
+        token['index'] += _PREFIX_LENGTH
+        tokens.append(token)
+    for dependency in result['basicDependencies']:
+        dependency = dict(dependency)
+        dependency['dependent'] += _PREFIX_LENGTH
+        if dependency['governor'] > 0:
+            dependency['governor'] += _PREFIX_LENGTH
+        dependencies.append(dependency)
+    spliced = dict(result)
+    spliced['tokens'] = tokens
+    spliced['basicDependencies'] = dependencies
+    return spliced
@@ -0,0 +1,530 @@
+'''
+Module contains the following classes:
+
+1. StoredTweet -- Zero copy view of one tweet within a ResultStore.
+2. ResultStore -- Append only binary store of parse results, read through
+   `mmap`, with random access by tweet id.
+'''
+
+from array import array
+import bisect
+from collections.abc import Mapping
+import itertools
+import json
+import mmap
+import os
+from pathlib import Path
+import sys
+from typing import (Any, Dict, Iterable, Iterator, List, Optional, Tuple,
+                    Union)
+
+from tweebo_parser.parsed import DEP_VOCAB, ParsedTweet, POS_VOCAB
+from tweebo_parser.utils import append_synced, Lookup, truncate_synced
+
+_VERSION = 1
+# Bytes of an index entry: the tweet id (int64) and the offset of the end
+# of the tweet's record (uint64).
+_ENTRY_SIZE = 16
+# Heads are stored as int16 and the POS tag and label codes as uint8.
+_MAX_TOKENS = 2 ** 15 - 1
+_MAX_CODES = 2 ** 8
+
+
+class StoredTweet(object):
+    '''
+    A tweet within a :py:class:`ResultStore`. The arrays are memoryviews of
+    the store's memory map, thus creating a StoredTweet copies nothing and
+    the words, tags and labels are only decoded when they are accessed.
+
+    Attributes:
+
+    1. tweet_id -- Id the tweet was stored with.
+    2. num_tokens -- Number of tokens in the tweet.
+    3. heads -- int16 memoryview of the index of each token's head, 0 for
+       ROOT and -1 for tokens that are not attached to any other token.
+    4. pos_ids -- uint8 memoryview of the store's code for each token's POS
+       tag, see :py:attr:`ResultStore.pos_vocab`.
+    5. dep_ids -- uint8 memoryview of the store's code for each token's
+       dependency label, see :py:attr:`ResultStore.dep_vocab`.
+
+    .. automethod:: __init__
+    '''
+
+    __slots__ = ('tweet_id', 'num_tokens', 'heads', 'pos_ids', 'dep_ids',
+                 '_word_ends', '_words', '_store')
+
+    def __init__(self, store: 'ResultStore', tweet_id: int,
+                 record: memoryview) -> None:
+        '''
+        :param store: Store the record belongs to.
+        :param tweet_id: Id of the tweet.
+        :param record: The bytes of the tweet's record, which are laid out
+                       as the number of tokens (uint32), the end offset of
+                       each word within the words (uint32), the heads
+                       (int16), the POS tag codes (uint8), the label codes
+                       (uint8) and then the UTF-8 encoded words.
+        '''
+        num_tokens = record[:4].cast('I')[0]
+        heads_start = 4 + 4 * num_tokens
+        pos_start = heads_start + 2 * num_tokens
+        dep_start = pos_start + num_tokens
+        words_start = dep_start + num_tokens
+        self._store = store
+        self.tweet_id = tweet_id
+        self.num_tokens = num_tokens
+        self._word_ends = record[4:heads_start].cast('I')
+        self.heads = record[heads_start:pos_start].cast('h')
+        self.pos_ids = record[pos_start:dep_start]
+        self.dep_ids = record[dep_start:words_start]
+        self._words = record[words_start:]
+
+    def __len__(self) -> int:
+        return self.num_tokens
+
+    def __repr__(self) -> str:
+        return f'StoredTweet(tweet_id={self.tweet_id!r}, ' \
+               f'words={self.words!r})'
+
+    def word(self, index: int) -> str:
+        '''
+        :param index: Index of the token, starting at 0.
+        :return: The token, only this word is decoded.
+        '''
+        start = self._word_ends[index - 1] if index else 0
+        return str(self._words[start: self._word_ends[index]], 'utf-8')
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        '''
+        :return: The tokens of the tweet.
+        '''
+        if not self.num_tokens:
+            return ()
+        words = str(self._words[:self._word_ends[-1]], 'utf-8')
+        if len(words) != self._word_ends[-1]:
+            # Not all ASCII, thus the byte offsets are not string offsets.
+            return tuple(map(self.word, range(self.num_tokens)))
+        starts = itertools.chain((0,), self._word_ends)
+        return tuple(words[start: end]
+                     for start, end in zip(starts, self._word_ends))
+
+    @property
+    def pos(self) -> List[str]:
+        '''
+        :return: The POS tag of each token.
+        '''
+        return list(map(self._store.pos_vocab.__getitem__, self.pos_ids))
+
+    @property
+    def deps(self) -> List[str]:
+        '''
+        :return: The dependency label of each token.
+        '''
+        return list(map(self._store.dep_vocab.__getitem__, self.dep_ids))
+
+    def to_parsed(self) -> ParsedTweet:
+        '''
+        :return: A copy of the tweet as a ParsedTweet, whose index is the
+                 tweet id.
+        '''
+        return ParsedTweet(self.tweet_id, self.words, self.pos, self.heads,
+                           self.deps)
+
+    def to_stanford(self) -> Dict[str, Any]:
+        '''
+        :return: The Stanford styled dict, as returned by
+                 :py:meth:`tweebo_parser.API.parse_stanford`, whose index is
+                 the tweet id.
+        '''
+        return self.to_parsed().to_stanford()
+
+    def to_conll(self) -> str:
+        '''
+        :return: The CoNLL formated string, as returned by
+                 :py:meth:`tweebo_parser.API.parse_conll`
+        '''
+        return self.to_parsed().to_conll()
+
+
+class ResultStore(object):
+    '''
+    Stores parse results in a directory containing:
+
+    1. `store.json` -- The format version, byte order and the POS tags and
+       dependency labels that the codes within the records refer to.
+    2. `tweets.bin` -- One record per tweet of packed arrays, see
+       :py:class:`StoredTweet`. Records start at multiples of 4 bytes.
+    3. `index.bin` -- One 16 byte entry per tweet of the tweet id (int64)
+       and the offset of the end of its record within `tweets.bin`
+       (uint64), in the order the tweets were added.
+
+    `tweets.bin` is read through `mmap`, thus looking up a tweet only reads
+    the pages of its record and a scan reads the file sequentially. Tweets
+    are looked up by binary search of the ids while they are added in
+    ascending order, as Twitter ids are when tweets are stored as they are
+    collected, else by a dict built on the first look up. If an id is added
+    more than once the last one added is returned.
+
+    As with :py:class:`tweebo_parser.corpus.CorpusJournal` each call to
+    :py:meth:`extend` is flushed to disk before the index entries of its
+    tweets are, thus a tweet is only stored once it is within the index.
+    When a store is opened for appending anything after the last complete
+    index entry and its record is removed.
+
+    Example::
+
+        with ResultStore('tweets_store') as store:
+            for ids, texts in batches:
+                store.extend(api.parse_conll(texts), ids=ids)
+        with ResultStore('tweets_store', readonly=True) as store:
+            print(store[tweet_id].words)
+
+    Attributes:
+
+    1. directory -- The directory of the store.
+    2. readonly -- Whether the store can only be read.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, directory: Union[str, Path],
+                 readonly: bool = False) -> None:
+        '''
+        :param directory: Directory of the store, created if it does not
+                          exist and the store is not readonly.
+        :param readonly: Whether to only read the store. A readonly store
+                         never changes the files, so can be opened while
+                         another process appends to them, and
+                         :py:meth:`refresh` reads the tweets added since it
+                         was opened.
+        :raises FileNotFoundError: If the store is readonly and does not
+                                   exist.
+        :raises ValueError: If the store was written with a different
+                            version of the format or byte order.
+        '''
+        self.directory = Path(directory)
+        self.readonly = readonly
+        self._settings_fp = self.directory / 'store.json'
+        self._tweets_fp = self.directory / 'tweets.bin'
+        self._index_fp = self.directory / 'index.bin'
+        if readonly:
+            if not self._settings_fp.is_file():
+                raise FileNotFoundError(f'No store at {self.directory}')
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for path in [self._tweets_fp, self._index_fp]:
+                path.touch()
+        self._pos_vocab = []
+        self._dep_vocab = []
+        # Number of POS tags and labels within store.json.
+        self._saved_codes = 0
+        self._load_settings()
+        # Store code of each POS_VOCAB and DEP_VOCAB id.
+        self._pos_codes = Lookup(
+            lambda pos_id: self._code(self._pos_vocab,
+                                      POS_VOCAB.lookup(pos_id)))
+        self._dep_codes = Lookup(
+            lambda dep_id: self._code(self._dep_vocab,
+                                      DEP_VOCAB.lookup(dep_id)))
+        self._ids = array('q')
+        self._ends = array('Q')
+        self._sorted = True
+        self._next_id = 0
+        # Tweet id to position, only used once ids are out of order.
+        self._positions = None
+        self._size = 0
+        self._map = None
+        self._map_size = 0
+        self._tweets_file = None
+        self._index_file = None
+        if readonly:
+            self.refresh()
+        else:
+            self._recover()
+            self._tweets_file = self._tweets_fp.open('ab')
+            self._index_file = self._index_fp.open('ab')
+
+    def __enter__(self) -> 'ResultStore':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, tweet_id: int) -> bool:
+        try:
+            self._position(tweet_id)
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, tweet_id: int) -> StoredTweet:
+        '''
+        :param tweet_id: Id of a stored tweet.
+        :return: The tweet.
+        :raises KeyError: If the tweet is not within the store.
+        '''
+        return self._tweet(self._position(tweet_id), self._memory())
+
+    def __iter__(self) -> Iterator[StoredTweet]:
+        '''
+        :return: A generator of the tweets in the order they were added.
+        '''
+        return self.scan()
+
+    @property
+    def pos_vocab(self) -> List[str]:
+        '''
+        :return: The POS tag of each code used within the store.
+        '''
+        return self._pos_vocab
+
+    @property
+    def dep_vocab(self) -> List[str]:
+        '''
+        :return: The dependency label of each code used within the store.
+        '''
+        return self._dep_vocab
+
+    def get(self, tweet_id: int,
+            default: Optional[Any] = None) -> Optional[StoredTweet]:
+        '''
+        :param tweet_id: Id of a tweet.
+        :param default: Returned if the tweet is not within the store.
+        :return: The tweet or default.
+        '''
+        try:
+            return self[tweet_id]
+        except KeyError:
+            return default
+
+    def tweet_ids(self) -> List[int]:
+        '''
+        :return: The id of each tweet in the order they were added.
+        '''
+        return self._ids.tolist()
+
+    def scan(self, start: int = 0,
+             stop: Optional[int] = None) -> Iterator[StoredTweet]:
+        '''
+        :param start: Position, in the order the tweets were added, of the
+                      first tweet.
+        :param stop: Position after the last tweet. Default the end.
+        :return: A generator of the tweets in the order they were added.
+        '''
+        memory = self._memory()
+        stop = len(self._ids) if stop is None else min(stop, len(self._ids))
+        for position in range(start, stop):
+            yield self._tweet(position, memory)
+
+    def extend(self, results: Iterable[Union[str, Dict[str, Any],
+                                             ParsedTweet]],
+               ids: Optional[Iterable[int]] = None) -> None:
+        '''
+        Adds the results to the store, once this returns they have been
+        flushed to disk.
+
+        :param results: Results of :py:meth:`tweebo_parser.API.parse_conll`,
+                        :py:meth:`tweebo_parser.API.parse_stanford` or
+                        :py:meth:`tweebo_parser.API.parse_tweets`
+        :param ids: Integer id of the tweet of each result e.g. the Twitter
+                    ids. Default counting up from one more than the
+                    largest id within the store.
+        :raises ValueError: If the store is readonly, the number of ids and
+                            results differ, a tweet has more than 32767
+                            tokens or the store would have more than 256 POS
+                            tags or dependency labels.
+        :raises TypeError: If a result is not a CoNLL string, Stanford
+                           styled dict or ParsedTweet.
+        '''
+        if self.readonly:
+            raise ValueError(f'The store at {self.directory} is readonly')
+        results = list(results)
+        if ids is None:
+            ids = range(self._next_id, self._next_id + len(results))
+        ids = array('q', ids)
+        if len(ids) != len(results):
+            raise ValueError(f'{len(ids)} ids were given for {len(results)}'
+                             ' results')
+        records = bytearray()
+        ends = array('Q')
+        for index, result in enumerate(results):
+            records += self._encode(_as_parsed(result, index))
+            ends.append(self._size + len(records))
+        if not results:
+            return
+        # New tags and labels have to be saved before the records that use
+        # their codes, including those added by an earlier call that failed
+        # part way through encoding.
+        if len(self._pos_vocab) + len(self._dep_vocab) != self._saved_codes:
+            self._save_settings()
+        append_synced(self._tweets_file, bytes(records))
+        entries = array('q', bytes(_ENTRY_SIZE * len(ids)))
+        entries[0::2] = ids
+        entries[1::2] = array('q', ends.tobytes())
+        append_synced(self._index_file, entries.tobytes())
+        self._add_entries(ids, ends)
+
+    def refresh(self) -> None:
+        '''
+        Reads the tweets that another process has added to the store since
+        it was opened or last refreshed.
+        '''
+        self._load_settings()
+        tweets_size = self._tweets_fp.stat().st_size
+        with self._index_fp.open('rb') as index_file:
+            index_file.seek(len(self._ids) * _ENTRY_SIZE)
+            data = index_file.read()
+        entries = array('q')
+        entries.frombytes(data[:len(data) - len(data) % _ENTRY_SIZE])
+        ids = entries[0::2]
+        ends = array('Q', entries[1::2].tobytes())
+        # Entries whose record is not yet completely within tweets.bin are
+        # read by a later refresh.
+        complete = bisect.bisect_right(ends, tweets_size)
+        self._add_entries(ids[:complete], ends[:complete])
+
+    def close(self) -> None:
+        '''
+        Closes the store's files. StoredTweets that are still referenced
+        keep the memory map open until they are deleted.
+        '''
+        for file in [self._tweets_file, self._index_file]:
+            if file is not None:
+                file.close()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+            self._map = None
+
+    def _load_settings(self) -> None:
+        if not self._settings_fp.is_file():
+            self._pos_vocab.extend(POS_VOCAB.strings)
+            self._dep_vocab.extend(DEP_VOCAB.strings)
+            self._save_settings()
+            return
+        with self._settings_fp.open('r') as settings_file:
+            settings = json.load(settings_file)
+        if settings['version'] != _VERSION or \
+                settings['byteorder'] != sys.byteorder:
+            raise ValueError(f'The store at {self.directory} has version '
+                             f'{settings["version"]} and byte order '
+                             f'{settings["byteorder"]}, only version '
+                             f'{_VERSION} with byte order {sys.byteorder} '
+                             'can be read')
+        # Codes are only ever added, thus the lists are extended in place.
+        self._pos_vocab.extend(settings['pos'][len(self._pos_vocab):])
+        self._dep_vocab.extend(settings['dep'][len(self._dep_vocab):])
+        self._saved_codes = len(self._pos_vocab) + len(self._dep_vocab)
+
+    def _save_settings(self) -> None:
+        settings = {'version': _VERSION, 'byteorder': sys.byteorder,
+                    'pos': self._pos_vocab, 'dep': self._dep_vocab}
+        # Written to a temporary file and renamed, so that readers never
+        # see a partly written file.
+        temp_fp = self._settings_fp.with_suffix('.json.tmp')
+        with temp_fp.open('wb') as temp_file:
+            append_synced(temp_file, json.dumps(settings).encode())
+        os.replace(str(temp_fp), str(self._settings_fp))
+        self._saved_codes = len(self._pos_vocab) + len(self._dep_vocab)
+
+    def _recover(self) -> None:
+        '''
+        Reads the index, and removes any tweets that were not completely
+        written to either the index or tweets file.
+        '''
+        self.refresh()
+        truncate_synced(self._index_fp, len(self._ids) * _ENTRY_SIZE)
+        if self._tweets_fp.stat().st_size > self._size:
+            truncate_synced(self._tweets_fp, self._size)
+
+    def _add_entries(self, ids: array, ends: array) -> None:
+        if not ids:
+            return
+        if self._sorted and (self._ids and ids[0] < self._ids[-1] or
+                             any(map(int.__gt__, ids, ids[1:]))):
+            self._sorted = False
+        if self._positions is not None:
+            self._positions.update(zip(ids, range(len(self._ids),
+                                                  len(self._ids) + len(ids))))
+        self._next_id = max(self._next_id, max(ids) + 1)
+        self._ids.extend(ids)
+        self._ends.extend(ends)
+        self._size = self._ends[-1]
+
+    def _position(self, tweet_id: int) -> int:
+        if self._sorted:
+            position = bisect.bisect_right(self._ids, tweet_id) - 1
+            if position >= 0 and self._ids[position] == tweet_id:
+                return position
+            raise KeyError(tweet_id)
+        if self._positions is None:
+            self._positions = {tweet_id: position for position, tweet_id
+                               in enumerate(self._ids)}
+        return self._positions[tweet_id]
+
+    def _memory(self) -> memoryview:
+        '''
+        :return: A view of tweets.bin up to the end of the last stored
+                 record, mapping the file again if it has grown.
+        '''
+        if self._map_size != self._size:
+            # The previous map is left to be closed once the StoredTweets
+            # that view it are deleted.
+            self._map = None
+            if self._size:
+                with self._tweets_fp.open('rb') as tweets_file:
+                    self._map = mmap.mmap(tweets_file.fileno(), self._size,
+                                          access=mmap.ACCESS_READ)
+            self._map_size = self._size
+        if self._map is None:
+            return memoryview(b'')
+        return memoryview(self._map)
+
+    def _tweet(self, position: int, memory: memoryview) -> StoredTweet:
+        start = self._ends[position - 1] if position else 0
+        return StoredTweet(self, self._ids[position],
+                           memory[start: self._ends[position]])
+
+    def _code(self, vocab: List[str], string: str) -> int:
+        try:
+            return vocab.index(string)
+        except ValueError:
+            pass
+        if len(vocab) == _MAX_CODES:
+            raise ValueError(f'The store at {self.directory} already has '
+                             f'{_MAX_CODES} POS tags or dependency labels, '
+                             f'cannot add: {string}')
+        vocab.append(string)
+        return len(vocab) - 1
+
+    def _encode(self, tweet: ParsedTweet) -> bytes:
+        num_tokens = tweet.num_tokens
+        if num_tokens > _MAX_TOKENS:
+            raise ValueError(f'Tweets can have at most {_MAX_TOKENS} tokens '
+                             f'not: {num_tokens}')
+        words = [word.encode('utf-8') for word in tweet.words]
+        word_ends = array('I', itertools.accumulate(map(len, words)))
+        record = b''.join([
+            array('I', [num_tokens]).tobytes(), word_ends.tobytes(),
+            array('h', tweet.heads).tobytes(),
+            bytes(map(self._pos_codes.__getitem__, tweet.pos_ids)),
+            bytes(map(self._dep_codes.__getitem__, tweet.dep_ids)),
+            b''.join(words)])
+        return record + bytes(-len(record) % 4)
+
+
+def _as_parsed(result: Union[str, Dict[str, Any], ParsedTweet],
+               index: int) -> ParsedTweet:
+    if isinstance(result, ParsedTweet):
+        return result
+    if isinstance(result, str):
+        return ParsedTweet.from_conll(result, index)
+    if isinstance(result, Mapping):
+        return ParsedTweet.from_stanford(result)
+    raise TypeError('Results have to be CoNLL strings, Stanford styled '
+                    f'dicts or ParsedTweets not: {type(result)}')
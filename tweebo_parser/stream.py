@@ -0,0 +1,143 @@
+'''
+Module contains the following functions:
+
+1. json_loads -- The json decoding function of a json backend.
+2. iter_json_array -- Decodes a json array element by element from chunks
+   of bytes as they arrive.
+'''
+
+import json
+import re
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+# A complete json string, written so that the regex engine does not
+# backtrack over each character.
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+# Everything up to the next bracket within an element, including any
+# strings. Stops before a string that has not been completely received.
+_INNER = re.compile(rb'[^"\[\]{}]*(?:' + _STRING + rb'[^"\[\]{}]*)*')
+# As _INNER for the top level of the array, also stopping before commas
+# which separate its elements.
+_TOP = re.compile(rb'[^"\[\]{},]*(?:' + _STRING + rb'[^"\[\]{},]*)*')
+_WHITESPACE = b' \t\n\r'
+
+
+def json_loads(backend: str = 'json') -> Callable[[bytes], Any]:
+    '''
+    :param backend: `json` for the standard library, `orjson` for the far
+                    faster `orjson` package, or `auto` for orjson if it is
+                    installed else json.
+    :return: Function that decodes json bytes.
+    :raises ImportError: If the `orjson` backend is asked for and it is not
+                         installed.
+    :raises ValueError: If the backend is not known.
+    '''
+    if backend not in ('json', 'orjson', 'auto'):
+        raise ValueError('backend has to be `json`, `orjson` or `auto` not: '
+                         f'{backend}')
+    if backend == 'json':
+        return json.loads
+    # Imported here so that importing this package does not import it.
+    try:
+        import orjson
+    except ImportError:
+        if backend == 'orjson':
+            raise ImportError('The orjson backend requires orjson, install '
+                              'it using: pip install orjson') from None
+        return json.loads
+    return orjson.loads
+
+
+def iter_json_array(chunks: Iterable[bytes],
+                    loads: Optional[Callable[[bytes], Any]] = None
+                    ) -> Iterator[Any]:
+    '''
+    Decodes a json array, yielding each element as soon as all of its bytes
+    have arrived. Only the bytes of the element being read are kept, thus
+    memory use depends on the size of the largest element rather than the
+    whole array.
+
+    The bytes are scanned only to find where each element ends, the element
+    itself is decoded by `loads`.
+
+    :param chunks: The bytes of the json array, split anywhere, e.g. from
+                   :py:meth:`requests.Response.iter_content`
+    :param loads: Function that decodes the bytes of one element. Default
+                  :py:func:`json.loads`
+    :return: A generator of the decoded elements.
+    :raises json.JSONDecodeError: If the bytes are not a json array, or
+                                  end before the array is closed.
+    '''
+    if loads is None:
+        loads = json.loads
+    buffer = bytearray()
+    # Position the scan has reached and the start of the current element.
+    position = start = 0
+    started = finished = False
+    # Nesting depth, 1 is the top level of the array.
+    depth = 0
+    num_elements = 0
+    for chunk in chunks:
+        if finished:
+            if chunk.strip(_WHITESPACE):
+                raise json.JSONDecodeError('Extra data after the array',
+                                           chunk.decode('utf-8', 'replace'),
+                                           0)
+            continue
+        buffer += chunk
+        if not started:
+            stripped = buffer.lstrip(_WHITESPACE)
+            if not stripped:
+                buffer.clear()
+                continue
+            if stripped[:1] != b'[':
+                raise json.JSONDecodeError('Expecting a json array',
+                                           stripped.decode('utf-8',
+                                                           'replace'), 0)
+            buffer = bytearray(stripped[1:])
+            started = True
+            depth = 1
+        buffer_length = len(buffer)
+        while True:
+            if depth == 1:
+                position = _TOP.match(buffer, position).end()
+            else:
+                position = _INNER.match(buffer, position).end()
+            if position == buffer_length:
+                break
+            character = buffer[position]
+            if character == 0x22:  # "
+                # The rest of the string has not been received yet.
+                break
+            position += 1
+            if character == 0x5b or character == 0x7b:  # [ {
+                depth += 1
+            elif character == 0x2c:  # ,
+                yield loads(bytes(buffer[start: position - 1]))
+                num_elements += 1
+                # Drop the bytes of the decoded element.
+                del buffer[:position]
+                buffer_length = len(buffer)
+                position = start = 0
+            elif depth > 1:  # ] }
+                depth -= 1
+            elif character == 0x5d:  # ]
+                element = buffer[start: position - 1]
+                if num_elements or element.strip(_WHITESPACE):
+                    yield loads(bytes(element))
+                rest = buffer[position:]
+                if rest.strip(_WHITESPACE):
+                    raise json.JSONDecodeError(
+                        'Extra data after the array',
+                        rest.decode('utf-8', 'replace'), 0)
+                finished = True
+                buffer = bytearray()
+                break
+            else:
+                raise json.JSONDecodeError('Expecting ] to close the array',
+                                           buffer.decode('utf-8', 'replace'),
+                                           position - 1)
+    if not finished:
+        raise json.JSONDecodeError('The json array was not closed',
+                                   buffer.decode('utf-8', 'replace'),
+                                   len(buffer))
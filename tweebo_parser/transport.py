@@ -0,0 +1,685 @@
+'''
+Module contains the following classes:
+
+1. Transport -- Interface that :py:class:`tweebo_parser.API` sends its
+   requests through.
+2. RequestsTransport -- Sends requests using the `requests` package.
+3. HTTPClientTransport -- Sends requests using the standard library's
+   :py:mod:`http.client` with persistent connections.
+4. Response -- The response returned by HTTPClientTransport.
+5. Cancellation -- Stops a request that is being sent from another thread.
+6. TransportError, ConnectionFailed, TransportTimeout, HTTPStatusError --
+   Errors raised by HTTPClientTransport.
+
+And the following functions:
+
+1. create_transport -- Creates a transport from its name.
+2. connection_errors, timeout_errors, status_errors -- The error classes of
+   every transport that has been loaded.
+
+`requests` is only imported once a RequestsTransport sends its first
+request, so that processes that never use it do not pay for importing it.
+'''
+
+import abc
+import datetime
+import http.client
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import urllib.parse
+
+
+class TransportError(IOError):
+    '''
+    Base class of the errors raised by
+    :py:class:`HTTPClientTransport`.
+    '''
+
+
+class ConnectionFailed(TransportError):
+    '''
+    Raised when the server cannot be connected to, or the connection fails
+    while the response is being read.
+    '''
+
+
+class TransportTimeout(ConnectionFailed):
+    '''
+    Raised when connecting to the server or reading the response times out.
+    '''
+
+
+class HTTPStatusError(TransportError):
+    '''
+    Raised by :py:meth:`Response.raise_for_status` when the server returns
+    an error status code.
+
+    Attributes:
+
+    1. response -- The :py:class:`Response` with the error status code.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, message: str,
+                 response: Optional['Response'] = None) -> None:
+        '''
+        :param message: Describes the status code and the URL.
+        :param response: The response with the error status code.
+        '''
+        super().__init__(message)
+        self.response = response
+
+
+def connection_errors() -> Tuple[type, ...]:
+    '''
+    :return: The error classes, of every transport that has been loaded,
+             raised when the server cannot be connected to or the
+             connection fails while the response is being read.
+    '''
+    errors = (ConnectionFailed,)
+    requests = sys.modules.get('requests')
+    if requests is not None:
+        errors += (requests.exceptions.ConnectionError,
+                   requests.exceptions.ChunkedEncodingError,
+                   requests.exceptions.Timeout,
+                   requests.exceptions.InvalidSchema)
+    return errors
+
+
+def timeout_errors() -> Tuple[type, ...]:
+    '''
+    :return: The error classes, of every transport that has been loaded,
+             raised when connecting or reading times out.
+    '''
+    errors = (TransportTimeout,)
+    requests = sys.modules.get('requests')
+    if requests is not None:
+        errors += (requests.exceptions.Timeout,)
+    return errors
+
+
+def status_errors() -> Tuple[type, ...]:
+    '''
+    :return: The error classes, of every transport that has been loaded,
+             raised when the server returns an error status code. Each has
+             the `response` as an attribute.
+    '''
+    errors = (HTTPStatusError,)
+    requests = sys.modules.get('requests')
+    if requests is not None:
+        errors += (requests.exceptions.HTTPError,)
+    return errors
+
+
+def _split_timeout(timeout: Any) -> Tuple[Optional[float], Optional[float]]:
+    '''
+    :param timeout: None, one number for both or a (connect, read) tuple.
+    :return: The (connect, read) timeout.
+    '''
+    if isinstance(timeout, tuple):
+        return timeout
+    return timeout, timeout
+
+
+class Cancellation(object):
+    '''
+    Stops a request that is being sent from another thread, by closing its
+    connection, or its response once the headers have been received. A
+    request stopped this way raises one of :py:func:`connection_errors`.
+
+    Attributes:
+
+    1. cancelled -- Whether :py:meth:`cancel` has been called.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self) -> None:
+        self.cancelled = False
+        self._lock = threading.Lock()
+        self._closers = []
+
+    def add(self, close: Callable[[], None]) -> None:
+        '''
+        :param close: Called once the request is cancelled, straight away
+                      if it already has been.
+        '''
+        with self._lock:
+            if not self.cancelled:
+                self._closers.append(close)
+                return
+        close()
+
+    def remove(self, close: Callable[[], None]) -> None:
+        '''
+        :param close: Function given to :py:meth:`add` that is no longer to
+                      be called, e.g. as the connection has been returned to
+                      the pool.
+        '''
+        with self._lock:
+            if close in self._closers:
+                self._closers.remove(close)
+
+    def cancel(self) -> None:
+        '''
+        Calls every function given to :py:meth:`add`.
+        '''
+        with self._lock:
+            self.cancelled = True
+            closers, self._closers = self._closers, []
+        for close in closers:
+            close()
+
+
+class Transport(abc.ABC):
+    '''
+    Sends the json encoded bodies of requests to the server. The responses
+    returned have the same interface as :py:class:`requests.Response`, of
+    which :py:class:`tweebo_parser.API` uses `status_code`, `url`,
+    `elapsed`, `content`, `text`, `json()`, `iter_content()`,
+    `raise_for_status()` and `close()`. Errors are raised as one of
+    :py:func:`connection_errors` or :py:func:`status_errors`.
+
+    Transports have to be safe to use from many threads at the same time,
+    and to pickle and to use after the process has been forked. Subclasses
+    that do not implement every method cannot be created.
+    '''
+
+    @abc.abstractmethod
+    def post(self, url: str, body: bytes, headers: Dict[str, str],
+             timeout: Any = None, stream: bool = False,
+             cancellation: Optional[Cancellation] = None) -> Any:
+        '''
+        :param url: URL of the server.
+        :param body: The encoded body of the request.
+        :param headers: Headers of the request.
+        :param timeout: None, seconds to wait to connect and for each read,
+                        or a (connect, read) tuple.
+        :param stream: Whether to return once the headers of the response
+                       have been received, leaving the body to be read.
+        :param cancellation: Stops the request when it is cancelled.
+        :return: The response from the server.
+        '''
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        '''
+        Closes all of the open connections.
+        '''
+
+
+class RequestsTransport(Transport):
+    '''
+    Sends requests using a :py:class:`requests.Session`, which keeps a pool
+    of connections to each server. `requests` is imported when the first
+    request is sent.
+
+    Attributes:
+
+    1. keep_alive -- Whether to re-use connections through the pool. If
+       False a new connection is made (and closed) for every request.
+    2. pool_maxsize -- Maximum number of connections kept open to each
+       server.
+    3. pool_idle_timeout -- Seconds the pool can be left unused before its
+       connections are closed and a new pool is created, None to never
+       close it.
+    4. pool_connections -- Number of servers to keep connections to.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, keep_alive: bool = True, pool_maxsize: int = 10,
+                 pool_idle_timeout: Optional[float] = 30.0,
+                 pool_connections: int = 10) -> None:
+        '''
+        :param keep_alive: Whether to keep connections open and re-use them
+                           between requests.
+        :param pool_maxsize: Maximum number of connections to keep open to
+                             each server.
+        :param pool_idle_timeout: Seconds the pool can be idle before it is
+                                  closed. None never closes an idle pool.
+        :param pool_connections: Number of servers to keep connections to.
+        '''
+        self.keep_alive = keep_alive
+        self.pool_maxsize = pool_maxsize
+        self.pool_idle_timeout = pool_idle_timeout
+        self.pool_connections = pool_connections
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for attribute in ['_lock', '_session', '_pid', '_last_used']:
+            del state[attribute]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._session = None
+        self._pid = os.getpid()
+        self._last_used = time.monotonic()
+
+    def _get_session(self) -> Any:
+        '''
+        :return: The :py:class:`requests.Session` to send requests through.
+                 A new session is created the first time this is called,
+                 after the process has been forked and when the current
+                 session has been idle for longer than
+                 self.pool_idle_timeout.
+        '''
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        with self._lock:
+            now = time.monotonic()
+            if self._pid != os.getpid():
+                # The connections were opened by the parent process and are
+                # shared with it, never use or close them within the child.
+                self._reset()
+            elif self._session is not None and \
+                    self.pool_idle_timeout is not None and \
+                    now - self._last_used > self.pool_idle_timeout:
+                self._session.close()
+                self._session = None
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                                      pool_maxsize=self.pool_maxsize)
+                session.mount('http://', adapter)
+                self._session = session
+            self._last_used = now
+            return self._session
+
+    def post(self, url: str, body: bytes, headers: Dict[str, str],
+             timeout: Any = None, stream: bool = False,
+             cancellation: Optional[Cancellation] = None) -> Any:
+        '''
+        See :py:meth:`Transport.post`. `requests` does not give access to
+        the connection before the headers of the response are received, so
+        a cancelled request stops only once they have been, when its
+        response is closed. Use a timeout, or
+        :py:class:`HTTPClientTransport`, to stop it sooner.
+
+        :return: A :py:class:`requests.Response`
+        '''
+        if self.keep_alive:
+            response = self._get_session().post(
+                url, data=body, headers=headers, stream=stream,
+                timeout=timeout)
+        else:
+            import requests
+
+            headers = dict(headers, Connection='close')
+            response = requests.post(url, data=body, headers=headers,
+                                     stream=stream, timeout=timeout)
+        if cancellation is not None:
+            cancellation.add(response.close)
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None and self._pid == os.getpid():
+                self._session.close()
+            self._reset()
+
+
+class Response(object):
+    '''
+    Response from the server sent through a
+    :py:class:`HTTPClientTransport`, with the parts of the interface of
+    :py:class:`requests.Response` that are used by
+    :py:class:`tweebo_parser.API`.
+
+    Attributes:
+
+    1. status_code -- HTTP status code of the response.
+    2. reason -- Reason phrase of the status code.
+    3. url -- URL the request was sent to.
+    4. elapsed -- :py:class:`datetime.timedelta` from sending the request
+       until the headers of the response were received.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, status_code: int, reason: str, url: str,
+                 elapsed: datetime.timedelta,
+                 raw: Optional[http.client.HTTPResponse] = None,
+                 release: Optional[Callable[[bool], None]] = None,
+                 content: Optional[bytes] = None) -> None:
+        '''
+        :param status_code: HTTP status code of the response.
+        :param reason: Reason phrase of the status code.
+        :param url: URL the request was sent to.
+        :param elapsed: Time until the headers of the response were
+                        received.
+        :param raw: The response whose body has not been read.
+        :param release: Called once with True if the whole body has been
+                        read, and the connection can be re-used, else with
+                        False.
+        :param content: The body of the response if it has already been
+                        read, in which case raw is not given.
+        '''
+        self.status_code = status_code
+        self.reason = reason
+        self.url = url
+        self.elapsed = elapsed
+        self._raw = raw
+        self._release = release
+        self._content = content
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        '''
+        :param chunk_size: Maximum bytes of each chunk.
+        :return: A generator of the body of the response, read from the
+                 connection as it is iterated if it has not been read yet.
+        :raises ConnectionFailed: If the connection fails while the body is
+                                  being read.
+        :raises RuntimeError: If the body has been partly read by another
+                              iteration.
+        '''
+        if self._content is not None:
+            for start in range(0, len(self._content), chunk_size):
+                yield self._content[start: start + chunk_size]
+            return
+        if self._raw is None:
+            raise RuntimeError('The body of the response has already been '
+                               'read or the response has been closed')
+        raw, self._raw = self._raw, None
+        try:
+            while True:
+                chunk = raw.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        except socket.timeout as error:
+            self._finish(False)
+            raise TransportTimeout(f'Timed out reading the response from '
+                                   f'{self.url}: {error}') from error
+        except (OSError, http.client.HTTPException) as error:
+            self._finish(False)
+            raise ConnectionFailed(f'Could not read the response from '
+                                   f'{self.url}: {error!r}') from error
+        except BaseException:
+            # E.g. the generator was closed before the body was read.
+            self._finish(False)
+            raise
+        self._finish(not raw.will_close)
+
+    def _finish(self, reusable: bool) -> None:
+        release, self._release = self._release, None
+        if release is not None:
+            release(reusable)
+
+    @property
+    def content(self) -> bytes:
+        '''
+        :return: The body of the response, read from the connection the
+                 first time it is used.
+        '''
+        if self._content is None:
+            self._content = b''.join(self.iter_content(65536))
+        return self._content
+
+    @property
+    def text(self) -> str:
+        '''
+        :return: The body of the response decoded as utf-8.
+        '''
+        return self.content.decode('utf-8', 'replace')
+
+    def json(self) -> Any:
+        '''
+        :return: The json decoded body of the response.
+        :raises json.JSONDecodeError: If the body is not valid json.
+        '''
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        '''
+        :raises HTTPStatusError: If the status code is an error (4xx or
+                                 5xx) code.
+        '''
+        if 400 <= self.status_code < 600:
+            kind = 'Client' if self.status_code < 500 else 'Server'
+            raise HTTPStatusError(f'{self.status_code} {kind} Error: '
+                                  f'{self.reason} for url: {self.url}',
+                                  response=self)
+
+    def close(self) -> None:
+        '''
+        Closes the connection if the body has not been completely read,
+        else does nothing.
+        '''
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+            self._finish(False)
+
+
+class HTTPClientTransport(Transport):
+    '''
+    Sends requests using :py:mod:`http.client` from the standard library,
+    with far less overhead per request than `requests`. Connections to each
+    server are kept open and re-used, a request that fails on a re-used
+    connection, because the server closed it while it was idle, is sent
+    again on a new connection.
+
+    Errors are raised as :py:class:`ConnectionFailed`,
+    :py:class:`TransportTimeout` and, from
+    :py:meth:`Response.raise_for_status`, :py:class:`HTTPStatusError`.
+
+    Attributes:
+
+    1. keep_alive -- Whether to re-use connections. If False a new
+       connection is made (and closed) for every request.
+    2. pool_maxsize -- Maximum number of idle connections kept open to each
+       server.
+    3. pool_idle_timeout -- Seconds a connection can be left unused before
+       it is closed, None to never close it.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, keep_alive: bool = True, pool_maxsize: int = 10,
+                 pool_idle_timeout: Optional[float] = 30.0) -> None:
+        '''
+        :param keep_alive: Whether to keep connections open and re-use them
+                           between requests.
+        :param pool_maxsize: Maximum number of idle connections to keep
+                             open to each server.
+        :param pool_idle_timeout: Seconds a connection can be idle before it
+                                  is closed. None never closes an idle
+                                  connection.
+        '''
+        self.keep_alive = keep_alive
+        self.pool_maxsize = pool_maxsize
+        self.pool_idle_timeout = pool_idle_timeout
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for attribute in ['_lock', '_idle', '_pid']:
+            del state[attribute]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # (hostname, port) to the idle connections and when they were last
+        # used, the most recently used last.
+        self._idle = {}
+        self._pid = os.getpid()
+
+    def _get_connection(self, server: Tuple[str, int]
+                        ) -> Tuple[http.client.HTTPConnection, bool]:
+        '''
+        :param server: (hostname, port) to connect to.
+        :return: An idle connection to the server, or a new connection that
+                 has not connected yet, and whether it is an idle
+                 connection.
+        '''
+        if self.keep_alive:
+            with self._lock:
+                if self._pid != os.getpid():
+                    # The connections were opened by the parent process and
+                    # are shared with it, never use or close them here.
+                    self._reset()
+                idle = self._idle.get(server)
+                now = time.monotonic()
+                while idle:
+                    connection, last_used = idle.pop()
+                    if self.pool_idle_timeout is None or \
+                       now - last_used <= self.pool_idle_timeout:
+                        return connection, True
+                    connection.close()
+                    # The rest have been idle for even longer.
+                    for connection, _ in idle:
+                        connection.close()
+                    idle.clear()
+        return http.client.HTTPConnection(*server), False
+
+    def _put_connection(self, server: Tuple[str, int],
+                        connection: http.client.HTTPConnection,
+                        reusable: bool) -> None:
+        '''
+        Keeps the connection to be re-used if it can be, else closes it.
+        '''
+        if reusable and self.keep_alive:
+            with self._lock:
+                if self._pid == os.getpid():
+                    idle = self._idle.setdefault(server, [])
+                    if len(idle) < self.pool_maxsize:
+                        idle.append((connection, time.monotonic()))
+                        return
+        connection.close()
+
+    def post(self, url: str, body: bytes, headers: Dict[str, str],
+             timeout: Any = None, stream: bool = False,
+             cancellation: Optional[Cancellation] = None) -> Response:
+        '''
+        See :py:meth:`Transport.post`. A cancelled request is stopped by
+        shutting down its connection, at any point until the body of the
+        response has been read.
+
+        :raises ConnectionFailed: If the server cannot be connected to, or
+                                  the request is cancelled.
+        :raises TransportTimeout: If connecting or waiting for the response
+                                  times out.
+        '''
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != 'http':
+            raise ConnectionFailed(f'Only http URLs are supported: {url}')
+        server = (parts.hostname, parts.port or 80)
+        path = parts.path or '/'
+        if parts.query:
+            path += f'?{parts.query}'
+        if not self.keep_alive:
+            headers = dict(headers, Connection='close')
+        connect_timeout, read_timeout = _split_timeout(timeout)
+        while True:
+            connection, reused = self._get_connection(server)
+
+            def shutdown(connection: http.client.HTTPConnection = connection
+                         ) -> None:
+                # Unblocks the thread waiting on the connection, unlike
+                # closing it.
+                sock = connection.sock
+                if sock is not None:
+                    try:
+                        sock.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+
+            start_time = time.monotonic()
+            try:
+                if connection.sock is None:
+                    connection.timeout = connect_timeout
+                    connection.connect()
+                    connection.sock.setsockopt(socket.IPPROTO_TCP,
+                                               socket.TCP_NODELAY, 1)
+                if cancellation is not None:
+                    cancellation.add(shutdown)
+                connection.sock.settimeout(read_timeout)
+                connection.request('POST', path, body, headers)
+                raw = connection.getresponse()
+            except socket.timeout as error:
+                connection.close()
+                raise TransportTimeout(f'Timed out sending to {url}: '
+                                       f'{error}') from error
+            except (OSError, http.client.HTTPException) as error:
+                connection.close()
+                cancelled = cancellation is not None and \
+                    cancellation.cancelled
+                if reused and not cancelled:
+                    # The server closed the connection while it was idle.
+                    continue
+                raise ConnectionFailed(f'Could not send to {url}: '
+                                       f'{error!r}') from error
+            break
+        elapsed = datetime.timedelta(seconds=time.monotonic() - start_time)
+
+        def release(reusable: bool) -> None:
+            if cancellation is not None:
+                # Once removed the connection is no longer shut down, but it
+                # may have been already.
+                cancellation.remove(shutdown)
+                reusable = reusable and not cancellation.cancelled
+            self._put_connection(server, connection, reusable)
+
+        response = Response(raw.status, raw.reason, url, elapsed, raw,
+                            release)
+        if not stream:
+            response.content
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pid == os.getpid():
+                for idle in self._idle.values():
+                    for connection, _ in idle:
+                        connection.close()
+            self._reset()
+
+
+TRANSPORTS = {'requests': RequestsTransport,
+              'http.client': HTTPClientTransport}
+
+
+def create_transport(name: str, keep_alive: bool = True,
+                     pool_maxsize: int = 10,
+                     pool_idle_timeout: Optional[float] = 30.0,
+                     pool_connections: int = 10) -> Transport:
+    '''
+    :param name: `requests` for :py:class:`RequestsTransport` or
+                 `http.client` for :py:class:`HTTPClientTransport`.
+    :param keep_alive: Whether to keep connections open and re-use them
+                       between requests.
+    :param pool_maxsize: Maximum number of connections to keep open to each
+                         server.
+    :param pool_idle_timeout: Seconds connections can be idle before they
+                              are closed, None to never close them.
+    :param pool_connections: Number of servers to keep connections to.
+    :return: The transport.
+    :raises ValueError: If the name is not one of the transports.
+    '''
+    if name not in TRANSPORTS:
+        raise ValueError(f'transport has to be one of {sorted(TRANSPORTS)} '
+                         f'not: {name}')
+    if name == 'requests':
+        return RequestsTransport(keep_alive, pool_maxsize, pool_idle_timeout,
+                                 pool_connections)
+    return HTTPClientTransport(keep_alive, pool_maxsize, pool_idle_timeout)
@@ -0,0 +1,341 @@
+'''
+Module contains the following class:
+
+1. TreeBatch -- Dependency tree indexes of a batch of parses, with queries
+   such as paths between tokens and the tokens governed by a token answered
+   for the whole batch at once using NumPy.
+
+NumPy is an optional dependency:
+`pip install tweebo-parser-python-api[numpy]`.
+'''
+
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from tweebo_parser.columnar import import_numpy, TokenTable
+from tweebo_parser.parsed import DEP_VOCAB, ParsedTweet
+
+_MWE_ID = DEP_VOCAB.add('MWE')
+
+
+class TreeBatch(object):
+    '''
+    Indexes of the dependency trees of a batch of parses, built once when
+    the batch is created. Every token of the batch is a row, numbered as in
+    :py:class:`tweebo_parser.columnar.TokenTable`: the tokens of the first
+    tweet in order, then those of the second and so on.
+
+    A tweet is a forest rather than a single tree, the top of each tree is
+    either a token whose head is 0 (ROOT, there can be several) or -1 (not
+    attached to any other token, such as the `RT @user :` tokens of a
+    retweet). Tokens whose label is `MWE` are grouped with their head into
+    multi word expressions.
+
+    Every attribute is a NumPy array with one value per row unless stated:
+
+    1. offsets -- The row of the first token of each tweet, plus the
+       number of rows, (num_tweets + 1).
+    2. tweet -- Position of the token's tweet within the batch.
+    3. token_index -- Index of the token within its tweet, starting at 1.
+    4. heads -- Index of the token's head as returned by the parser.
+    5. parent -- Row of the token's head, -1 for the tops of the trees.
+    6. depth -- Number of heads between the token and the top of its tree,
+       0 for the tops.
+    7. top -- Row of the top of the token's tree.
+    8. span_start, span_end -- Lowest and highest token_index within the
+       subtree of the token, including the token.
+    9. subtree_size -- Number of tokens within the subtree of the token,
+       including the token.
+    10. mwe_group -- Row of the last head of the token's multi word
+        expression, its own row if it is not within one.
+    11. child_offsets, children -- The rows of the children of row `r`, in
+        token order, are `children[child_offsets[r]: child_offsets[r + 1]]`.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, results: Union[TokenTable,
+                                      Iterable[Union[str, Dict[str, Any],
+                                                     ParsedTweet]]]) -> None:
+        '''
+        :param results: Results of :py:meth:`tweebo_parser.API.parse_conll`,
+                        :py:meth:`tweebo_parser.API.parse_stanford` or
+                        :py:meth:`tweebo_parser.API.parse_tweets`, or a
+                        TokenTable of them.
+        :raises ImportError: If numpy is not installed.
+        :raises ValueError: If the heads of a tweet contain a cycle or refer
+                            to a token that does not exist.
+        '''
+        numpy = import_numpy()
+        self._numpy = numpy
+        if isinstance(results, TokenTable):
+            table = results
+        else:
+            table = TokenTable()
+            table.extend(results)
+        columns = table.tree_arrays()
+        lengths = columns['length']
+        num_rows = int(lengths.sum())
+        self.offsets = numpy.zeros(len(lengths) + 1, dtype=numpy.int64)
+        numpy.cumsum(lengths, out=self.offsets[1:])
+        self.tweet = numpy.repeat(numpy.arange(len(lengths)), lengths)
+        self.token_index = columns['token_index']
+        self.heads = columns['head']
+        deps = columns['dep']
+        rows = numpy.arange(num_rows)
+        if ((self.heads > lengths[self.tweet]) | (self.heads < -1)).any():
+            raise ValueError('A head refers to a token that does not exist')
+        attached = self.heads > 0
+        self.parent = numpy.where(
+            attached, self.offsets[self.tweet] + self.heads - 1, -1)
+
+        # Each pass moves every token's ancestor one head up the tree, thus
+        # the number of passes is the depth of the deepest token.
+        self.depth = numpy.zeros(num_rows, dtype=numpy.int64)
+        self.top = rows.copy()
+        self.span_start = self.token_index.copy()
+        self.span_end = self.token_index.copy()
+        self.subtree_size = numpy.ones(num_rows, dtype=numpy.int64)
+        ancestor_rows = numpy.flatnonzero(attached)
+        ancestors = self.parent[ancestor_rows]
+        max_depth = int(lengths.max()) if len(lengths) else 0
+        while len(ancestor_rows):
+            if self.depth[ancestor_rows[0]] == max_depth:
+                raise ValueError('The heads of a tweet contain a cycle')
+            self.depth[ancestor_rows] += 1
+            self.top[ancestor_rows] = ancestors
+            numpy.minimum.at(self.span_start, ancestors,
+                             self.token_index[ancestor_rows])
+            numpy.maximum.at(self.span_end, ancestors,
+                             self.token_index[ancestor_rows])
+            numpy.add.at(self.subtree_size, ancestors, 1)
+            ancestors = self.parent[ancestors]
+            has_ancestor = ancestors != -1
+            ancestor_rows = ancestor_rows[has_ancestor]
+            ancestors = ancestors[has_ancestor]
+
+        child_rows = numpy.flatnonzero(attached)
+        self.children = child_rows[numpy.argsort(self.parent[child_rows],
+                                                 kind='stable')]
+        self.child_offsets = numpy.zeros(num_rows + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(self.parent[child_rows],
+                                    minlength=num_rows),
+                     out=self.child_offsets[1:])
+
+        # Pointer jumping along the MWE links, as each jump doubles the
+        # length of the chain followed.
+        mwe_group = numpy.where((deps == _MWE_ID) & attached, self.parent,
+                                rows)
+        while True:
+            jumped = mwe_group[mwe_group]
+            if (jumped == mwe_group).all():
+                break
+            mwe_group = jumped
+        self.mwe_group = mwe_group
+        # Ancestor 2 ** k heads up of each row, created when first needed.
+        self._jumps = None
+
+    def __len__(self) -> int:
+        return len(self.token_index)
+
+    @property
+    def num_tweets(self) -> int:
+        '''
+        :return: Number of tweets within the batch.
+        '''
+        return len(self.offsets) - 1
+
+    def rows(self, tweets: Any, token_indexes: Any) -> Any:
+        '''
+        :param tweets: Position of each token's tweet within the batch.
+        :param token_indexes: Index of each token within its tweet, starting
+                              at 1.
+        :return: The row of each token.
+        '''
+        numpy = self._numpy
+        return self.offsets[numpy.asarray(tweets)] + \
+            numpy.asarray(token_indexes) - 1
+
+    def tweet_rows(self, tweet: int) -> Any:
+        '''
+        :param tweet: Position of a tweet within the batch.
+        :return: The rows of the tweet's tokens.
+        '''
+        return self._numpy.arange(self.offsets[tweet],
+                                  self.offsets[tweet + 1])
+
+    def children_of(self, row: int) -> Any:
+        '''
+        :param row: Row of a token.
+        :return: Rows of the token's children, in token order.
+        '''
+        return self.children[self.child_offsets[row]:
+                             self.child_offsets[row + 1]]
+
+    def roots(self) -> Any:
+        '''
+        :return: Rows of the tokens whose head is ROOT (0).
+        '''
+        return self._numpy.flatnonzero(self.heads == 0)
+
+    def forest(self, tweet: int) -> List[Any]:
+        '''
+        :param tweet: Position of a tweet within the batch.
+        :return: The rows of each tree of the tweet, ordered by the row of
+                 the tree's top.
+        '''
+        numpy = self._numpy
+        tops = self.top[self.offsets[tweet]: self.offsets[tweet + 1]]
+        order = numpy.argsort(tops, kind='stable')
+        splits = numpy.flatnonzero(numpy.diff(tops[order])) + 1
+        return numpy.split(order + self.offsets[tweet], splits)
+
+    def mwe_groups(self, tweet: Optional[int] = None) -> List[Any]:
+        '''
+        :param tweet: Position of a tweet within the batch. Default every
+                      tweet.
+        :return: The rows of each multi word expression, ordered by their
+                 first row.
+        '''
+        numpy = self._numpy
+        start, end = 0, len(self)
+        if tweet is not None:
+            start, end = self.offsets[tweet], self.offsets[tweet + 1]
+        groups = self.mwe_group[start: end]
+        order = numpy.argsort(groups, kind='stable')
+        splits = numpy.flatnonzero(numpy.diff(groups[order])) + 1
+        return [rows + start for rows in numpy.split(order, splits)
+                if len(rows) > 1]
+
+    def subtree(self, row: int) -> Any:
+        '''
+        :param row: Row of a token.
+        :return: Rows of the token and every token it governs, in token
+                 order.
+        '''
+        numpy = self._numpy
+        tweet_start = self.offsets[self.tweet[row]]
+        start = tweet_start + self.span_start[row] - 1
+        end = tweet_start + self.span_end[row]
+        candidates = numpy.arange(start, end)
+        return candidates[self.governs(numpy.full(len(candidates), row),
+                                       candidates) | (candidates == row)]
+
+    def governed_mask(self, rows: Any) -> Any:
+        '''
+        :param rows: Rows of tokens, from any tweets of the batch.
+        :return: Boolean array of whether each row of the batch is governed
+                 by (is a descendant of) any of the given tokens.
+        '''
+        numpy = self._numpy
+        marked = numpy.zeros(len(self), dtype=bool)
+        marked[numpy.asarray(rows)] = True
+        governed = numpy.zeros(len(self), dtype=bool)
+        ancestor_rows = numpy.flatnonzero(self.parent != -1)
+        ancestors = self.parent[ancestor_rows]
+        while len(ancestor_rows):
+            governed[ancestor_rows] |= marked[ancestors]
+            ancestors = self.parent[ancestors]
+            has_ancestor = ancestors != -1
+            ancestor_rows = ancestor_rows[has_ancestor]
+            ancestors = ancestors[has_ancestor]
+        return governed
+
+    def governs(self, heads: Any, dependents: Any) -> Any:
+        '''
+        :param heads: Rows of tokens.
+        :param dependents: Rows of tokens, one per head.
+        :return: Boolean array of whether each head governs (is an ancestor
+                 of) its dependent.
+        '''
+        numpy = self._numpy
+        heads = numpy.asarray(heads)
+        dependents = numpy.asarray(dependents)
+        distance = self.depth[dependents] - self.depth[heads]
+        below = distance > 0
+        ancestors = self._ancestors(dependents, numpy.maximum(distance, 0))
+        return below & (ancestors == heads) & \
+            (self.top[heads] == self.top[dependents])
+
+    def lowest_common_ancestors(self, rows_a: Any, rows_b: Any) -> Any:
+        '''
+        :param rows_a: Rows of tokens.
+        :param rows_b: Rows of tokens, one per token of rows_a.
+        :return: Row of the lowest token that governs or is both tokens of
+                 each pair, -1 if they are within different trees.
+        '''
+        numpy = self._numpy
+        rows_a = numpy.asarray(rows_a)
+        rows_b = numpy.asarray(rows_b)
+        depth = numpy.minimum(self.depth[rows_a], self.depth[rows_b])
+        rows_a = self._ancestors(rows_a, self.depth[rows_a] - depth)
+        rows_b = self._ancestors(rows_b, self.depth[rows_b] - depth)
+        # Both rows are at the same depth, thus jumping both the same number
+        # of heads up keeps them at the same depth, each jump is only made
+        # if it leaves them apart.
+        for jump in reversed(self._jump_table()):
+            jumped_a = jump[rows_a]
+            jumped_b = jump[rows_b]
+            apart = jumped_a != jumped_b
+            rows_a = numpy.where(apart, jumped_a, rows_a)
+            rows_b = numpy.where(apart, jumped_b, rows_b)
+        ancestors = numpy.where(rows_a == rows_b, rows_a,
+                                self.parent[rows_a])
+        same_tree = self.top[rows_a] == self.top[rows_b]
+        return numpy.where(same_tree, ancestors, -1)
+
+    def path_lengths(self, rows_a: Any, rows_b: Any) -> Any:
+        '''
+        :param rows_a: Rows of tokens.
+        :param rows_b: Rows of tokens, one per token of rows_a.
+        :return: Number of dependency links between each pair of tokens, -1
+                 if they are within different trees.
+        '''
+        numpy = self._numpy
+        ancestors = self.lowest_common_ancestors(rows_a, rows_b)
+        lengths = self.depth[rows_a] + self.depth[rows_b] - \
+            2 * self.depth[ancestors]
+        return numpy.where(ancestors == -1, -1, lengths)
+
+    def path(self, row_a: int, row_b: int) -> Optional[List[int]]:
+        '''
+        :param row_a: Row of a token.
+        :param row_b: Row of a token.
+        :return: Rows of the tokens on the path from row_a up to their
+                 lowest common ancestor and down to row_b, including both,
+                 None if they are within different trees.
+        '''
+        ancestor = int(self.lowest_common_ancestors([row_a], [row_b])[0])
+        if ancestor == -1:
+            return None
+        path_a = [row_a]
+        while path_a[-1] != ancestor:
+            path_a.append(int(self.parent[path_a[-1]]))
+        path_b = [row_b]
+        while path_b[-1] != ancestor:
+            path_b.append(int(self.parent[path_b[-1]]))
+        return path_a + path_b[-2::-1]
+
+    def _jump_table(self) -> List[Any]:
+        '''
+        :return: For each k the ancestor 2 ** k heads up of each row, the
+                 tops of the trees being their own ancestors.
+        '''
+        if self._jumps is None:
+            numpy = self._numpy
+            jump = numpy.where(self.parent == -1, numpy.arange(len(self)),
+                               self.parent)
+            self._jumps = [jump]
+            max_depth = int(self.depth.max()) if len(self) else 0
+            while 2 ** len(self._jumps) <= max_depth:
+                jump = jump[jump]
+                self._jumps.append(jump)
+        return self._jumps
+
+    def _ancestors(self, rows: Any, distances: Any) -> Any:
+        '''
+        :return: The ancestor of each row, `distance` heads up the tree.
+        '''
+        for bit, jump in enumerate(self._jump_table()):
+            rows = self._numpy.where((distances >> bit) & 1, jump[rows],
+                                     rows)
+        return rows
@@ -0,0 +1,212 @@
+'''
+Module contains the following class:
+
+1. AdaptiveController -- Tunes the batch size and number of requests in
+   flight from the observed latency, errors and throughput.
+'''
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveController(object):
+    '''
+    Tunes the number of texts per request (batch size) and the number of
+    requests waiting on the server at the same time (in flight) to maximise
+    the number of texts parsed per second, using additive increase
+    multiplicative decrease (AIMD).
+
+    Each finished request is recorded using :py:meth:`record`. After every
+    `window` requests the settings are adjusted:
+
+    1. If any request failed, took longer than `target_latency` seconds, or
+       the throughput (texts per second) of the window fell below
+       `drop_tolerance` times the best throughput seen since the last
+       decrease, the server is overloaded and both the batch size and in
+       flight are multiplied by `decrease_factor`.
+    2. Otherwise, either the batch size is increased by `batch_size_step`
+       or in flight by `in_flight_step`, taking turns.
+
+    Throughput is the texts of the window divided by the time at least one
+    of its requests was in flight, thus time the client spends idle
+    between calls, or working on the results, is not mistaken for the
+    server slowing down.
+
+    Changes to the settings are logged at the INFO level to the
+    `tweebo_parser.tuning` logger.
+
+    Attributes:
+
+    1. batch_size -- The current number of texts per request.
+    2. in_flight -- The current number of requests that can be in flight.
+    3. min_batch_size, max_batch_size -- Bounds of the batch size.
+    4. min_in_flight, max_in_flight -- Bounds of in flight.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, batch_size: int = 32, in_flight: int = 2,
+                 min_batch_size: int = 1, max_batch_size: int = 1024,
+                 min_in_flight: int = 1, max_in_flight: int = 16,
+                 batch_size_step: int = 16, in_flight_step: int = 1,
+                 decrease_factor: float = 0.5,
+                 target_latency: Optional[float] = 10.0, window: int = 8,
+                 drop_tolerance: float = 0.8) -> None:
+        '''
+        :param batch_size: The starting batch size.
+        :param in_flight: The starting number of requests in flight.
+        :param min_batch_size: Smallest batch size.
+        :param max_batch_size: Largest batch size.
+        :param min_in_flight: Fewest requests in flight.
+        :param max_in_flight: Most requests in flight.
+        :param batch_size_step: Texts added to the batch size on increase.
+        :param in_flight_step: Requests added to in flight on increase.
+        :param decrease_factor: Multiplier of both settings on decrease.
+        :param target_latency: Seconds a request should take at most, None
+                               to not use latency as an overload signal.
+        :param window: Number of requests between adjustments.
+        :param drop_tolerance: Fraction of the best throughput below which
+                               the server is considered overloaded.
+        :raises ValueError: If the bounds are not valid or the decrease
+                            factor is not between 0 and 1.
+        '''
+        if not 1 <= min_batch_size <= max_batch_size:
+            raise ValueError('Requires 1 <= min_batch_size <= '
+                             f'max_batch_size: {min_batch_size}, '
+                             f'{max_batch_size}')
+        if not 1 <= min_in_flight <= max_in_flight:
+            raise ValueError('Requires 1 <= min_in_flight <= max_in_flight: '
+                             f'{min_in_flight}, {max_in_flight}')
+        if not 0 < decrease_factor < 1:
+            raise ValueError('decrease_factor has to be between 0 and 1: '
+                             f'{decrease_factor}')
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.min_in_flight = min_in_flight
+        self.max_in_flight = max_in_flight
+        self.batch_size = min(max(batch_size, min_batch_size), max_batch_size)
+        self.in_flight = min(max(in_flight, min_in_flight), max_in_flight)
+        self.batch_size_step = batch_size_step
+        self.in_flight_step = in_flight_step
+        self.decrease_factor = decrease_factor
+        self.target_latency = target_latency
+        self.window = window
+        self.drop_tolerance = drop_tolerance
+        self.throughput = 0.0
+        self.best_throughput = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self._increase_batch_size = True
+        self._lock = threading.Lock()
+        self._reset_window()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _reset_window(self) -> None:
+        self._window_start = time.monotonic()
+        self._window_requests = 0
+        self._window_texts = 0
+        self._window_errors = 0
+        self._window_max_latency = 0.0
+        # (start, end) monotonic times of each request within the window.
+        self._window_intervals = []
+
+    def record(self, num_texts: int, latency: float,
+               error: bool = False) -> None:
+        '''
+        Records a finished request and adjusts the settings at the end of
+        each window.
+
+        :param num_texts: Number of texts in the request.
+        :param latency: Seconds the request took, it is taken to have
+                        finished when this is called.
+        :param error: Whether the request failed.
+        '''
+        end = time.monotonic()
+        with self._lock:
+            self._window_intervals.append((end - latency, end))
+            self._window_requests += 1
+            if error:
+                self._window_errors += 1
+            else:
+                self._window_texts += num_texts
+            self._window_max_latency = max(self._window_max_latency, latency)
+            if self._window_requests >= self.window:
+                self._adjust()
+
+    def _busy_time(self) -> float:
+        '''
+        :return: Seconds since the window started that at least one of the
+                 window's requests was in flight.
+        '''
+        busy = 0.0
+        busy_until = self._window_start
+        for start, end in sorted(self._window_intervals):
+            start = max(start, busy_until)
+            if end > start:
+                busy += end - start
+                busy_until = end
+        return busy
+
+    def _adjust(self) -> None:
+        self.throughput = self._window_texts / max(self._busy_time(), 1e-9)
+        overloaded = self._window_errors > 0
+        if self.target_latency is not None and \
+           self._window_max_latency > self.target_latency:
+            overloaded = True
+        if self.throughput < self.best_throughput * self.drop_tolerance:
+            overloaded = True
+
+        if overloaded:
+            self.batch_size = max(self.min_batch_size,
+                                  int(self.batch_size * self.decrease_factor))
+            self.in_flight = max(self.min_in_flight,
+                                 int(self.in_flight * self.decrease_factor))
+            self.best_throughput = 0.0
+            self.decreases += 1
+            reason = 'decrease'
+        else:
+            self.best_throughput = max(self.best_throughput, self.throughput)
+            can_increase_batch = self.batch_size < self.max_batch_size
+            can_increase_in_flight = self.in_flight < self.max_in_flight
+            if can_increase_batch and \
+               (self._increase_batch_size or not can_increase_in_flight):
+                self.batch_size = min(self.max_batch_size,
+                                      self.batch_size + self.batch_size_step)
+            elif can_increase_in_flight:
+                self.in_flight = min(self.max_in_flight,
+                                     self.in_flight + self.in_flight_step)
+            self._increase_batch_size = not self._increase_batch_size
+            self.increases += 1
+            reason = 'increase'
+        logger.info('%s: batch_size=%d in_flight=%d throughput=%.1f texts/s '
+                    'errors=%d max_latency=%.3fs', reason, self.batch_size,
+                    self.in_flight, self.throughput, self._window_errors,
+                    self._window_max_latency)
+        self._reset_window()
+
+    def settings(self) -> Dict[str, Any]:
+        '''
+        :return: Dictionary of the current batch_size and in_flight, the
+                 throughput (texts per second) of the last window, the best
+                 throughput since the last decrease and the number of
+                 increases and decreases made.
+        '''
+        with self._lock:
+            return {'batch_size': self.batch_size,
+                    'in_flight': self.in_flight,
+                    'throughput': self.throughput,
+                    'best_throughput': self.best_throughput,
+                    'increases': self.increases,
+                    'decreases': self.decreases}
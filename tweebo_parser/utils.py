@@ -0,0 +1,67 @@
+'''
+Module contains the following class:
+
+1. Lookup -- Dict that converts each key the first time it is looked up.
+
+And the following functions, that write files so that the data is on disk
+once they return:
+
+1. append_synced -- Writes data to the end of an open file.
+2. write_synced -- Writes data to a new file.
+3. truncate_synced -- Truncates a file.
+'''
+
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+
+class Lookup(dict):
+    '''
+    Converts each key the first time it is looked up and keeps the value,
+    so that the many repeats of the same field are converted by a dict
+    lookup rather than a Python function call.
+
+    .. automethod:: __init__
+    '''
+
+    def __init__(self, convert: Callable[[Any], Any]) -> None:
+        '''
+        :param convert: Converts a key into its value.
+        '''
+        super().__init__()
+        self._convert = convert
+
+    def __missing__(self, key: Any) -> Any:
+        value = self[key] = self._convert(key)
+        return value
+
+
+def append_synced(file: Any, data: bytes) -> None:
+    '''
+    :param file: File opened for appending in binary mode.
+    :param data: Data written to the file and flushed to disk.
+    '''
+    file.write(data)
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def write_synced(path: Path, data: bytes) -> None:
+    '''
+    :param path: File to create, or replace.
+    :param data: Data written to the file and flushed to disk.
+    '''
+    with path.open('wb') as file:
+        append_synced(file, data)
+
+
+def truncate_synced(path: Path, size: int) -> None:
+    '''
+    :param path: File to truncate.
+    :param size: Number of bytes to keep.
+    '''
+    with path.open('r+b') as file:
+        file.truncate(size)
+        file.flush()
+        os.fsync(file.fileno())